@@ -0,0 +1,231 @@
+"""Conferência e vazão da fila de gravação (felkla.fila) com um destino falso e com o SQLite.
+
+Uso:
+    python benchmarks/fila.py
+    python benchmarks/fila.py --registros 50000 --latencia-ms 20
+
+Primeiro confere o comportamento da fila, com um destino falso controlado
+pelo script:
+- coalescência: registros com a mesma chave no mesmo lote são gravados uma
+  vez, mantendo o mais recente
+- repetição: um destino que falha é chamado de novo até `tentativas` vezes;
+  um lote que sempre falha é descartado e a fila continua funcionando
+- retorno de conclusão que falha: a thread de gravação continua ativa
+- fila cheia: com o destino parado, `enfileirar` levanta FilaCheia depois do
+  timeout e a fila volta a aceitar registros quando o destino anda
+- SQLite: avaliações salvas são visíveis antes da gravação e, depois de
+  `descarregar`, estão no banco, com as repetidas gravadas uma vez
+
+Se alguma conferência falhar, termina com código 1. Depois mede a vazão de
+`enfileirar` e da gravação com um destino falso que leva `--latencia-ms` por
+lote e com o SQLite num arquivo temporário.
+"""
+import argparse
+import logging
+import random
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+RAIZ = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(RAIZ))
+
+from felkla.armazenamento import ArmazenamentoSQLite, novo_registro  # noqa: E402
+from felkla.codificacao import ROTULOS  # noqa: E402
+from felkla.fila import FilaCheia, FilaGravacao  # noqa: E402
+from felkla.pontuacao import QUESTOES_POR_FASE, pontuar_respostas  # noqa: E402
+
+
+class DestinoFalso:
+    """Destino que registra os lotes, pode ser pausado, atrasado e falhar nas primeiras chamadas."""
+
+    def __init__(self, latencia=0.0, falhas=0):
+        self.latencia = latencia
+        self.falhas = falhas
+        self.chamadas = 0
+        self.lotes = []
+        self.liberado = threading.Event()
+        self.liberado.set()
+
+    def __call__(self, registros):
+        self.liberado.wait()
+        self.chamadas += 1
+        if self.latencia:
+            time.sleep(self.latencia)
+        if self.chamadas <= self.falhas:
+            raise OSError('falha simulada do destino')
+        self.lotes.append(list(registros))
+
+    @property
+    def gravados(self):
+        return [registro for lote in self.lotes for registro in lote]
+
+
+def conferir_coalescencia():
+    destino = DestinoFalso()
+    destino.liberado.clear()
+    fila = FilaGravacao(destino, tamanho_lote=100, chave=lambda registro: registro[0], espera=0.01)
+    # O primeiro registro prende a thread no destino; os demais formam o lote seguinte
+    fila.enfileirar(('inicial', 0))
+    time.sleep(0.05)
+    for versao in range(5):
+        for chave in 'abc':
+            fila.enfileirar((chave, versao))
+    destino.liberado.set()
+    fila.fechar()
+    metricas = fila.metricas()
+    return (destino.lotes[-1] == [('a', 4), ('b', 4), ('c', 4)] and metricas['coalescidos'] == 12
+            and metricas['gravados'] == 4)
+
+
+def conferir_repeticao():
+    destino = DestinoFalso(falhas=2)
+    fila = FilaGravacao(destino, tentativas=3, espera=0.01)
+    fila.enfileirar('x')
+    fila.descarregar()
+    recuperado = destino.gravados == ['x'] and fila.metricas()['repeticoes'] == 2
+
+    # Sempre falha: o lote é descartado e o seguinte ainda é gravado
+    destino.falhas, destino.chamadas = 3, 0
+    concluidos = []
+    fila = FilaGravacao(destino, tentativas=3, espera=0.01, concluido=concluidos.extend)
+    fila.enfileirar('perdido')
+    fila.descarregar()
+    fila.enfileirar('seguinte')
+    fila.fechar()
+    metricas = fila.metricas()
+    return (recuperado and metricas['descartados'] == 1 and destino.gravados[-1] == 'seguinte'
+            and concluidos == ['perdido', 'seguinte'])
+
+
+def conferir_conclusao_com_falha():
+    destino = DestinoFalso()
+
+    def concluido(registros):
+        raise RuntimeError('falha simulada no retorno de conclusão')
+
+    fila = FilaGravacao(destino, capacidade=2, concluido=concluido)
+    try:
+        for i in range(10):
+            fila.enfileirar(i, timeout=0.5)
+    except FilaCheia:
+        # A thread de gravação morreu
+        return False
+    fila.fechar()
+    return destino.gravados == list(range(10))
+
+
+def conferir_fila_cheia():
+    destino = DestinoFalso()
+    destino.liberado.clear()
+    fila = FilaGravacao(destino, tamanho_lote=1, capacidade=3)
+    # Um registro retido no destino e a fila com a capacidade completa
+    for i in range(4):
+        fila.enfileirar(i, timeout=0.5)
+    inicio = time.perf_counter()
+    try:
+        fila.enfileirar(4, timeout=0.2)
+        cheia = False
+    except FilaCheia:
+        cheia = time.perf_counter() - inicio >= 0.2
+    destino.liberado.set()
+    fila.enfileirar(5, timeout=0.5)
+    fila.fechar()
+    return cheia and destino.gravados == [0, 1, 2, 3, 5]
+
+
+def avaliacao_aleatoria(sorteio, projeto):
+    respostas = [sorteio.choice(ROTULOS[1:]) for _ in range(QUESTOES_POR_FASE)]
+    return novo_registro(projeto, 'felkla1', respostas, pontuar_respostas('felkla1', respostas))
+
+
+def conferir_sqlite(diretorio):
+    caminho = Path(diretorio) / 'conferencia.db'
+    armazenamento = ArmazenamentoSQLite(caminho)
+    sorteio = random.Random(0)
+    registros = [avaliacao_aleatoria(sorteio, f'Projeto {i}') for i in range(50)]
+    for registro in registros:
+        armazenamento.salvar(registro)
+        # Duas submissões idênticas no mesmo lote: gravadas uma vez
+        armazenamento.salvar(dict(registro))
+    visiveis = all(armazenamento.ultima(r['projeto'], 'felkla1') is not None for r in registros)
+    armazenamento.descarregar()
+    armazenamento.fechar()
+
+    conexao = sqlite3.connect(caminho)
+    gravados = conexao.execute("SELECT COUNT(*) FROM avaliacoes").fetchone()[0]
+    conexao.close()
+    return visiveis and gravados == len(registros)
+
+
+CONFERENCIAS = {
+    'coalescência': conferir_coalescencia,
+    'repetição': conferir_repeticao,
+    'retorno de conclusão com falha': conferir_conclusao_com_falha,
+    'fila cheia': conferir_fila_cheia,
+}
+
+
+def medir_falso(registros, latencia):
+    destino = DestinoFalso(latencia=latencia)
+    fila = FilaGravacao(destino, capacidade=registros)
+    inicio = time.perf_counter()
+    for i in range(registros):
+        fila.enfileirar(i)
+    enfileirado = time.perf_counter() - inicio
+    fila.descarregar()
+    total = time.perf_counter() - inicio
+    fila.fechar()
+    return enfileirado, total, fila.metricas()
+
+
+def medir_sqlite(diretorio, registros):
+    armazenamento = ArmazenamentoSQLite(Path(diretorio) / 'vazao.db', capacidade=registros)
+    sorteio = random.Random(1)
+    avaliacoes = [avaliacao_aleatoria(sorteio, f'Projeto {sorteio.randrange(1000)}') for _ in range(registros)]
+    inicio = time.perf_counter()
+    for avaliacao in avaliacoes:
+        armazenamento.salvar(avaliacao)
+    enfileirado = time.perf_counter() - inicio
+    armazenamento.descarregar()
+    total = time.perf_counter() - inicio
+    metricas = armazenamento.metricas()['avaliacoes']
+    armazenamento.fechar()
+    return enfileirado, total, metricas
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Conferência e vazão da fila de gravação FELKLA.')
+    parser.add_argument('--registros', type=int, default=20_000, help='registros por medição (padrão: 20000)')
+    parser.add_argument('--latencia-ms', type=float, default=10.0,
+                        help='latência do destino falso por lote (padrão: 10)')
+    args = parser.parse_args(argv)
+
+    # As falhas simuladas do destino são registradas no log da fila; aqui só o resultado interessa
+    logging.getLogger('felkla.fila').setLevel(logging.CRITICAL)
+
+    codigo = 0
+    with tempfile.TemporaryDirectory() as diretorio:
+        conferencias = {**CONFERENCIAS, 'SQLite': lambda: conferir_sqlite(diretorio)}
+        for nome, conferir in conferencias.items():
+            correto = conferir()
+            print(f"{'✅' if correto else '❌'} {nome}", file=sys.stderr)
+            codigo = codigo or (0 if correto else 1)
+        if codigo:
+            return codigo
+
+        for nome, (enfileirado, total, metricas) in (
+                ('destino falso', medir_falso(args.registros, args.latencia_ms / 1000)),
+                ('sqlite', medir_sqlite(diretorio, args.registros))):
+            print(f"{nome:<14} enfileirar_us={enfileirado / args.registros * 1e6:<8.1f}"
+                  f"registros_s={args.registros / total:<10.0f}"
+                  f"lote_medio={metricas['gravados'] / max(metricas['lotes'], 1):<8.1f}"
+                  f"latencia_p95_ms={metricas['latencia_p95_ms']}", file=sys.stderr)
+    return codigo
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,143 @@
+"""Benchmark de partida a frio do teste2.py: tempo até a primeira renderização.
+
+Uso:
+    python benchmarks/inicializacao.py                 # 5 processos novos por variante
+    python benchmarks/inicializacao.py --repeticoes 10
+
+Cada amostra é um processo Python novo, sem nada importado, que executa o
+app uma vez pelo AppTest, como a primeira sessão depois que o contêiner sobe.
+Para cada amostra registra, em ms:
+- interpretador: do início do processo até o script do benchmark começar
+- streamlit: importação do Streamlit e do AppTest
+- primeira_renderizacao: da importação até o último elemento da página
+  enviado ao navegador na primeira execução do app, incluindo as importações
+  de felkla, a leitura do catálogo e do CSS e a abertura do banco
+- primeira_execucao: a primeira execução completa, até o fim do script
+- ate_primeira_renderizacao: do início do processo até o último elemento da
+  página, o que o usuário espera depois que o contêiner sobe
+- segunda_execucao: uma segunda sessão no mesmo processo, já aquecido
+
+As duas variantes comparam os recursos pré-compilados no build (ver
+`felkla.compilado`) com a leitura das origens (FELKLA_COMPILADO=0). O
+benchmark também confere que o motor de pontuação é importável sem o
+Streamlit e mede essa importação. Os resultados são as medianas.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+RAIZ = Path(__file__).resolve().parent.parent
+SCRIPT = RAIZ / 'teste2.py'
+
+METRICAS = ('interpretador_ms', 'streamlit_ms', 'primeira_renderizacao_ms', 'primeira_execucao_ms',
+            'ate_primeira_renderizacao_ms', 'segunda_execucao_ms')
+
+# Executado em cada processo novo; `inicio` é o instante em que o processo foi criado
+_FILHO = """
+import json, sys, time
+comeco = time.time()
+sys.path.insert(0, {raiz!r})
+import streamlit
+from streamlit.runtime.forward_msg_queue import ForwardMsgQueue
+from streamlit.testing.v1 import AppTest
+importado = time.time()
+
+# Instante do último elemento (delta) enviado ao navegador
+ultimo_delta = [0.0]
+enfileirar = ForwardMsgQueue.enqueue
+def registrar(fila, mensagem):
+    if mensagem.WhichOneof('type') == 'delta':
+        ultimo_delta[0] = time.time()
+    enfileirar(fila, mensagem)
+ForwardMsgQueue.enqueue = registrar
+
+at = AppTest.from_file({script!r}, default_timeout=120)
+at.run()
+executado = time.time()
+if at.exception:
+    raise SystemExit(at.exception[0].message)
+renderizado = ultimo_delta[0]
+t = time.perf_counter()
+AppTest.from_file({script!r}, default_timeout=120).run()
+segunda = time.perf_counter() - t
+print(json.dumps({{'comeco': comeco, 'importado': importado, 'renderizado': renderizado, 'executado': executado,
+                  'segunda': segunda}}))
+"""
+
+_PONTUACAO = """
+import json, sys, time
+sys.path.insert(0, {raiz!r})
+t = time.perf_counter()
+import felkla.pontuacao
+duracao = time.perf_counter() - t
+print(json.dumps({{'importacao': duracao, 'streamlit': 'streamlit' in sys.modules}}))
+"""
+
+
+def _executar(codigo, ambiente):
+    inicio = time.time()
+    saida = subprocess.run([sys.executable, '-c', codigo], env=ambiente, capture_output=True, text=True,
+                           check=True).stdout
+    return inicio, json.loads(saida.strip().splitlines()[-1])
+
+
+def amostra(ambiente):
+    inicio, marcos = _executar(_FILHO.format(raiz=str(RAIZ), script=str(SCRIPT)), ambiente)
+    return {
+        'interpretador_ms': (marcos['comeco'] - inicio) * 1000,
+        'streamlit_ms': (marcos['importado'] - marcos['comeco']) * 1000,
+        'primeira_renderizacao_ms': (marcos['renderizado'] - marcos['importado']) * 1000,
+        'primeira_execucao_ms': (marcos['executado'] - marcos['importado']) * 1000,
+        'ate_primeira_renderizacao_ms': (marcos['renderizado'] - inicio) * 1000,
+        'segunda_execucao_ms': marcos['segunda'] * 1000,
+    }
+
+
+def medir(ambiente, repeticoes):
+    amostras = [amostra(ambiente) for _ in range(repeticoes)]
+    return {metrica: round(statistics.median(a[metrica] for a in amostras), 1) for metrica in METRICAS}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark de partida a frio do app FELKLA (AppTest).')
+    parser.add_argument('--repeticoes', type=int, default=5, help='processos por variante (padrão: 5)')
+    args = parser.parse_args(argv)
+
+    sys.path.insert(0, str(RAIZ))
+    from felkla.compilado import VARIAVEL_AMBIENTE, compilar
+
+    with tempfile.TemporaryDirectory() as diretorio:
+        base = {**os.environ, 'FELKLA_ARMAZENAMENTO': str(Path(diretorio) / 'benchmark.db')}
+        pickle = Path(diretorio) / 'compilado.pickle'
+        compilar(pickle)
+        variantes = {
+            'origem': {**base, VARIAVEL_AMBIENTE: '0'},
+            'compilado': {**base, VARIAVEL_AMBIENTE: str(pickle)},
+        }
+        # Aquecimento descartado: cache de disco dos módulos e .pyc do app
+        amostra(variantes['origem'])
+
+        resultados = {}
+        for nome, ambiente in variantes.items():
+            resultados[nome] = medir(ambiente, args.repeticoes)
+            print(f"{nome:<12}" + "".join(f"{metrica}={resultados[nome][metrica]:<9}" for metrica in METRICAS),
+                  file=sys.stderr)
+
+        _, pontuacao = _executar(_PONTUACAO.format(raiz=str(RAIZ)), base)
+
+    print(f"felkla.pontuacao importado em {pontuacao['importacao'] * 1000:.1f} ms "
+          f"({'com' if pontuacao['streamlit'] else 'sem'} Streamlit)", file=sys.stderr)
+    if pontuacao['streamlit']:
+        print("❌ O motor de pontuação não deve importar o Streamlit", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
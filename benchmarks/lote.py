@@ -0,0 +1,157 @@
+"""Conferência e vazão da pontuação em lote (felkla.lote) sobre arquivos CSV e JSONL.
+
+Uso:
+    python benchmarks/lote.py
+    python benchmarks/lote.py --avaliacoes 1000000 --processos 8
+
+Primeiro confere, em arquivos pequenos com blocos de poucas linhas:
+- CSV com BOM (exportação do Excel): as fases são detectadas e as
+  avaliações pontuadas
+- CSV com linhas em branco e linhas com menos campos que o cabeçalho: as em
+  branco são ignoradas e as curtas informadas pelo número da linha
+- JSONL com linhas em branco no início e registros que não são um objeto
+  JSON: os inválidos são informados pelo número da linha e os ids de
+  reserva seguem a numeração do arquivo
+- os scores do lote coincidem com `pontuar_respostas`
+
+Se alguma conferência falhar, termina com código 1. Depois mede a vazão de
+`pontuar_arquivo` sobre `--avaliacoes` avaliações aleatórias em CSV e JSONL.
+"""
+import argparse
+import csv
+import json
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+RAIZ = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(RAIZ))
+
+from felkla.codificacao import ROTULOS  # noqa: E402
+from felkla.lote import colunas_fase, pontuar_arquivo  # noqa: E402
+from felkla.pontuacao import QUESTOES_POR_FASE, pontuar_respostas  # noqa: E402
+
+COLUNAS = ['id', *colunas_fase('felkla1')]
+
+
+def respostas_aleatorias(sorteio):
+    return [sorteio.choice(ROTULOS[1:]) for _ in range(QUESTOES_POR_FASE)]
+
+
+def _ler_csv(caminho):
+    with open(caminho, encoding='utf-8', newline='') as arquivo:
+        return list(csv.DictReader(arquivo))
+
+
+def _ler_jsonl(caminho):
+    with open(caminho, encoding='utf-8') as arquivo:
+        return [json.loads(linha) for linha in arquivo]
+
+
+def conferir_bom(diretorio):
+    sorteio = random.Random(0)
+    respostas = [respostas_aleatorias(sorteio) for _ in range(3)]
+    entrada = Path(diretorio) / 'bom.csv'
+    with open(entrada, 'w', encoding='utf-8-sig', newline='') as arquivo:
+        escritor = csv.writer(arquivo)
+        escritor.writerow(COLUNAS)
+        escritor.writerows([f'a{i}', *r] for i, r in enumerate(respostas))
+    saida = str(Path(diretorio) / 'bom_saida.csv')
+    total, _, ignoradas = pontuar_arquivo(str(entrada), saida, processos=1)
+    esperados = [f"{pontuar_respostas('felkla1', r)['score_final']:.4f}" for r in respostas]
+    obtidos = [linha['f1_score_final'] for linha in _ler_csv(saida)]
+    return total == 3 and not ignoradas and obtidos == esperados
+
+
+def conferir_csv_irregular(diretorio):
+    sorteio = random.Random(1)
+    entrada = Path(diretorio) / 'irregular.csv'
+    linhas = [','.join(COLUNAS)]
+    for i in range(8):
+        linhas.append(','.join([f'a{i}', *respostas_aleatorias(sorteio)]))
+    linhas[3] = ''                       # linha 4: em branco
+    linhas[5] = ',,,'                    # linha 6: só separadores
+    linhas[6] = 'a5,Bom,Regular'         # linha 7: curta
+    entrada.write_text('\n'.join(linhas) + '\n', encoding='utf-8')
+    saida = str(Path(diretorio) / 'irregular_saida.csv')
+    total, _, ignoradas = pontuar_arquivo(str(entrada), saida, processos=2, tamanho_bloco=3)
+    ids = [linha['id'] for linha in _ler_csv(saida)]
+    return total == 5 and ignoradas == [7] and ids == ['a0', 'a1', 'a3', 'a6', 'a7']
+
+
+def conferir_jsonl_irregular(diretorio):
+    sorteio = random.Random(2)
+    entrada = Path(diretorio) / 'irregular.jsonl'
+    registros = [dict(zip(COLUNAS[1:], respostas_aleatorias(sorteio))) for _ in range(5)]
+    linhas = [
+        '',                                   # 1: em branco antes do primeiro objeto
+        '{"q11": ',                           # 2: JSON inválido
+        json.dumps({'id': 'b0', **registros[0]}),
+        json.dumps(registros[1]),             # 4: sem id, recebe o número da linha
+        '   ',                                # 5: em branco
+        '[1, 2, 3]',                          # 6: não é objeto
+        json.dumps({'id': 'b2', **registros[2]}),
+        json.dumps(registros[3]),             # 8: sem id
+    ]
+    entrada.write_text('\n'.join(linhas) + '\n', encoding='utf-8')
+    saida = str(Path(diretorio) / 'irregular_saida.jsonl')
+    total, _, ignoradas = pontuar_arquivo(str(entrada), saida, processos=2, tamanho_bloco=3)
+    resultado = _ler_jsonl(saida)
+    esperados = [round(pontuar_respostas('felkla1', [r[c] for c in COLUNAS[1:]])['score_final'], 4)
+                 for r in registros[:4]]
+    return (total == 4 and ignoradas == [2, 6]
+            and [linha['id'] for linha in resultado] == ['b0', '4', 'b2', '8']
+            and [linha['f1_score_final'] for linha in resultado] == esperados)
+
+
+CONFERENCIAS = {
+    'CSV com BOM': conferir_bom,
+    'CSV com linhas em branco e curtas': conferir_csv_irregular,
+    'JSONL com linhas em branco e inválidas': conferir_jsonl_irregular,
+}
+
+
+def gerar(diretorio, avaliacoes, formato):
+    sorteio = random.Random(3)
+    caminho = Path(diretorio) / f'vazao.{formato}'
+    with open(caminho, 'w', encoding='utf-8', newline='') as arquivo:
+        if formato == 'csv':
+            escritor = csv.writer(arquivo, lineterminator='\n')
+            escritor.writerow(COLUNAS)
+            for i in range(avaliacoes):
+                escritor.writerow([i, *respostas_aleatorias(sorteio)])
+        else:
+            for i in range(avaliacoes):
+                arquivo.write(json.dumps({'id': i, **dict(zip(COLUNAS[1:], respostas_aleatorias(sorteio)))}) + '\n')
+    return str(caminho)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Conferência e vazão da pontuação em lote FELKLA.')
+    parser.add_argument('--avaliacoes', type=int, default=200_000, help='avaliações por medição (padrão: 200000)')
+    parser.add_argument('--processos', type=int, default=None, help='processos (padrão: núcleos disponíveis)')
+    args = parser.parse_args(argv)
+
+    codigo = 0
+    with tempfile.TemporaryDirectory() as diretorio:
+        for nome, conferir in CONFERENCIAS.items():
+            correto = conferir(diretorio)
+            print(f"{'✅' if correto else '❌'} {nome}", file=sys.stderr)
+            codigo = codigo or (0 if correto else 1)
+        if codigo:
+            return codigo
+
+        for formato in ('csv', 'jsonl'):
+            entrada = gerar(diretorio, args.avaliacoes, formato)
+            inicio = time.perf_counter()
+            total, _, _ = pontuar_arquivo(entrada, str(Path(diretorio) / f'saida.{formato}'),
+                                          processos=args.processos)
+            duracao = time.perf_counter() - inicio
+            print(f"{formato:<6} avaliacoes_s={total / duracao:<10.0f}duracao_s={duracao:.2f}", file=sys.stderr)
+    return codigo
+
+
+if __name__ == '__main__':
+    sys.exit(main())
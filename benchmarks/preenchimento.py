@@ -0,0 +1,130 @@
+"""CPU do servidor por avaliação completa de uma fase, em cada modo de resposta.
+
+Uso:
+    python benchmarks/preenchimento.py
+    python benchmarks/preenchimento.py --repeticoes 10 --modos seletores formulario
+
+Cada amostra abre uma fase pelo AppTest e responde as 25 questões até o
+modelo da sessão ter a avaliação completa:
+- seletores: uma resposta por vez, um rerun por resposta
+- formulario: as 25 respostas no navegador e um envio do st.form (1 rerun)
+- grade: as 25 células do st.data_editor editadas de uma vez (1 rerun)
+
+Soma, da abertura da fase até a avaliação completa, o tempo de CPU do
+processo (time.process_time: o script e o AppTest), os reruns, as mensagens
+delta e os bytes enviados ao navegador. Os resultados são as medianas das
+amostras das três fases.
+
+O AppTest só executa reruns completos. No navegador, uma resposta pelos
+seletores reexecuta apenas o fragmento da sua dimensão, então a linha
+'seletores' é o custo desse modo sem fragmentos, o seu limite superior.
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from streamlit.proto.WidgetStates_pb2 import WidgetState
+
+# renderizacao também põe a raiz do repositório no sys.path
+from renderizacao import RESPOSTAS, Captura, novo_app
+from felkla.catalogo import carregar_catalogo, questoes_fase
+
+MODOS = ('seletores', 'formulario', 'grade')
+METRICAS = ('cpu_ms', 'reruns', 'deltas', 'bytes')
+
+
+def responder_seletores(at, fase, executar):
+    for i, questao in enumerate(questoes_fase(fase)):
+        at.selectbox(key=f"{fase['id']}_{questao['id']}").set_value(RESPOSTAS[i % 5])
+        executar(at.run)
+
+
+def responder_formulario(at, fase, executar):
+    for i, questao in enumerate(questoes_fase(fase)):
+        at.selectbox(key=f"{fase['id']}_{questao['id']}").set_value(RESPOSTAS[i % 5])
+    enviar = next(botao for botao in at.button if botao.label.startswith('📨 Enviar Respostas'))
+    executar(enviar.click().run)
+
+
+def responder_grade(at, fase, executar):
+    # O AppTest não simula edições no st.data_editor: o estado é enviado
+    # como o navegador o envia, com todas as células editadas
+    edicoes = {str(i): {'Resposta': RESPOSTAS[i % 5]} for i in range(len(questoes_fase(fase)))}
+    estados = at._tree.get_widget_states()
+    estados.widgets.append(WidgetState(
+        id=at.dataframe[0].proto.id,
+        string_value=json.dumps({'edited_rows': edicoes, 'added_rows': [], 'deleted_rows': []})
+    ))
+    executar(lambda: at._run(estados))
+
+
+RESPONDER = {
+    'seletores': responder_seletores,
+    'formulario': responder_formulario,
+    'grade': responder_grade,
+}
+
+
+def amostra(captura, modo, fase):
+    totais = dict.fromkeys(METRICAS, 0)
+
+    def executar(rerun):
+        inicio = time.process_time()
+        at = rerun()
+        totais['cpu_ms'] += (time.process_time() - inicio) * 1000
+        if at.exception:
+            raise RuntimeError(f"Exceção no app: {at.exception[0].message}")
+        totais['reruns'] += 1
+        totais['deltas'] += len(captura.mensagens)
+        totais['bytes'] += sum(m.ByteSize() for m in captura.mensagens)
+
+    at = novo_app(fase['id'], modo=modo)
+    executar(at.run)
+    RESPONDER[modo](at, fase, executar)
+
+    sessao = at.session_state['felkla_sessao']
+    if sessao.preenchidas(fase['id']) != len(questoes_fase(fase)):
+        raise RuntimeError(f"{modo}: avaliação {fase['nome']} incompleta "
+                           f"({sessao.preenchidas(fase['id'])} respostas)")
+    return totais
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='CPU do servidor por avaliação completa, por modo de resposta.')
+    parser.add_argument('--repeticoes', type=int, default=5, help='amostras por fase (padrão: 5)')
+    parser.add_argument('--modos', nargs='+', choices=MODOS, default=list(MODOS))
+    args = parser.parse_args(argv)
+
+    captura = Captura()
+    fases = carregar_catalogo()['fases']
+    resultados = {}
+    with tempfile.TemporaryDirectory() as diretorio:
+        # Checkpoints e avaliações das amostras não tocam o banco real
+        os.environ['FELKLA_ARMAZENAMENTO'] = str(Path(diretorio) / 'benchmark.db')
+        for modo in args.modos:
+            # Aquecimento descartado: importações e funções em cache
+            amostra(captura, modo, fases[0])
+
+        for modo in args.modos:
+            amostras = [amostra(captura, modo, fase) for _ in range(args.repeticoes) for fase in fases]
+            resultados[modo] = {metrica: round(statistics.median(a[metrica] for a in amostras),
+                                               1 if metrica == 'cpu_ms' else None)
+                                for metrica in METRICAS}
+            print(f"{modo:<12}" + "".join(f"{metrica}={resultados[modo][metrica]:<10}" for metrica in METRICAS),
+                  file=sys.stderr)
+
+    if 'seletores' in resultados:
+        base = resultados['seletores']['cpu_ms']
+        for modo in [modo for modo in resultados if modo != 'seletores']:
+            print(f"{modo}: {1 - resultados[modo]['cpu_ms'] / base:.0%} menos CPU por avaliação que os seletores",
+                  file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
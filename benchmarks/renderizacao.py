@@ -0,0 +1,274 @@
+"""Benchmark de renderização do teste2.py, executado sem navegador pelo AppTest.
+
+Uso:
+    python benchmarks/renderizacao.py                  # compara com benchmarks/baseline.json
+    python benchmarks/renderizacao.py --salvar         # grava os números atuais como baseline
+    python benchmarks/renderizacao.py --cenarios calculo resposta --repeticoes 10
+    python benchmarks/renderizacao.py --comparar-tempo  # inclui o tempo (baseline gravada nesta máquina)
+
+Cada cenário prepara o app (aba, respostas, botões) e mede reruns
+completos. Para cada rerun registra:
+- o tempo de parede
+- o número de mensagens delta enviadas ao navegador
+- os bytes serializados dessas mensagens
+- o pico de memória alocada (tracemalloc, medido em uma execução separada
+  para não distorcer o tempo)
+
+O tempo de cada cenário é o menor entre as amostras, como no timeit, por
+ser o menos sujeito ao ruído da máquina. As demais métricas usam a mediana
+das amostras. Se alguma métrica piorar além da tolerância em relação à
+baseline, o processo termina com código 1. Por padrão só entram na comparação
+as métricas que não dependem da máquina (deltas, bytes e memória); o tempo
+da baseline versionada é o da máquina em que ela foi gravada e só é comparado
+com --comparar-tempo, depois de gravar a baseline no mesmo ambiente.
+
+O AppTest só executa reruns completos: as reruns de fragmento que o
+navegador faz ao responder uma questão não são medidas aqui. Os bytes são
+os das mensagens completas; no navegador, elementos repetidos acima de
+`global.minCachedMessageSize` (.streamlit/config.toml) chegam só como hash.
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+RAIZ = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(RAIZ))
+
+from streamlit.testing.v1 import AppTest  # noqa: E402
+from streamlit.testing.v1 import local_script_runner  # noqa: E402
+
+from felkla.catalogo import carregar_catalogo, questoes_fase  # noqa: E402
+
+SCRIPT = RAIZ / 'teste2.py'
+BASELINE = Path(__file__).with_name('baseline.json')
+
+METRICAS = ('tempo_ms', 'deltas', 'bytes', 'memoria_kb')
+
+# Métricas comparadas por padrão: o tempo depende da máquina
+METRICAS_COMPARADAS = ('deltas', 'bytes', 'memoria_kb')
+
+# Piora relativa tolerada por métrica
+TOLERANCIAS = {'tempo_ms': 0.50, 'deltas': 0.0, 'bytes': 0.05, 'memoria_kb': 0.30}
+# Diferenças absolutas abaixo destas nunca contam como regressão
+FOLGAS = {'tempo_ms': 5.0, 'deltas': 0, 'bytes': 256, 'memoria_kb': 256}
+
+RESPOSTAS = ('Excelente', 'Bom', 'Regular', 'Inadequado', 'Não iniciado')
+
+
+class Captura:
+    """Guarda as mensagens enviadas ao navegador no último rerun do AppTest."""
+
+    def __init__(self):
+        self.mensagens = []
+        original = local_script_runner.LocalScriptRunner.run
+        captura = self
+
+        def run(runner, *args, **kwargs):
+            arvore = original(runner, *args, **kwargs)
+            captura.mensagens = [m for m in runner.forward_msgs() if m.WhichOneof('type') == 'delta']
+            return arvore
+
+        local_script_runner.LocalScriptRunner.run = run
+
+
+class Medicao:
+    def __init__(self, captura, memoria):
+        self.captura = captura
+        self.memoria = memoria
+        self.amostras = []
+
+    def __call__(self, at):
+        """Executa um rerun medido."""
+        if self.memoria:
+            tracemalloc.start()
+        inicio = time.perf_counter()
+        at.run()
+        duracao = time.perf_counter() - inicio
+        if self.memoria:
+            _, pico = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+        if at.exception:
+            raise RuntimeError(f"Exceção no app: {at.exception[0].message}")
+
+        mensagens = self.captura.mensagens
+        self.amostras.append({
+            'tempo_ms': duracao * 1000,
+            'deltas': len(mensagens),
+            'bytes': sum(m.ByteSize() for m in mensagens),
+            'memoria_kb': pico / 1024 if self.memoria else None,
+        })
+
+
+def novo_app(aba=None, abas=None, modo=None):
+    at = AppTest.from_file(str(SCRIPT), default_timeout=120)
+    if abas:
+        at.query_params['abas'] = abas
+    if modo:
+        at.query_params['modo'] = modo
+    if aba:
+        at.session_state['aba_ativa'] = aba
+    return at
+
+
+def preencher(at, fase, deslocamento=0):
+    for i, questao in enumerate(questoes_fase(fase)):
+        at.selectbox(key=f"{fase['id']}_{questao['id']}").set_value(RESPOSTAS[(i + deslocamento) % 3])
+
+
+# Cenários: preparam o app e chamam `medir(at)` para cada rerun medido
+
+def cenario_abertura(medir):
+    medir(novo_app())
+
+
+def cenario_abertura_todas_abas(medir):
+    medir(novo_app(abas='todas'))
+
+
+def cenario_navegacao(medir):
+    at = novo_app()
+    at.run()
+    for aba in [fase['id'] for fase in carregar_catalogo()['fases']] + ['portfolio', 'metodologia']:
+        at.session_state['aba_ativa'] = aba
+        medir(at)
+
+
+def cenario_grade(medir):
+    # Abertura de cada fase no modo grade (um st.data_editor no lugar dos 25 seletores)
+    for fase in carregar_catalogo()['fases']:
+        medir(novo_app(fase['id'], modo='grade'))
+
+
+def cenario_resposta(medir):
+    for fase in carregar_catalogo()['fases']:
+        at = novo_app(fase['id'])
+        at.run()
+        for i, questao in enumerate(questoes_fase(fase)[:5]):
+            at.selectbox(key=f"{fase['id']}_{questao['id']}").set_value(RESPOSTAS[i % 5])
+            medir(at)
+
+
+def cenario_fase_completa(medir):
+    for fase in carregar_catalogo()['fases']:
+        at = novo_app(fase['id'])
+        at.run()
+        preencher(at, fase)
+        medir(at)
+
+
+def cenario_calculo(medir):
+    for fase in carregar_catalogo()['fases']:
+        at = novo_app(fase['id'])
+        at.run()
+        preencher(at, fase)
+        at.run()
+        at.button(key=f"calcular_{fase['id']}").click()
+        medir(at)
+
+
+def cenario_resultado_visivel(medir):
+    for fase in carregar_catalogo()['fases']:
+        at = novo_app(fase['id'])
+        at.run()
+        preencher(at, fase, deslocamento=1)
+        at.run()
+        at.button(key=f"calcular_{fase['id']}").click()
+        at.run()
+        medir(at)
+
+
+CENARIOS = {
+    'abertura': cenario_abertura,
+    'abertura_todas_abas': cenario_abertura_todas_abas,
+    'navegacao': cenario_navegacao,
+    'grade': cenario_grade,
+    'resposta': cenario_resposta,
+    'fase_completa': cenario_fase_completa,
+    'calculo': cenario_calculo,
+    'resultado_visivel': cenario_resultado_visivel,
+}
+
+
+def executar(nomes, repeticoes):
+    captura = Captura()
+    resultados = {}
+    for nome in nomes:
+        # Aquecimento descartado: a primeira execução inclui os spinners das funções em cache
+        CENARIOS[nome](Medicao(captura, memoria=False))
+
+        tempos = Medicao(captura, memoria=False)
+        for _ in range(repeticoes):
+            CENARIOS[nome](tempos)
+        memoria = Medicao(captura, memoria=True)
+        CENARIOS[nome](memoria)
+
+        resultados[nome] = {
+            'tempo_ms': round(min(a['tempo_ms'] for a in tempos.amostras), 2),
+            'deltas': int(statistics.median(a['deltas'] for a in tempos.amostras)),
+            'bytes': int(statistics.median(a['bytes'] for a in tempos.amostras)),
+            'memoria_kb': round(statistics.median(a['memoria_kb'] for a in memoria.amostras), 1),
+        }
+        print(f"{nome:<22}" + "".join(f"{metrica}={resultados[nome][metrica]:<10}" for metrica in METRICAS),
+              file=sys.stderr)
+    return resultados
+
+
+def comparar(resultados, baseline, tolerancias=TOLERANCIAS, metricas_comparadas=METRICAS_COMPARADAS):
+    """Lista de regressões (cenário, métrica, baseline, atual)."""
+    regressoes = []
+    for nome, metricas in resultados.items():
+        if nome not in baseline:
+            continue
+        for metrica in metricas_comparadas:
+            base, atual = baseline[nome][metrica], metricas[metrica]
+            if atual > base * (1 + tolerancias[metrica]) and atual - base > FOLGAS[metrica]:
+                regressoes.append((nome, metrica, base, atual))
+    return regressoes
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark de renderização do app FELKLA (AppTest).')
+    parser.add_argument('--cenarios', nargs='+', choices=list(CENARIOS), default=list(CENARIOS))
+    parser.add_argument('--repeticoes', type=int, default=5, help='execuções de cada cenário (padrão: 5)')
+    parser.add_argument('--baseline', type=Path, default=BASELINE, help='arquivo JSON da baseline')
+    parser.add_argument('--comparar-tempo', action='store_true',
+                        help='compara também o tempo; só faz sentido com a baseline gravada nesta máquina')
+    parser.add_argument('--tolerancia-tempo', type=float, default=TOLERANCIAS['tempo_ms'],
+                        help='piora relativa de tempo tolerada (padrão: %(default)s)')
+    parser.add_argument('--salvar', action='store_true', help='grava os resultados como nova baseline')
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as diretorio:
+        # Avaliações salvas durante o benchmark não tocam o banco real
+        os.environ['FELKLA_ARMAZENAMENTO'] = str(Path(diretorio) / 'benchmark.db')
+        resultados = executar(args.cenarios, args.repeticoes)
+
+    if args.salvar:
+        baseline = json.loads(args.baseline.read_text()) if args.baseline.exists() else {}
+        baseline.update(resultados)
+        args.baseline.write_text(json.dumps(baseline, indent=2, ensure_ascii=False) + '\n')
+        print(f"Baseline gravada em {args.baseline}", file=sys.stderr)
+        return 0
+
+    if not args.baseline.exists():
+        print(f"Sem baseline em {args.baseline}; use --salvar para criá-la", file=sys.stderr)
+        return 0
+
+    tolerancias = {**TOLERANCIAS, 'tempo_ms': args.tolerancia_tempo}
+    comparadas = ('tempo_ms', *METRICAS_COMPARADAS) if args.comparar_tempo else METRICAS_COMPARADAS
+    regressoes = comparar(resultados, json.loads(args.baseline.read_text()), tolerancias, comparadas)
+    for nome, metrica, base, atual in regressoes:
+        print(f"❌ Regressão em {nome}/{metrica}: {base} → {atual}", file=sys.stderr)
+    if not regressoes:
+        print("✅ Nenhuma regressão em relação à baseline", file=sys.stderr)
+    return 1 if regressoes else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
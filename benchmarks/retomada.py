@@ -0,0 +1,168 @@
+"""Retomada de uma sessão em outro processo depois que o primeiro é morto (SIGKILL).
+
+Uso:
+    python benchmarks/retomada.py
+    python benchmarks/retomada.py --respostas 20 --fase felkla2
+
+Simula uma réplica do app que cai no meio do questionário:
+1. um processo abre o app pelo AppTest com ?sessao=<token>, informa um
+   projeto e responde `--respostas` questões da fase, uma por rerun;
+2. quando o último checkpoint da sessão está gravado no banco compartilhado
+   (um SQLite temporário), o processo é morto com SIGKILL, sem chance de
+   descarregar nada;
+3. um segundo processo abre o app com o mesmo token e confere que o modelo
+   da sessão, o campo do projeto e os seletores da fase voltam com as
+   respostas e o projeto do primeiro.
+
+Mede o tempo da morte do primeiro processo até o segundo exibir a sessão
+retomada. Se algo não for restaurado, termina com código 1.
+"""
+import argparse
+import json
+import os
+import signal
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+RAIZ = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(RAIZ))
+
+SCRIPT = RAIZ / 'teste2.py'
+PROJETO = 'Projeto Retomada'
+RESPOSTAS = ('Excelente', 'Bom', 'Regular', 'Inadequado', 'Não iniciado')
+ESPERA_CHECKPOINT = 30.0
+
+
+def novo_app(token, fase_id):
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(str(SCRIPT), default_timeout=120)
+    at.query_params['sessao'] = token
+    at.session_state['aba_ativa'] = fase_id
+    return at
+
+
+def responder(token, fase_id, quantidade):
+    """Etapa do primeiro processo: projeto e respostas, depois espera ser morto."""
+    from felkla.catalogo import carregar_catalogo, questoes_fase
+
+    fase = carregar_catalogo()['por_id'][fase_id]
+    at = novo_app(token, fase_id)
+    at.run()
+    at.text_input(key='projeto').input(PROJETO).run()
+    for i, questao in enumerate(questoes_fase(fase)[:quantidade]):
+        at.selectbox(key=f"{fase_id}_{questao['id']}").set_value(RESPOSTAS[i % len(RESPOSTAS)]).run()
+    if at.exception:
+        raise RuntimeError(f"Exceção no app: {at.exception[0].message}")
+
+    # O estado que o segundo processo deve recuperar
+    print(json.dumps(at.session_state['felkla_sessao'].exportar()), flush=True)
+    while True:
+        time.sleep(60)
+
+
+def retomar(token, fase_id):
+    """Etapa do segundo processo: abre a sessão e informa o que foi restaurado."""
+    from felkla.catalogo import carregar_catalogo, questoes_fase
+
+    fase = carregar_catalogo()['por_id'][fase_id]
+    at = novo_app(token, fase_id)
+    at.run()
+    if at.exception:
+        raise RuntimeError(f"Exceção no app: {at.exception[0].message}")
+    print(json.dumps({
+        'sessao': at.session_state['felkla_sessao'].exportar(),
+        'campo_projeto': at.text_input(key='projeto').value,
+        'seletores': [at.selectbox(key=f"{fase_id}_{questao['id']}").value for questao in questoes_fase(fase)],
+    }), flush=True)
+
+
+def _processo(etapa, token, fase_id, respostas, ambiente):
+    return subprocess.Popen([sys.executable, __file__, '--etapa', etapa, '--token', token, '--fase', fase_id,
+                             '--respostas', str(respostas)],
+                            cwd=RAIZ, env=ambiente, stdout=subprocess.PIPE, text=True)
+
+
+def _checkpoint(caminho, token):
+    # Lido direto do arquivo, como outra réplica o leria, sem abrir filas de gravação
+    conexao = sqlite3.connect(caminho, timeout=30)
+    try:
+        linha = conexao.execute("SELECT dados FROM sessoes WHERE token = ?", (token,)).fetchone()
+    except sqlite3.OperationalError:
+        linha = None
+    finally:
+        conexao.close()
+    return json.loads(linha[0]) if linha else None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Retomada de sessão depois de um SIGKILL no meio do questionário.')
+    parser.add_argument('--respostas', type=int, default=12, help='questões respondidas antes da queda (padrão: 12)')
+    parser.add_argument('--fase', default='felkla1', help='fase respondida (padrão: felkla1)')
+    parser.add_argument('--etapa', choices=('responder', 'retomar'), help=argparse.SUPPRESS)
+    parser.add_argument('--token', help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.etapa == 'responder':
+        return responder(args.token, args.fase, args.respostas)
+    if args.etapa == 'retomar':
+        return retomar(args.token, args.fase)
+
+    from felkla.catalogo import carregar_catalogo, questoes_fase
+    from felkla.sessao import novo_token
+
+    fase = carregar_catalogo()['por_id'][args.fase]
+    token = novo_token()
+    with tempfile.TemporaryDirectory() as diretorio:
+        caminho = str(Path(diretorio) / 'compartilhado.db')
+        ambiente = {**os.environ, 'FELKLA_ARMAZENAMENTO': f'sqlite:///{caminho}',
+                    'PYTHONPATH': os.pathsep.join(filter(None, [str(RAIZ), os.environ.get('PYTHONPATH')]))}
+
+        primeiro = _processo('responder', token, args.fase, args.respostas, ambiente)
+        try:
+            linha = primeiro.stdout.readline()
+            if not linha:
+                print("❌ O primeiro processo terminou antes de responder", file=sys.stderr)
+                return 1
+            esperado = json.loads(linha)
+
+            limite = time.monotonic() + ESPERA_CHECKPOINT
+            while _checkpoint(caminho, token) != esperado:
+                if time.monotonic() > limite:
+                    print("❌ O checkpoint da sessão não chegou ao banco", file=sys.stderr)
+                    return 1
+                time.sleep(0.05)
+        finally:
+            primeiro.send_signal(signal.SIGKILL)
+            primeiro.wait()
+            primeiro.stdout.close()
+        morte = time.perf_counter()
+
+        segundo = _processo('retomar', token, args.fase, args.respostas, ambiente)
+        saida, _ = segundo.communicate()
+        retomada = time.perf_counter() - morte
+        if segundo.returncode:
+            print(f"❌ O segundo processo falhou (código {segundo.returncode})", file=sys.stderr)
+            return 1
+        restaurado = json.loads(saida)
+
+    respondidas = [RESPOSTAS[i % len(RESPOSTAS)] for i in range(args.respostas)]
+    respondidas += [None] * (len(questoes_fase(fase)) - len(respondidas))
+    conferencias = {
+        'modelo da sessão': restaurado['sessao'] == esperado,
+        'projeto': restaurado['sessao']['projeto'] == PROJETO and restaurado['campo_projeto'] == PROJETO,
+        'respostas nos seletores': restaurado['seletores'] == respondidas,
+    }
+    for nome, correto in conferencias.items():
+        print(f"{'✅' if correto else '❌'} {nome}", file=sys.stderr)
+    print(f"primeiro processo morto com SIGKILL (código {primeiro.returncode}); "
+          f"sessão retomada no segundo em {retomada:.1f} s", file=sys.stderr)
+    return 0 if all(conferencias.values()) else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,133 @@
+"""Latência da busca de projetos semelhantes (felkla.semelhanca) sobre muitas avaliações.
+
+Uso:
+    python benchmarks/semelhanca.py                           # 1 milhão de avaliações
+    python benchmarks/semelhanca.py --avaliacoes 5000000 --consultas 500 --k 5 20
+
+Gera avaliações aleatórias de uma fase (várias por projeto, como
+reavaliações), monta o índice e mede, para cada k:
+- p50_ms / p95_ms: latência de `buscar` com as 25 questões
+- dimensao_p50_ms: latência de `buscar` restrita às questões de uma dimensão
+
+Mede também `acrescimo_us`, o custo de acrescer uma avaliação ao índice já
+cheio, como a cada gravação no app.
+
+Antes das medições, confere as distâncias de `buscar` com a distância L1
+calculada por força bruta sobre os códigos: os vizinhos devem ser os k
+projetos de menor distância, exceto o excluído. Se não forem, termina com
+código 1.
+"""
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+
+RAIZ = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(RAIZ))
+
+import numpy as np  # noqa: E402
+
+from felkla.catalogo import DIMENSOES_POR_FASE, QUESTOES_POR_DIMENSAO  # noqa: E402
+from felkla.codificacao import CODIGO_MAXIMO, empacotar_lote  # noqa: E402
+from felkla.pontuacao import QUESTOES_POR_FASE  # noqa: E402
+from felkla.semelhanca import IndiceSemelhanca  # noqa: E402
+
+AVALIACOES_POR_PROJETO = 4
+
+
+def gerar(quantidade, sorteio):
+    """Projetos, códigos (n, 25), score final e instantes de avaliações aleatórias."""
+    # Perfis com nível por projeto, para haver vizinhos próximos e empates
+    niveis = sorteio.integers(1, CODIGO_MAXIMO + 1, quantidade // AVALIACOES_POR_PROJETO + 1)
+    projetos = sorteio.integers(0, len(niveis), quantidade)
+    ruido = sorteio.integers(-1, 2, (quantidade, QUESTOES_POR_FASE))
+    codigos = np.clip(niveis[projetos, None] + ruido, 0, CODIGO_MAXIMO).astype(np.uint8)
+    score_final = (codigos.sum(axis=1) / (QUESTOES_POR_FASE * CODIGO_MAXIMO) * 100).astype(np.float64)
+    instantes = np.sort(sorteio.uniform(0, 1e9, quantidade))
+    return [f"Projeto {p}" for p in projetos.tolist()], codigos, score_final, instantes
+
+
+def conferir(indice, projetos, codigos, consultas, k, sorteio):
+    """Número de consultas cujos vizinhos diferem da força bruta (L1 sobre os códigos)."""
+    projetos = np.array(projetos)
+    divergentes = 0
+    for _ in range(consultas):
+        consulta = codigos[sorteio.integers(len(codigos))]
+        excluido = projetos[sorteio.integers(len(projetos))]
+        dimensao = sorteio.choice([None, *range(DIMENSOES_POR_FASE)])
+        colunas = (slice(None) if dimensao is None
+                   else slice(dimensao * QUESTOES_POR_DIMENSAO, (dimensao + 1) * QUESTOES_POR_DIMENSAO))
+        l1 = np.abs(codigos[:, colunas].astype(np.int64) - consulta[colunas]).sum(axis=1)
+        l1[projetos == excluido] = np.iinfo(np.int64).max
+        # Menor distância de cada projeto, e as k menores entre os projetos
+        ordem = np.lexsort((l1, projetos))
+        _, primeiros = np.unique(projetos[ordem], return_index=True)
+        minimos = np.sort(l1[ordem[primeiros]])
+        esperadas = minimos[minimos != np.iinfo(np.int64).max][:k].tolist()
+
+        vizinhos = indice.buscar(consulta, k, excluir=excluido, dimensao=dimensao)
+        obtidas = [vizinho['distancia'] for vizinho in vizinhos]
+        reais = [int(np.abs(codigos[(projetos == vizinho['projeto']), colunas].astype(np.int64)
+                            - consulta[colunas]).sum(axis=1).min()) for vizinho in vizinhos]
+        if (obtidas != esperadas or obtidas != reais or excluido in [v['projeto'] for v in vizinhos]
+                or len({v['projeto'] for v in vizinhos}) != len(vizinhos)):
+            divergentes += 1
+    return divergentes
+
+
+def medir(indice, codigos, consultas, k, dimensao, sorteio):
+    latencias = []
+    for _ in range(consultas):
+        consulta = codigos[sorteio.integers(len(codigos))]
+        inicio = time.perf_counter()
+        indice.buscar(consulta, k, dimensao=dimensao)
+        latencias.append((time.perf_counter() - inicio) * 1000)
+    return latencias
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Latência da busca de projetos semelhantes.')
+    parser.add_argument('--avaliacoes', type=int, default=1_000_000, help='avaliações no índice (padrão: 1 milhão)')
+    parser.add_argument('--consultas', type=int, default=200, help='consultas por medição (padrão: 200)')
+    parser.add_argument('--k', type=int, nargs='+', default=[5, 20], help='vizinhos por consulta (padrão: 5 20)')
+    parser.add_argument('--conferencias', type=int, default=20, help='consultas conferidas por força bruta')
+    args = parser.parse_args(argv)
+
+    sorteio = np.random.default_rng(0)
+    projetos, codigos, score_final, instantes = gerar(args.avaliacoes, sorteio)
+
+    indice = IndiceSemelhanca('felkla1')
+    inicio = time.perf_counter()
+    indice.adicionar(projetos, empacotar_lote(codigos), score_final, instantes)
+    print(f"índice: {len(indice):,} avaliações de {len(indice.nomes):,} projetos "
+          f"montado em {time.perf_counter() - inicio:.2f} s", file=sys.stderr)
+
+    # Uma avaliação por vez, como as gravações do app, sobre o índice já montado
+    acrescimos = 1000
+    inicio = time.perf_counter()
+    for i in range(acrescimos):
+        indice.adicionar(projetos[i:i + 1], empacotar_lote(codigos[i:i + 1]), score_final[i:i + 1],
+                         instantes[-1:] + i + 1)
+    print(f"acrescimo_us={(time.perf_counter() - inicio) / acrescimos * 1e6:.1f} "
+          f"(média de {acrescimos} avaliações acrescidas uma a uma)", file=sys.stderr)
+    projetos = projetos + projetos[:acrescimos]
+    codigos = np.vstack([codigos, codigos[:acrescimos]])
+
+    divergentes = sum(conferir(indice, projetos, codigos, args.conferencias, k, sorteio) for k in args.k)
+    if divergentes:
+        print(f"❌ {divergentes} consultas com vizinhos diferentes da força bruta", file=sys.stderr)
+        return 1
+
+    for k in args.k:
+        # Aquecimento descartado
+        medir(indice, codigos, 5, k, None, sorteio)
+        completas = statistics.quantiles(medir(indice, codigos, args.consultas, k, None, sorteio), n=100)
+        dimensao = statistics.median(medir(indice, codigos, args.consultas, k, 0, sorteio))
+        print(f"k={k:<4} p50_ms={completas[49]:<8.2f} p95_ms={completas[94]:<8.2f} "
+              f"dimensao_p50_ms={dimensao:.2f}", file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,194 @@
+"""Teste de carga do serviço HTTP de pontuação (felkla.servico).
+
+Uso:
+    python benchmarks/servico.py                        # 1, 16 e 256 clientes, 5 s cada
+    python benchmarks/servico.py --clientes 16 256 --duracao 10 --processos 4
+
+Sobe o serviço em um processo separado, numa porta livre, com as opções
+padrão ('micro-lotes') e com --lote 1 ('sem agrupamento', uma chamada de
+`pontuar` por requisição). Para cada número de clientes concorrentes, abre
+uma conexão keep-alive por cliente e envia POST /pontuar com uma avaliação
+aleatória por requisição, em laço fechado, durante `--duracao` segundos.
+Os clientes são distribuídos em `--processos` processos, cada um com seu
+loop asyncio. Registra:
+- requisicoes_s: requisições respondidas por segundo
+- p50_ms / p95_ms: latência de cada requisição, do envio à resposta
+- lote_medio: avaliações por chamada de `pontuar`, pelos contadores de /saude
+
+Antes da carga, confere que as respostas do serviço são idênticas a
+`pontuar_respostas` e `classificar`; se não forem, termina com código 1.
+Com poucos núcleos, clientes e serviço disputam a CPU: os números são
+comparáveis entre as variantes, não uma capacidade absoluta do serviço.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import subprocess
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+RAIZ = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(RAIZ))
+
+from felkla.codificacao import ROTULOS  # noqa: E402
+from felkla.pontuacao import FASES, QUESTOES_POR_FASE, classificar, pontuar_respostas  # noqa: E402
+
+CLIENTES_PADRAO = (1, 16, 256)
+VARIANTES = {
+    'micro-lotes': [],
+    'sem agrupamento': ['--lote', '1'],
+}
+# Corpos diferentes enviados em rodízio por cada processo cliente
+CORPOS = 512
+
+
+def avaliacao_aleatoria(sorteio):
+    return {
+        'fase': sorteio.choice(list(FASES)),
+        'respostas': [sorteio.choice(ROTULOS) for _ in range(QUESTOES_POR_FASE)],
+    }
+
+
+def _requisicao(metodo, caminho, corpo=b''):
+    return (f"{metodo} {caminho} HTTP/1.1\r\nHost: localhost\r\n"
+            f"Content-Type: application/json\r\nContent-Length: {len(corpo)}\r\n\r\n").encode('latin-1') + corpo
+
+
+async def _ler_resposta(leitor):
+    status = int((await leitor.readline()).split()[1])
+    tamanho = 0
+    while True:
+        linha = await leitor.readline()
+        if linha in (b'\r\n', b''):
+            break
+        nome, _, valor = linha.decode('latin-1').partition(':')
+        if nome.strip().lower() == 'content-length':
+            tamanho = int(valor)
+    return status, await leitor.readexactly(tamanho)
+
+
+async def _chamar(porta, metodo, caminho, dados=None):
+    leitor, escritor = await asyncio.open_connection('127.0.0.1', porta)
+    corpo = json.dumps(dados).encode('utf-8') if dados is not None else b''
+    escritor.write(_requisicao(metodo, caminho, corpo))
+    status, resposta = await _ler_resposta(leitor)
+    escritor.close()
+    return status, json.loads(resposta)
+
+
+async def _cliente(porta, requisicoes, fim, latencias):
+    leitor, escritor = await asyncio.open_connection('127.0.0.1', porta)
+    i = 0
+    while time.perf_counter() < fim:
+        inicio = time.perf_counter()
+        escritor.write(requisicoes[i % len(requisicoes)])
+        status, _ = await _ler_resposta(leitor)
+        if status != 200:
+            raise RuntimeError(f'Resposta {status} do serviço')
+        latencias.append(time.perf_counter() - inicio)
+        i += 1
+    escritor.close()
+
+
+async def _carga(porta, clientes, duracao, semente):
+    sorteio = random.Random(semente)
+    requisicoes = [_requisicao('POST', '/pontuar', json.dumps(avaliacao_aleatoria(sorteio)).encode('utf-8'))
+                   for _ in range(CORPOS)]
+    latencias = []
+    fim = time.perf_counter() + duracao
+    await asyncio.gather(*(_cliente(porta, requisicoes[c:] + requisicoes[:c], fim, latencias)
+                           for c in range(clientes)))
+    return latencias
+
+
+def carga(porta, clientes, duracao, semente):
+    """Latências (s) das requisições de `clientes` conexões concorrentes, em um processo."""
+    return asyncio.run(_carga(porta, clientes, duracao, semente))
+
+
+def iniciar_servico(argumentos):
+    """Processo do serviço numa porta livre e a porta escolhida."""
+    processo = subprocess.Popen([sys.executable, '-m', 'felkla.servico', '--porta', '0', *argumentos],
+                                cwd=RAIZ, stderr=subprocess.PIPE, text=True)
+    linha = processo.stderr.readline()
+    if 'http://' not in linha:
+        processo.kill()
+        raise RuntimeError(f'O serviço não subiu: {linha}')
+    return processo, int(linha.rsplit(':', 1)[1])
+
+
+def conferir(porta, quantidade=200):
+    """Compara as respostas do serviço com `pontuar_respostas` e `classificar`."""
+    sorteio = random.Random(0)
+    avaliacoes = [avaliacao_aleatoria(sorteio) for _ in range(quantidade)]
+    _, resultados = asyncio.run(_chamar(porta, 'POST', '/pontuar', avaliacoes))
+    divergentes = 0
+    for avaliacao, resultado in zip(avaliacoes, resultados):
+        esperado = pontuar_respostas(avaliacao['fase'], avaliacao['respostas'])
+        if (resultado['dimensoes'] != esperado['dimensoes'] or resultado['score_final'] != esperado['score_final']
+                or resultado['respondidas'] != esperado['respondidas']
+                or resultado['status'] != classificar(esperado['score_final'])):
+            divergentes += 1
+    return divergentes
+
+
+def medir(porta, clientes, duracao, processos):
+    processos = max(1, min(processos, clientes))
+    # Clientes repartidos entre os processos, cada um com uma semente própria
+    partes = [clientes // processos + (p < clientes % processos) for p in range(processos)]
+    _, antes = asyncio.run(_chamar(porta, 'GET', '/saude'))
+    with ProcessPoolExecutor(processos) as executor:
+        latencias = [latencia for parte in executor.map(carga, [porta] * processos, partes,
+                                                        [duracao] * processos, range(processos))
+                     for latencia in parte]
+    _, depois = asyncio.run(_chamar(porta, 'GET', '/saude'))
+    lotes = depois['lotes'] - antes['lotes']
+    avaliacoes = depois['avaliacoes'] - antes['avaliacoes']
+    quantis = statistics.quantiles(latencias, n=100)
+    return {
+        'requisicoes_s': round(len(latencias) / duracao),
+        'p50_ms': round(quantis[49] * 1000, 2),
+        'p95_ms': round(quantis[94] * 1000, 2),
+        'lote_medio': round(avaliacoes / max(lotes, 1), 1),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Teste de carga do serviço de pontuação FELKLA.')
+    parser.add_argument('--clientes', type=int, nargs='+', default=list(CLIENTES_PADRAO),
+                        help='clientes concorrentes (padrão: 1 16 256)')
+    parser.add_argument('--duracao', type=float, default=5.0, help='segundos de carga por medição (padrão: 5)')
+    parser.add_argument('--processos', type=int, default=max(1, (os.cpu_count() or 2) // 2),
+                        help='processos clientes (padrão: metade dos núcleos)')
+    parser.add_argument('--variantes', nargs='+', choices=list(VARIANTES), default=list(VARIANTES))
+    args = parser.parse_args(argv)
+
+    codigo = 0
+    for nome in args.variantes:
+        processo, porta = iniciar_servico(VARIANTES[nome])
+        try:
+            divergentes = conferir(porta)
+            if divergentes:
+                print(f"❌ {nome}: {divergentes} respostas diferentes de pontuar_respostas", file=sys.stderr)
+                codigo = 1
+                continue
+            # Aquecimento descartado
+            medir(porta, min(args.clientes), min(args.duracao, 1.0), 1)
+            for clientes in args.clientes:
+                resultado = medir(porta, clientes, args.duracao, args.processos)
+                print(f"{nome:<16} clientes={clientes:<5}" + "".join(f"{metrica}={valor:<9}"
+                                                                  for metrica, valor in resultado.items()),
+                      file=sys.stderr)
+        finally:
+            processo.terminate()
+            processo.wait()
+    return codigo
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1 @@
+"""Componentes reutilizáveis da Metodologia FELKLA (sem dependência do Streamlit)."""
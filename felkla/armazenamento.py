@@ -0,0 +1,560 @@
+"""Armazenamento persistente das avaliações FELKLA.
+
+Cada avaliação submetida é gravada com o projeto, a fase, o instante, as 25
+respostas brutas (empacotadas em 10 bytes, ver `felkla.codificacao`) e os
+scores calculados. O backend padrão é SQLite; outros
+backends implementam a interface `Armazenamento` e são registrados em
+`BACKENDS` pelo esquema da URL (ex.: sqlite:///caminho/felkla.db).
+
+As gravações vão para uma fila (`felkla.fila.FilaGravacao`) e são feitas em
+lotes por uma thread de fundo, de modo que `salvar` não espera pelo disco.
+Submissões idênticas do mesmo projeto e fase no mesmo lote são gravadas uma
+vez. As leituras consultam primeiro as avaliações ainda na fila, então uma
+avaliação recém-salva é visível imediatamente.
+
+O painel de portfólio lê agregados mantidos incrementalmente na tabela
+`agregados`. Eles cobrem a avaliação mais recente de cada projeto em cada fase:
+a cada gravação, a contribuição da avaliação anterior do projeto é subtraída
+e a da nova é somada. Assim, ler o portfólio custa O(dimensões),
+independentemente do número de projetos.
+
+A tabela `sessoes` guarda checkpoints das respostas em andamento de cada
+sessão do app, por token (ver `felkla.sessao`). Com o banco compartilhado,
+qualquer réplica do servidor retoma um questionário iniciado em outra. Os
+checkpoints passam por uma fila própria, que mantém só o mais recente de cada
+token em cada lote. Checkpoints sem atualização há EXPIRACAO_SESSOES segundos
+são apagados ao abrir o banco.
+
+O esquema é versionado por PRAGMA user_version. Bancos de versões anteriores
+são migrados ao abrir, em uma única transação.
+"""
+import atexit
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+
+import numpy as np
+
+from felkla.catalogo import DIMENSOES_POR_FASE
+from felkla.codificacao import BYTES_POR_AVALIACAO, codificar, decodificar, desempacotar, empacotar
+from felkla.fila import TAMANHO_LOTE, FilaCheia, FilaGravacao
+from felkla.pontuacao import FAIXAS, FASES, faixa
+
+log = logging.getLogger(__name__)
+
+URL_PADRAO = 'sqlite:///felkla.db'
+VARIAVEL_AMBIENTE = 'FELKLA_ARMAZENAMENTO'
+
+EXPIRACAO_SESSOES = 30 * 24 * 3600
+
+_TABELA_AVALIACOES = """
+CREATE TABLE IF NOT EXISTS avaliacoes (
+    id INTEGER PRIMARY KEY,
+    projeto TEXT NOT NULL,
+    fase TEXT NOT NULL,
+    criado_em REAL NOT NULL,
+    respostas BLOB NOT NULL,
+    d1 REAL NOT NULL,
+    d2 REAL NOT NULL,
+    d3 REAL NOT NULL,
+    d4 REAL NOT NULL,
+    d5 REAL NOT NULL,
+    score_final REAL NOT NULL,
+    respondidas INTEGER NOT NULL
+)"""
+
+_ESQUEMA = (
+    _TABELA_AVALIACOES,
+    "CREATE INDEX IF NOT EXISTS idx_avaliacoes_projeto_fase_data ON avaliacoes (projeto, fase, criado_em)",
+    """
+CREATE TABLE IF NOT EXISTS agregados (
+    fase TEXT NOT NULL,
+    chave TEXT NOT NULL,
+    valor REAL NOT NULL,
+    PRIMARY KEY (fase, chave)
+) WITHOUT ROWID""",
+    """
+CREATE TABLE IF NOT EXISTS sessoes (
+    token TEXT PRIMARY KEY,
+    dados TEXT NOT NULL,
+    atualizado_em REAL NOT NULL
+)""",
+)
+
+_COLUNAS = 'projeto, fase, criado_em, respostas, d1, d2, d3, d4, d5, score_final, respondidas'
+_INSERIR = f"INSERT INTO avaliacoes ({_COLUNAS}) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"
+_ULTIMA = ("SELECT criado_em, d1, d2, d3, d4, d5, score_final FROM avaliacoes WHERE projeto = ? AND fase = ? "
+           "ORDER BY criado_em DESC, id DESC LIMIT 1")
+_GRAVAR_SESSAO = ("INSERT INTO sessoes (token, dados, atualizado_em) VALUES (?, ?, ?) "
+                  "ON CONFLICT (token) DO UPDATE SET dados = excluded.dados, atualizado_em = excluded.atualizado_em")
+_SOMAR_AGREGADO = ("INSERT INTO agregados (fase, chave, valor) VALUES (?, ?, ?) "
+                   "ON CONFLICT (fase, chave) DO UPDATE SET valor = valor + excluded.valor")
+
+FAIXAS_HISTOGRAMA = 10
+
+
+def novo_registro(projeto, fase, respostas, resultado, criado_em=None):
+    """Monta o registro de uma avaliação a partir do resultado de `pontuar_respostas`."""
+    return {
+        'projeto': projeto,
+        'fase': fase,
+        'criado_em': time.time() if criado_em is None else criado_em,
+        'respostas': list(respostas),
+        'dimensoes': dict(resultado['dimensoes']),
+        'score_final': resultado['score_final'],
+        'respondidas': resultado['respondidas'],
+    }
+
+
+class Armazenamento:
+    """Interface dos backends de armazenamento."""
+
+    def salvar(self, registro):
+        """Enfileira um registro (ver `novo_registro`) para gravação."""
+        raise NotImplementedError
+
+    def ultima(self, projeto, fase):
+        """Avaliação mais recente do projeto na fase, ou None."""
+        raise NotImplementedError
+
+    def historico(self, projeto, fase=None):
+        """Avaliações do projeto (opcionalmente de uma fase), da mais antiga à mais recente."""
+        raise NotImplementedError
+
+    def serie(self, projeto, fase, inicio=None, fim=None):
+        """Scores do projeto na fase ao longo do tempo, opcionalmente entre `inicio` e `fim` (timestamps).
+
+        Retorna (instantes (n,), scores das dimensões (n, 5), score final (n,)), em ordem cronológica.
+        Lê só as colunas de scores, sem decodificar as respostas (ver `felkla.tendencia`).
+        """
+        raise NotImplementedError
+
+    def projetos(self):
+        """Projetos com alguma avaliação salva, em ordem alfabética."""
+        raise NotImplementedError
+
+    def agregados(self):
+        """Agregados do portfólio por fase: {fase: {chave: valor}} (ver `resumo_portfolio`)."""
+        raise NotImplementedError
+
+    def scores_atuais(self, fase):
+        """Avaliação mais recente de cada projeto na fase como matrizes.
+
+        Retorna (projetos, scores (n, 5) das dimensões, score_final (n,)),
+        em ordem de projeto.
+        """
+        raise NotImplementedError
+
+    def vetores(self, fase, apos=0):
+        """Avaliações gravadas da fase com id maior que `apos`, em ordem de id.
+
+        Retorna (ids (n,), projetos (lista), respostas empacotadas (n, 10)
+        uint8, score_final (n,), instantes (n,)). As avaliações ainda na fila
+        de gravação entram na primeira leitura depois de gravado o seu lote.
+        Atualiza o índice de semelhança sem reler o histórico (ver `felkla.semelhanca`).
+        """
+        raise NotImplementedError
+
+    def salvar_sessao(self, token, dados):
+        """Enfileira o checkpoint (dicionário serializável em JSON) de uma sessão do app."""
+        raise NotImplementedError
+
+    def carregar_sessao(self, token):
+        """Último checkpoint da sessão, ou None."""
+        raise NotImplementedError
+
+    def metricas(self):
+        """Contadores de cada fila de gravação: {fila: metricas} (ver `FilaGravacao.metricas`)."""
+        return {}
+
+    def descarregar(self):
+        """Aguarda a gravação de tudo o que está na fila."""
+
+    def fechar(self):
+        """Grava o que estiver pendente e libera os recursos."""
+
+
+class ArmazenamentoSQLite(Armazenamento):
+    """Backend SQLite com escritor em lote em uma thread de fundo."""
+
+    def __init__(self, caminho, tamanho_lote=TAMANHO_LOTE, **opcoes_fila):
+        self.caminho = str(caminho)
+        self._pendentes = {}
+        self._sessoes_pendentes = {}
+        self._trava = threading.Lock()
+        self._local = threading.local()
+        self._fechado = False
+
+        conexao = self._conectar()
+        try:
+            conexao.execute('PRAGMA journal_mode=WAL')
+            _migrar(conexao)
+            if conexao.execute("SELECT 1 FROM agregados LIMIT 1").fetchone() is None:
+                # Banco criado antes dos agregados (ou vazio): materializa uma vez
+                with conexao:
+                    _reconstruir_agregados(conexao)
+            with conexao:
+                conexao.execute("DELETE FROM sessoes WHERE atualizado_em < ?", (time.time() - EXPIRACAO_SESSOES,))
+        finally:
+            conexao.close()
+
+        self._fila = FilaGravacao(self._gravar_lote, tamanho_lote=tamanho_lote, chave=_chave_coalescencia,
+                                  concluido=self._retirar_pendentes, nome='felkla-armazenamento', **opcoes_fila)
+        self._fila_sessoes = FilaGravacao(self._gravar_sessoes, tamanho_lote=tamanho_lote,
+                                          chave=lambda checkpoint: checkpoint['token'],
+                                          concluido=self._retirar_sessoes_pendentes, nome='felkla-sessoes',
+                                          **opcoes_fila)
+        atexit.register(self.fechar)
+
+    def _conectar(self):
+        conexao = sqlite3.connect(self.caminho, timeout=30)
+        conexao.row_factory = sqlite3.Row
+        return conexao
+
+    def _conexao(self):
+        # Uma conexão por thread: o Streamlit executa cada sessão em uma
+        # thread, e a fila de gravação usa a sua
+        conexao = getattr(self._local, 'conexao', None)
+        if conexao is None:
+            conexao = self._local.conexao = self._conectar()
+        return conexao
+
+    def salvar(self, registro):
+        if self._fechado:
+            raise RuntimeError('armazenamento fechado')
+        chave = (registro['projeto'], registro['fase'])
+        with self._trava:
+            self._pendentes.setdefault(chave, []).append(registro)
+        try:
+            # Com a fila cheia, bloqueia e pode levantar FilaCheia
+            self._fila.enfileirar(registro)
+        except Exception:
+            self._retirar_pendentes([registro])
+            raise
+        return registro
+
+    def _gravar_lote(self, registros):
+        conexao = self._conexao()
+        # Trava de escrita desde a leitura das avaliações anteriores em
+        # `_atualizar_agregados`: outra instância sobre o mesmo banco (outra
+        # réplica) não pode gravar entre essa leitura e a atualização
+        conexao.execute("BEGIN IMMEDIATE")
+        with conexao:
+            _atualizar_agregados(conexao, registros)
+            conexao.executemany(_INSERIR, [_linha(r) for r in registros])
+
+    def _retirar_pendentes(self, registros):
+        with self._trava:
+            for registro in registros:
+                chave = (registro['projeto'], registro['fase'])
+                self._pendentes[chave].remove(registro)
+                if not self._pendentes[chave]:
+                    del self._pendentes[chave]
+
+    def salvar_sessao(self, token, dados):
+        checkpoint = {'token': token, 'dados': json.dumps(dados), 'atualizado_em': time.time()}
+        with self._trava:
+            self._sessoes_pendentes[token] = checkpoint
+        try:
+            self._fila_sessoes.enfileirar(checkpoint)
+        except FilaCheia:
+            # O próximo checkpoint da sessão substitui este
+            log.warning('Checkpoint da sessão %s descartado: fila cheia', token)
+            self._retirar_sessoes_pendentes([checkpoint])
+
+    def _gravar_sessoes(self, checkpoints):
+        conexao = self._conexao()
+        with conexao:
+            conexao.executemany(_GRAVAR_SESSAO, [(c['token'], c['dados'], c['atualizado_em']) for c in checkpoints])
+
+    def _retirar_sessoes_pendentes(self, checkpoints):
+        with self._trava:
+            for checkpoint in checkpoints:
+                if self._sessoes_pendentes.get(checkpoint['token']) is checkpoint:
+                    del self._sessoes_pendentes[checkpoint['token']]
+
+    def carregar_sessao(self, token):
+        with self._trava:
+            checkpoint = self._sessoes_pendentes.get(token)
+        if checkpoint is None:
+            checkpoint = self._conexao().execute("SELECT dados FROM sessoes WHERE token = ?", (token,)).fetchone()
+        return json.loads(checkpoint['dados']) if checkpoint else None
+
+    def ultima(self, projeto, fase):
+        with self._trava:
+            pendentes = self._pendentes.get((projeto, fase))
+            if pendentes:
+                return pendentes[-1]
+        linha = self._conexao().execute(
+            f"SELECT {_COLUNAS} FROM avaliacoes WHERE projeto = ? AND fase = ? "
+            "ORDER BY criado_em DESC, id DESC LIMIT 1", (projeto, fase)).fetchone()
+        return _registro(linha) if linha else None
+
+    def historico(self, projeto, fase=None):
+        if fase is None:
+            consulta, parametros = "WHERE projeto = ?", (projeto,)
+        else:
+            consulta, parametros = "WHERE projeto = ? AND fase = ?", (projeto, fase)
+        linhas = self._conexao().execute(
+            f"SELECT {_COLUNAS} FROM avaliacoes {consulta} ORDER BY criado_em, id", parametros).fetchall()
+        registros = [_registro(linha) for linha in linhas]
+
+        # Um lote pode ter sido gravado entre a consulta e a leitura da fila
+        gravados = {r['criado_em'] for r in registros}
+        with self._trava:
+            registros += [r for (p, f), pendentes in self._pendentes.items()
+                          if p == projeto and fase in (None, f)
+                          for r in pendentes if r['criado_em'] not in gravados]
+        registros.sort(key=lambda r: r['criado_em'])
+        return registros
+
+    def serie(self, projeto, fase, inicio=None, fim=None):
+        consulta, parametros = "WHERE projeto = ? AND fase = ?", [projeto, fase]
+        if inicio is not None:
+            consulta += " AND criado_em >= ?"
+            parametros.append(inicio)
+        if fim is not None:
+            consulta += " AND criado_em <= ?"
+            parametros.append(fim)
+        linhas = self._conexao().execute(
+            f"SELECT criado_em, d1, d2, d3, d4, d5, score_final FROM avaliacoes {consulta} ORDER BY criado_em, id",
+            parametros).fetchall()
+        valores = np.array(linhas, dtype=np.float64).reshape(-1, DIMENSOES_POR_FASE + 2)
+
+        # Avaliações ainda na fila; a consulta já pode incluir um lote recém-gravado
+        with self._trava:
+            pendentes = [r for r in self._pendentes.get((projeto, fase), ())
+                         if (inicio is None or r['criado_em'] >= inicio) and (fim is None or r['criado_em'] <= fim)]
+        gravados = set(valores[:, 0].tolist())
+        extras = [(r['criado_em'], *(r['dimensoes'][nome] for nome in FASES[fase]['dimensoes']), r['score_final'])
+                  for r in pendentes if r['criado_em'] not in gravados]
+        if extras:
+            valores = np.vstack([valores, extras])
+            valores = valores[np.argsort(valores[:, 0], kind='stable')]
+        return valores[:, 0], valores[:, 1:-1], valores[:, -1]
+
+    def projetos(self):
+        projetos = {linha[0] for linha in self._conexao().execute("SELECT DISTINCT projeto FROM avaliacoes")}
+        with self._trava:
+            projetos.update(projeto for projeto, _ in self._pendentes)
+        return sorted(projetos)
+
+    def agregados(self):
+        resultado = {}
+        for fase, chave, valor in self._conexao().execute("SELECT fase, chave, valor FROM agregados"):
+            resultado.setdefault(fase, {})[chave] = valor
+        return resultado
+
+    def scores_atuais(self, fase):
+        linhas = self._conexao().execute(
+            "SELECT projeto, d1, d2, d3, d4, d5, score_final FROM ("
+            "  SELECT *, ROW_NUMBER() OVER (PARTITION BY projeto ORDER BY criado_em DESC, id DESC) AS ordem"
+            "  FROM avaliacoes WHERE fase = ?"
+            ") WHERE ordem = 1", (fase,)).fetchall()
+        atuais = {linha[0]: tuple(linha[1:]) for linha in linhas}
+        with self._trava:
+            for (projeto, f), pendentes in self._pendentes.items():
+                if f == fase:
+                    registro = pendentes[-1]
+                    atuais[projeto] = (*(registro['dimensoes'][nome] for nome in FASES[fase]['dimensoes']),
+                                       registro['score_final'])
+
+        projetos = sorted(atuais)
+        valores = np.array([atuais[p] for p in projetos], dtype=np.float64).reshape(-1, DIMENSOES_POR_FASE + 1)
+        return projetos, valores[:, :-1], valores[:, -1]
+
+    def vetores(self, fase, apos=0):
+        cursor = self._conexao().cursor()
+        # Tuplas simples: com um milhão de linhas, sqlite3.Row custa caro
+        cursor.row_factory = None
+        linhas = cursor.execute(
+            "SELECT id, projeto, respostas, score_final, criado_em FROM avaliacoes "
+            "WHERE id > ? AND fase = ? ORDER BY id", (apos, fase)).fetchall()
+        if not linhas:
+            return (np.empty(0, dtype=np.int64), [], np.empty((0, BYTES_POR_AVALIACAO), dtype=np.uint8),
+                    np.empty(0), np.empty(0))
+        ids, projetos, respostas, score_final, instantes = zip(*linhas)
+        return (np.array(ids, dtype=np.int64), list(projetos),
+                np.frombuffer(b''.join(respostas), dtype=np.uint8).reshape(-1, BYTES_POR_AVALIACAO),
+                np.array(score_final, dtype=np.float64), np.array(instantes, dtype=np.float64))
+
+    def reconstruir_agregados(self):
+        """Recalcula os agregados a partir das avaliações (manutenção)."""
+        self.descarregar()
+        conexao = self._conectar()
+        try:
+            with conexao:
+                _reconstruir_agregados(conexao)
+        finally:
+            conexao.close()
+
+    def metricas(self):
+        return {'avaliacoes': self._fila.metricas(), 'sessoes': self._fila_sessoes.metricas()}
+
+    def descarregar(self):
+        self._fila.descarregar()
+        self._fila_sessoes.descarregar()
+
+    def fechar(self):
+        if self._fechado:
+            return
+        self._fechado = True
+        self._fila.fechar()
+        self._fila_sessoes.fechar()
+
+
+def _chave_coalescencia(registro):
+    # Submissões repetidas (mesmo projeto, fase e respostas) no mesmo lote
+    return registro['projeto'], registro['fase'], tuple(registro['respostas'])
+
+
+def _linha(registro):
+    scores = [registro['dimensoes'][nome] for nome in FASES[registro['fase']]['dimensoes']]
+    return (registro['projeto'], registro['fase'], registro['criado_em'],
+            empacotar(codificar(registro['respostas'])),
+            *scores, registro['score_final'], registro['respondidas'])
+
+
+def _registro(linha):
+    dimensoes = FASES[linha['fase']]['dimensoes']
+    return {
+        'projeto': linha['projeto'],
+        'fase': linha['fase'],
+        'criado_em': linha['criado_em'],
+        'respostas': decodificar(desempacotar(linha['respostas'])),
+        'dimensoes': {nome: linha[f'd{i}'] for i, nome in enumerate(dimensoes, 1)},
+        'score_final': linha['score_final'],
+        'respondidas': linha['respondidas'],
+    }
+
+
+def _empacotar_respostas_json(conexao):
+    """Versão 0 → 1: respostas em JSON (TEXT) passam a 10 bytes empacotados (BLOB)."""
+    conexao.create_function('empacotar_json', 1, lambda texto: empacotar(codificar(json.loads(texto))),
+                            deterministic=True)
+    conexao.execute("DROP INDEX IF EXISTS idx_avaliacoes_projeto_fase_data")
+    conexao.execute("ALTER TABLE avaliacoes RENAME TO avaliacoes_v0")
+    conexao.execute(_TABELA_AVALIACOES)
+    conexao.execute(f"INSERT INTO avaliacoes (id, {_COLUNAS}) "
+                    f"SELECT id, {_COLUNAS.replace('respostas', 'empacotar_json(respostas)')} FROM avaliacoes_v0")
+    conexao.execute("DROP TABLE avaliacoes_v0")
+
+
+# Migrações em ordem: _MIGRACOES[v] leva o banco da versão v para v + 1
+_MIGRACOES = (_empacotar_respostas_json,)
+VERSAO_ESQUEMA = len(_MIGRACOES)
+
+
+def _migrar(conexao):
+    versao = conexao.execute("PRAGMA user_version").fetchone()[0]
+    if versao > VERSAO_ESQUEMA:
+        raise RuntimeError(f"Banco na versão {versao}, mais nova que a suportada ({VERSAO_ESQUEMA})")
+    existente = conexao.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'avaliacoes'").fetchone()
+
+    conexao.execute("BEGIN IMMEDIATE")
+    try:
+        if existente:
+            for migracao in _MIGRACOES[versao:]:
+                log.info('Migrando o esquema do armazenamento da versão %d para %d', versao, versao + 1)
+                migracao(conexao)
+                versao += 1
+        for comando in _ESQUEMA:
+            conexao.execute(comando)
+        conexao.execute(f"PRAGMA user_version = {VERSAO_ESQUEMA}")
+        conexao.commit()
+    except BaseException:
+        conexao.rollback()
+        raise
+
+
+def _contribuicao(scores, score_final):
+    """Contribuição de uma avaliação para os agregados da sua fase."""
+    contribuicao = {
+        'projetos': 1,
+        'soma_score': score_final,
+        f'faixa_{faixa(score_final)}': 1,
+        f'hist_{min(int(score_final * FAIXAS_HISTOGRAMA // 100), FAIXAS_HISTOGRAMA - 1)}': 1,
+    }
+    for i, score in enumerate(scores, 1):
+        contribuicao[f'soma_d{i}'] = score
+        if faixa(score) == 'reprovado':
+            contribuicao[f'criticas_d{i}'] = 1
+    return contribuicao
+
+
+def _atualizar_agregados(conexao, registros):
+    """Aplica aos agregados a troca da avaliação mais recente de cada projeto."""
+    # Chamado antes da inserção do lote, na mesma transação (BEGIN IMMEDIATE)
+    anteriores = {}
+    deltas = {}
+    for registro in registros:
+        chave = (registro['projeto'], registro['fase'])
+        if chave not in anteriores:
+            linha = conexao.execute(_ULTIMA, chave).fetchone()
+            anteriores[chave] = (linha[0], linha[1:6], linha[6]) if linha else None
+        anterior = anteriores[chave]
+        if anterior is not None and registro['criado_em'] < anterior[0]:
+            # Avaliação retroativa: a mais recente continua a mesma
+            continue
+
+        scores = [registro['dimensoes'][nome] for nome in FASES[registro['fase']]['dimensoes']]
+        for nome, valor in _contribuicao(scores, registro['score_final']).items():
+            deltas[registro['fase'], nome] = deltas.get((registro['fase'], nome), 0) + valor
+        if anterior is not None:
+            for nome, valor in _contribuicao(anterior[1], anterior[2]).items():
+                deltas[registro['fase'], nome] = deltas.get((registro['fase'], nome), 0) - valor
+        anteriores[chave] = (registro['criado_em'], scores, registro['score_final'])
+
+    conexao.executemany(_SOMAR_AGREGADO, [(fase, nome, valor) for (fase, nome), valor in deltas.items()])
+
+
+def _reconstruir_agregados(conexao):
+    conexao.execute("DELETE FROM agregados")
+    linhas = conexao.execute(
+        "SELECT fase, d1, d2, d3, d4, d5, score_final, MAX(criado_em) FROM avaliacoes GROUP BY projeto, fase")
+    deltas = {}
+    for fase, *valores, _ in linhas:
+        for nome, valor in _contribuicao(valores[:5], valores[5]).items():
+            deltas[fase, nome] = deltas.get((fase, nome), 0) + valor
+    conexao.executemany(_SOMAR_AGREGADO, [(fase, nome, valor) for (fase, nome), valor in deltas.items()])
+
+
+def resumo_portfolio(fase, valores):
+    """Estatísticas do portfólio de uma fase a partir dos seus agregados."""
+    projetos = int(valores.get('projetos', 0))
+    if not projetos:
+        return None
+    dimensoes = [
+        (nome, valores.get(f'soma_d{i}', 0) / projetos, valores.get(f'criticas_d{i}', 0) / projetos)
+        for i, nome in enumerate(FASES[fase]['dimensoes'], 1)
+    ]
+    return {
+        'projetos': projetos,
+        'score_medio': valores.get('soma_score', 0) / projetos,
+        'faixas': {nome: valores.get(f'faixa_{nome}', 0) / projetos for nome in FAIXAS},
+        'histograma': [int(valores.get(f'hist_{i}', 0)) for i in range(FAIXAS_HISTOGRAMA)],
+        # (nome, score médio, fração de projetos com a dimensão abaixo de 60%), da mais fraca à mais forte
+        'dimensoes': sorted(dimensoes, key=lambda d: d[1]),
+    }
+
+
+BACKENDS = {'sqlite': ArmazenamentoSQLite}
+
+
+def criar_armazenamento(url=None):
+    """Cria o backend indicado pela URL (padrão: variável FELKLA_ARMAZENAMENTO ou felkla.db)."""
+    url = url or os.environ.get(VARIAVEL_AMBIENTE) or URL_PADRAO
+    esquema, separador, caminho = url.partition('://')
+    if not separador:
+        # Caminho simples de arquivo
+        esquema, caminho = 'sqlite', url
+    elif esquema == 'sqlite' and caminho.startswith('/'):
+        # sqlite:///relativo.db → 'relativo.db'; sqlite:////abs/felkla.db → '/abs/felkla.db'
+        caminho = caminho[1:]
+    if esquema not in BACKENDS:
+        raise ValueError(f"Backend de armazenamento desconhecido: {esquema!r} (disponíveis: {', '.join(BACKENDS)})")
+    return BACKENDS[esquema](caminho)
@@ -0,0 +1,56 @@
+"""Catálogo declarativo das fases FELKLA (fase → dimensão → peso → questões).
+
+O conteúdo fica em catalogo.json e é lido uma única vez por processo, do
+pickle gerado no build quando houver (ver `felkla.compilado`). Para incluir
+uma fase nova basta acrescentá-la ao arquivo; a interface e o motor de
+pontuação iteram sobre o catálogo.
+"""
+import functools
+import json
+from pathlib import Path
+
+from felkla import compilado
+
+CAMINHO_CATALOGO = Path(__file__).with_name('catalogo.json')
+
+DIMENSOES_POR_FASE = 5
+QUESTOES_POR_DIMENSAO = 5
+
+
+def _validar(catalogo):
+    for fase in catalogo['fases']:
+        dimensoes = fase['dimensoes']
+        if len(dimensoes) != DIMENSOES_POR_FASE:
+            raise ValueError(f"{fase['id']}: esperadas {DIMENSOES_POR_FASE} dimensões, encontradas {len(dimensoes)}")
+        for dimensao in dimensoes:
+            if len(dimensao['questoes']) != QUESTOES_POR_DIMENSAO:
+                raise ValueError(f"{fase['id']}/{dimensao['nome']}: esperadas {QUESTOES_POR_DIMENSAO} questões")
+        if sum(d['peso'] for d in dimensoes) != 100:
+            raise ValueError(f"{fase['id']}: a soma dos pesos deve ser 100%")
+
+
+def ler_catalogo(caminho):
+    """Lê e valida o catálogo do arquivo JSON."""
+    with open(caminho, encoding='utf-8') as arquivo:
+        catalogo = json.load(arquivo)
+    _validar(catalogo)
+    catalogo['por_id'] = {fase['id']: fase for fase in catalogo['fases']}
+    return catalogo
+
+
+@functools.lru_cache(maxsize=None)
+def carregar_catalogo(caminho=CAMINHO_CATALOGO):
+    """Catálogo validado; o resultado é compartilhado por todo o processo.
+
+    O catálogo padrão vem do build (ver `felkla.compilado`) quando disponível.
+    """
+    if caminho == CAMINHO_CATALOGO:
+        catalogo = compilado.ler('catalogo', caminho)
+        if catalogo is not None:
+            return catalogo
+    return ler_catalogo(caminho)
+
+
+def questoes_fase(fase):
+    """Lista plana das 25 questões de uma fase, na ordem q11..q55."""
+    return [questao for dimensao in fase['dimensoes'] for questao in dimensao['questoes']]
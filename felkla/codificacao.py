@@ -0,0 +1,83 @@
+"""Representação compacta das respostas de uma fase FELKLA.
+
+O código de cada resposta é a sua pontuação: 0 indica questão não respondida e
+1..5 correspondem a 'Não iniciado'..'Excelente'. Um vetor de códigos é,
+portanto, uma linha da matriz de pontos de `pontuacao.pontuar`, sem conversão.
+
+Para armazenamento e transferência, os 25 códigos são empacotados com 3 bits
+cada em 10 bytes: 75 bits big-endian, com q11 nos bits mais significativos
+e os 5 bits finais zerados. Esse formato é estável; avaliações iguais têm bytes
+iguais, o que torna triviais a comparação, o hash e a deduplicação.
+"""
+import base64
+
+import numpy as np
+
+from felkla.pontuacao import PONTUACAO, QUESTOES_POR_FASE
+
+BITS_POR_RESPOSTA = 3
+BYTES_POR_AVALIACAO = -(-QUESTOES_POR_FASE * BITS_POR_RESPOSTA // 8)
+
+# Rótulo de cada código (índice = código = pontos)
+ROTULOS = (None,) + tuple(sorted(PONTUACAO, key=PONTUACAO.get))
+CODIGO_MAXIMO = len(ROTULOS) - 1
+# Código de cada rótulo
+CODIGOS = {rotulo: codigo for codigo, rotulo in enumerate(ROTULOS)}
+
+
+def codificar(respostas):
+    """Converte os 25 rótulos (None = não respondida) em vetor uint8 de códigos."""
+    try:
+        codigos = [CODIGOS[resposta] for resposta in respostas]
+    except KeyError as erro:
+        raise ValueError(f"Resposta desconhecida: {erro.args[0]!r}") from None
+    if len(codigos) != QUESTOES_POR_FASE:
+        raise ValueError(f"Esperadas {QUESTOES_POR_FASE} respostas, recebidas {len(codigos)}")
+    return np.array(codigos, dtype=np.uint8)
+
+
+def decodificar(codigos):
+    """Converte um vetor de códigos de volta na lista de rótulos."""
+    return [ROTULOS[codigo] for codigo in np.asarray(codigos).tolist()]
+
+
+def empacotar_lote(codigos):
+    """Empacota uma matriz (n, 25) de códigos em uma matriz (n, 10) de bytes."""
+    codigos = np.asarray(codigos, dtype=np.uint8).reshape(-1, QUESTOES_POR_FASE)
+    # Os 3 bits menos significativos de cada código, em ordem big-endian
+    bits = np.unpackbits(codigos[:, :, np.newaxis], axis=2)[:, :, -BITS_POR_RESPOSTA:]
+    return np.packbits(bits.reshape(len(codigos), -1), axis=1)
+
+
+def desempacotar_lote(dados):
+    """Inverso de `empacotar_lote`: matriz (n, 10) de bytes → matriz (n, 25) de códigos."""
+    dados = np.asarray(dados, dtype=np.uint8).reshape(-1, BYTES_POR_AVALIACAO)
+    bits = np.unpackbits(dados, axis=1, count=QUESTOES_POR_FASE * BITS_POR_RESPOSTA)
+    bits = bits.reshape(len(dados), QUESTOES_POR_FASE, BITS_POR_RESPOSTA)
+    codigos = (bits[:, :, 0] << 2) | (bits[:, :, 1] << 1) | bits[:, :, 2]
+    if codigos.size and codigos.max() > CODIGO_MAXIMO:
+        raise ValueError("Dados empacotados inválidos: código de resposta fora da faixa")
+    return codigos
+
+
+def empacotar(codigos):
+    """Empacota o vetor de 25 códigos de uma avaliação em 10 bytes."""
+    return empacotar_lote(codigos)[0].tobytes()
+
+
+def desempacotar(dados):
+    """Vetor de 25 códigos a partir dos 10 bytes de uma avaliação."""
+    if len(dados) != BYTES_POR_AVALIACAO:
+        raise ValueError(f"Esperados {BYTES_POR_AVALIACAO} bytes, recebidos {len(dados)}")
+    return desempacotar_lote(np.frombuffer(dados, dtype=np.uint8))[0]
+
+
+def serializar(respostas):
+    """Forma textual estável das respostas (base64 URL-safe, 14 caracteres)."""
+    return base64.urlsafe_b64encode(empacotar(codificar(respostas))).rstrip(b'=').decode('ascii')
+
+
+def desserializar(texto):
+    """Rótulos das respostas a partir de `serializar`."""
+    dados = base64.urlsafe_b64decode(texto + '=' * (-len(texto) % 4))
+    return decodificar(desempacotar(dados))
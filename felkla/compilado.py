@@ -0,0 +1,92 @@
+"""Recursos do app pré-compilados no build: catálogo validado e CSS minificado.
+
+Uso (no build da imagem ou do devcontainer):
+    python -m felkla.compilado
+
+Grava compilado.pickle com o catálogo já validado e indexado por id (ver
+`catalogo.carregar_catalogo`) e a folha de estilo já minificada (ver
+`estilo.folha_de_estilo`), junto com o tamanho e a data de modificação dos
+arquivos de origem. Na partida, os dois são lidos do pickle. Se o pickle não
+existe ou algum arquivo de origem mudou depois do build, são lidos dos
+arquivos de origem, como antes.
+
+FELKLA_COMPILADO aponta para outro arquivo; FELKLA_COMPILADO=0 ignora o
+pickle. O arquivo é gerado pelo próprio build e nunca vem de fora: pickle não
+é um formato seguro para dados não confiáveis.
+"""
+import functools
+import logging
+import os
+import pickle
+import sys
+from pathlib import Path
+
+log = logging.getLogger(__name__)
+
+CAMINHO_PADRAO = Path(__file__).with_name('compilado.pickle')
+VARIAVEL_AMBIENTE = 'FELKLA_COMPILADO'
+
+
+def caminho_compilado():
+    """Arquivo do pickle, ou None com FELKLA_COMPILADO=0."""
+    valor = os.environ.get(VARIAVEL_AMBIENTE, '')
+    if valor == '0':
+        return None
+    return Path(valor) if valor else CAMINHO_PADRAO
+
+
+def _assinatura(caminho):
+    estado = os.stat(caminho)
+    return estado.st_size, estado.st_mtime_ns
+
+
+@functools.lru_cache(maxsize=None)
+def _carregar(caminho):
+    try:
+        with open(caminho, 'rb') as arquivo:
+            return pickle.load(arquivo)
+    except FileNotFoundError:
+        return {}
+
+
+def ler(nome, origem):
+    """Recurso `nome` do pickle, ou None se ausente ou se `origem` mudou desde o build."""
+    caminho = caminho_compilado()
+    if caminho is None:
+        return None
+    recurso = _carregar(caminho).get(nome)
+    if recurso is None:
+        return None
+    assinatura, valor = recurso
+    if assinatura != _assinatura(origem):
+        log.info('%s mudou desde o build; %s lido da origem', origem, nome)
+        return None
+    return valor
+
+
+def compilar(destino=CAMINHO_PADRAO):
+    """Grava o pickle com o catálogo e a folha de estilo lidos das origens."""
+    from felkla.catalogo import CAMINHO_CATALOGO, ler_catalogo
+    from felkla.estilo import CAMINHO_CSS, gerar_folha_de_estilo
+
+    recursos = {
+        'catalogo': (_assinatura(CAMINHO_CATALOGO), ler_catalogo(CAMINHO_CATALOGO)),
+        'css': (_assinatura(CAMINHO_CSS), gerar_folha_de_estilo(CAMINHO_CSS)),
+    }
+    temporario = Path(destino).with_suffix('.tmp')
+    with open(temporario, 'wb') as arquivo:
+        pickle.dump(recursos, arquivo, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(temporario, destino)
+    return recursos
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    destino = Path(argv[0]) if argv else CAMINHO_PADRAO
+    compilar(destino)
+    print(f"Recursos pré-compilados em {destino}", file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
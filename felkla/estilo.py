@@ -0,0 +1,43 @@
+"""Folha de estilo do app, mantida em estilo.css.
+
+O CSS é lido e minificado uma única vez por processo (ou já vem minificado
+do build, ver `felkla.compilado`) e enviado como um único elemento `<style>`
+de conteúdo fixo. Como o elemento é idêntico em todas as execuções, o
+navegador o guarda no cache de mensagens do Streamlit (ver
+`global.minCachedMessageSize` em .streamlit/config.toml) e as reruns seguintes
+enviam apenas o hash da mensagem. Os cartões HTML do app usam as classes
+definidas aqui em vez de atributos `style`.
+
+O servidor de arquivos estáticos do Streamlit (`server.enableStaticServing`)
+não serve: ele entrega .css como text/plain com `X-Content-Type-Options:
+nosniff`, e o navegador recusa a folha em um `<link rel="stylesheet">`.
+"""
+import functools
+import re
+from pathlib import Path
+
+from felkla import compilado
+
+CAMINHO_CSS = Path(__file__).with_name('estilo.css')
+
+
+def minificar(css):
+    """Remove comentários e espaços desnecessários do CSS."""
+    css = re.sub(r'/\*.*?\*/', '', css, flags=re.S)
+    css = re.sub(r'\s+', ' ', css)
+    css = re.sub(r'\s*([{};:,>])\s*', r'\1', css)
+    return css.replace(';}', '}').strip()
+
+
+def gerar_folha_de_estilo(caminho):
+    return f"<style>{minificar(Path(caminho).read_text(encoding='utf-8'))}</style>"
+
+
+@functools.lru_cache(maxsize=None)
+def folha_de_estilo(caminho=CAMINHO_CSS):
+    """Elemento `<style>` com o CSS minificado do app, do build quando disponível."""
+    if caminho == CAMINHO_CSS:
+        folha = compilado.ler('css', caminho)
+        if folha is not None:
+            return folha
+    return gerar_folha_de_estilo(caminho)
@@ -0,0 +1,163 @@
+"""Fila de gravação em segundo plano (write-behind) para qualquer destino.
+
+`enfileirar` apenas coloca o registro na fila. Uma thread de fundo retira os
+registros em lotes de até `tamanho_lote` e os entrega de uma só vez à função
+`gravar(registros)`, que é o destino: o SQLite em `felkla.armazenamento`, ou
+um destino falso e lento para testes. Registros do mesmo lote com a mesma
+chave de coalescência (função `chave`) são gravados uma única vez; o
+registro mantido é o mais recente.
+
+Uma falha do destino é repetida até `tentativas` vezes, com espera
+exponencial a partir de `espera` segundos. Se o lote ainda falhar, é
+descartado e registrado no log. A fila guarda no máximo `capacidade`
+registros. Quando o destino não acompanha, `enfileirar` bloqueia por até
+`timeout` segundos e então levanta FilaCheia (back-pressure), em vez de
+acumular memória sem limite.
+
+`metricas` traz a profundidade da fila e os contadores. Inclui também a
+latência das gravações dos últimos JANELA lotes.
+"""
+import collections
+import logging
+import queue
+import threading
+import time
+
+from felkla.perfil import quantil
+
+log = logging.getLogger(__name__)
+
+TAMANHO_LOTE = 200
+CAPACIDADE = 10_000
+TENTATIVAS = 3
+ESPERA = 0.5
+TIMEOUT = 2.0
+JANELA = 1000
+
+CONTADORES = ('enfileirados', 'gravados', 'coalescidos', 'lotes', 'repeticoes', 'descartados')
+
+
+class FilaCheia(RuntimeError):
+    """A fila atingiu a capacidade e o destino não a esvaziou a tempo."""
+
+
+class FilaGravacao:
+    """Fila limitada esvaziada em lotes por uma thread de fundo."""
+
+    def __init__(self, gravar, tamanho_lote=TAMANHO_LOTE, capacidade=CAPACIDADE, tentativas=TENTATIVAS,
+                 espera=ESPERA, chave=None, concluido=None, nome='felkla-fila'):
+        self._gravar = gravar
+        self.tamanho_lote = tamanho_lote
+        self.tentativas = tentativas
+        self.espera = espera
+        self._chave = chave
+        # Chamada com todos os registros de cada lote após a gravação (ou o descarte)
+        self._concluido = concluido
+        self._fila = queue.Queue(maxsize=capacidade)
+        self._trava = threading.Lock()
+        self._contadores = dict.fromkeys(CONTADORES, 0)
+        self._latencias = collections.deque(maxlen=JANELA)
+        self._fechada = False
+
+        self._thread = threading.Thread(target=self._executar, name=nome, daemon=True)
+        self._thread.start()
+
+    def enfileirar(self, registro, timeout=TIMEOUT):
+        if self._fechada:
+            raise RuntimeError('fila de gravação fechada')
+        try:
+            self._fila.put(registro, timeout=timeout)
+        except queue.Full:
+            raise FilaCheia(f"Fila de gravação cheia ({self._fila.maxsize} registros)") from None
+        with self._trava:
+            self._contadores['enfileirados'] += 1
+
+    def _executar(self):
+        while True:
+            lote = [self._fila.get()]
+            while len(lote) < self.tamanho_lote:
+                try:
+                    lote.append(self._fila.get_nowait())
+                except queue.Empty:
+                    break
+
+            registros = [r for r in lote if r is not None]
+            if registros:
+                self._entregar(registros)
+
+            for _ in lote:
+                self._fila.task_done()
+            if len(registros) < len(lote):
+                return
+
+    def _coalescer(self, registros):
+        if self._chave is None:
+            return registros
+        # Mantém a última ocorrência de cada chave, na posição dela no lote
+        vistos = set()
+        mantidos = []
+        for registro in reversed(registros):
+            chave = self._chave(registro)
+            if chave not in vistos:
+                vistos.add(chave)
+                mantidos.append(registro)
+        mantidos.reverse()
+        return mantidos
+
+    def _entregar(self, registros):
+        mantidos = self._coalescer(registros)
+        repeticoes = 0
+        gravado = False
+        inicio = time.perf_counter()
+        while True:
+            try:
+                self._gravar(mantidos)
+                gravado = True
+                break
+            except Exception:
+                if repeticoes + 1 >= self.tentativas:
+                    log.exception('Lote de %d registros descartado após %d tentativas',
+                                  len(mantidos), self.tentativas)
+                    break
+                log.warning('Falha ao gravar lote de %d registros; nova tentativa', len(mantidos), exc_info=True)
+                time.sleep(self.espera * 2 ** repeticoes)
+                repeticoes += 1
+        duracao = time.perf_counter() - inicio
+
+        with self._trava:
+            self._contadores['lotes'] += 1
+            self._contadores['coalescidos'] += len(registros) - len(mantidos)
+            self._contadores['repeticoes'] += repeticoes
+            self._contadores['gravados' if gravado else 'descartados'] += len(mantidos)
+            self._latencias.append(duracao)
+
+        if self._concluido is not None:
+            try:
+                self._concluido(registros)
+            except Exception:
+                # Sem esta proteção a thread morreria e `enfileirar` bloquearia até FilaCheia
+                log.exception('Falha no retorno de conclusão de um lote de %d registros', len(registros))
+
+    def metricas(self):
+        """Profundidade da fila, contadores e latência das gravações (ms)."""
+        with self._trava:
+            metricas = dict(self._contadores)
+            latencias = sorted(self._latencias)
+        metricas['profundidade'] = self._fila.qsize()
+        for q in (0.5, 0.95):
+            valor = quantil(latencias, q) if latencias else 0.0
+            metricas[f'latencia_p{round(q * 100)}_ms'] = round(valor * 1000, 2)
+        metricas['latencia_max_ms'] = round(latencias[-1] * 1000, 2) if latencias else 0.0
+        return metricas
+
+    def descarregar(self):
+        """Aguarda a gravação de tudo o que está na fila."""
+        self._fila.join()
+
+    def fechar(self):
+        """Grava o que estiver pendente e encerra a thread."""
+        if self._fechada:
+            return
+        self._fechada = True
+        self._fila.put(None)
+        self._thread.join()
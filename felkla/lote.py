@@ -0,0 +1,244 @@
+"""Pontuação offline em lote de avaliações FELKLA exportadas em CSV ou JSONL.
+
+Uso:
+    python -m felkla.lote avaliacoes.csv -o resultados.csv
+    python -m felkla.lote avaliacoes.jsonl -o resultados.jsonl --processos 8
+
+Cada linha de entrada é uma avaliação, com as respostas nas colunas q11..q55
+(FELKLA-1), q11_f2..q55_f2 (FELKLA-2) e/ou q11_f3..q55_f3 (FELKLA-3). Todas as
+fases cujas colunas estão presentes são pontuadas. Células vazias contam como
+questões não respondidas. O arquivo é lido em blocos de linhas, pontuado em um
+pool de processos e escrito na ordem original, com memória limitada ao número
+de blocos em andamento. Assume-se uma avaliação por linha física (sem quebras
+de linha dentro de campos). Linhas em branco são ignoradas; linhas CSV com
+menos campos que o cabeçalho e linhas JSONL que não são um objeto JSON ficam
+de fora do resultado e são informadas pelo número da linha.
+"""
+import argparse
+import collections
+import csv
+import io
+import itertools
+import json
+import operator
+import os
+import sys
+import time
+import unicodedata
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from felkla.pontuacao import FASES, PONTUACAO, QUESTOES_POR_FASE, STATUS, classificar_lote, pontuar
+
+SUFIXOS = {'felkla1': '', 'felkla2': '_f2', 'felkla3': '_f3'}
+PREFIXOS_SAIDA = {'felkla1': 'f1', 'felkla2': 'f2', 'felkla3': 'f3'}
+
+TAMANHO_BLOCO = 50_000
+LINHAS_IGNORADAS_EXIBIDAS = 10
+
+
+def colunas_fase(fase):
+    """Nomes das 25 colunas de respostas de uma fase, na ordem q11..q55."""
+    sufixo = SUFIXOS[fase]
+    return [f'q{d}{q}{sufixo}' for d in range(1, 6) for q in range(1, 6)]
+
+
+def _slug(texto):
+    texto = unicodedata.normalize('NFKD', texto).encode('ascii', 'ignore').decode()
+    return ''.join(c if c.isalnum() else '_' for c in texto.lower()).strip('_').replace('__', '_')
+
+
+def colunas_saida(coluna_id, fases):
+    colunas = [coluna_id]
+    for fase in fases:
+        prefixo = PREFIXOS_SAIDA[fase]
+        colunas += [f'{prefixo}_{_slug(d)}' for d in FASES[fase]['dimensoes']]
+        colunas += [f'{prefixo}_score_final', f'{prefixo}_status']
+    return colunas
+
+
+# Célula vazia = não respondida; rótulos desconhecidos recebem INVALIDO e são
+# tratados como não respondidos, mas contabilizados no relatório final.
+INVALIDO = 255
+_MAPA_PONTOS = {**PONTUACAO, '': 0, None: 0}
+
+
+def _matriz_fase(valores, n):
+    pontos = np.fromiter(map(_MAPA_PONTOS.get, valores, itertools.repeat(INVALIDO)), dtype=np.uint8,
+                         count=n * QUESTOES_POR_FASE).reshape(n, QUESTOES_POR_FASE)
+    invalidos = pontos == INVALIDO
+    pontos[invalidos] = 0
+    return pontos, int(invalidos.sum())
+
+
+def _formato(caminho):
+    return 'jsonl' if caminho.endswith(('.jsonl', '.ndjson')) else 'csv'
+
+
+def _objeto_json(linha):
+    """O objeto JSON da linha, ou None se ela estiver em branco ou não for um objeto JSON."""
+    try:
+        registro = json.loads(linha)
+    except ValueError:
+        return None
+    return registro if isinstance(registro, dict) else None
+
+
+def _processar_bloco(formato, formato_saida, cabecalho, coluna_id, fases, linhas, inicio):
+    """Pontua um bloco de linhas brutas; executado nos processos do pool."""
+    ignoradas = []
+    if formato == 'csv':
+        registros = []
+        ids = []
+        posicoes = {nome: i for i, nome in enumerate(cabecalho)}
+        for i, registro in enumerate(csv.reader(linhas)):
+            if not any(campo.strip() for campo in registro):
+                continue
+            if len(registro) < len(cabecalho):
+                # Linha do arquivo: o cabeçalho é a linha 1
+                ignoradas.append(inicio + i + 2)
+                continue
+            registros.append(registro)
+            ids.append(registro[posicoes[coluna_id]] if coluna_id in posicoes else str(inicio + i + 1))
+    else:
+        registros = []
+        ids = []
+        # Linha do arquivo: `inicio` conta desde a primeira linha
+        for i, linha in enumerate(linhas):
+            if not linha.strip():
+                continue
+            registro = _objeto_json(linha)
+            if registro is None:
+                ignoradas.append(inicio + i + 1)
+                continue
+            registros.append(registro)
+            ids.append(str(registro.get(coluna_id, inicio + i + 1)))
+
+    n = len(registros)
+    invalidos = 0
+    colunas = [ids]
+
+    for fase in fases:
+        nomes = colunas_fase(fase)
+        if formato == 'csv':
+            seletor = operator.itemgetter(*[posicoes[nome] for nome in nomes])
+            valores = itertools.chain.from_iterable(map(seletor, registros))
+        else:
+            valores = (r.get(nome) for r in registros for nome in nomes)
+        matriz, inv = _matriz_fase(valores, n)
+        invalidos += inv
+
+        scores, score_final = pontuar(fase, matriz)
+        status = classificar_lote(score_final)
+        valores = [scores[:, j] for j in range(scores.shape[1])] + [score_final]
+        if formato_saida == 'csv':
+            colunas += [[f'{s:.4f}' for s in v.tolist()] for v in valores]
+        else:
+            colunas += [v.round(4).tolist() for v in valores]
+        colunas.append([STATUS[s] for s in status.tolist()])
+
+    saida = io.StringIO()
+    if formato_saida == 'csv':
+        csv.writer(saida, lineterminator='\n').writerows(zip(*colunas))
+    else:
+        nomes_saida = colunas_saida(coluna_id, fases)
+        for valores in zip(*colunas):
+            saida.write(json.dumps(dict(zip(nomes_saida, valores)), ensure_ascii=False) + '\n')
+    return saida.getvalue(), n, invalidos, ignoradas
+
+
+def _detectar_fases(campos):
+    fases = [fase for fase in FASES if set(colunas_fase(fase)) <= set(campos)]
+    if not fases:
+        raise SystemExit('Nenhuma fase completa encontrada (esperado q11..q55, q11_f2..q55_f2 ou q11_f3..q55_f3)')
+    return fases
+
+
+def pontuar_arquivo(entrada, saida, coluna_id='id', processos=None, tamanho_bloco=TAMANHO_BLOCO):
+    """Pontua o arquivo `entrada` e grava o resultado em `saida`.
+
+    Retorna (avaliações pontuadas, respostas inválidas, números das linhas
+    ignoradas por estarem incompletas ou não serem JSON válido).
+    """
+    formato = _formato(entrada)
+    formato_saida = _formato(saida)
+    processos = processos or os.cpu_count() or 1
+
+    # utf-8-sig: exportações do Excel começam com BOM, que iria para o primeiro campo
+    with open(entrada, encoding='utf-8-sig', newline='') as arq_entrada, \
+            open(saida, 'w', encoding='utf-8', newline='') as arq_saida:
+        if formato == 'csv':
+            cabecalho = next(csv.reader([arq_entrada.readline()]))
+            campos = cabecalho
+            linhas = arq_entrada
+        else:
+            # Campos do primeiro objeto; as linhas anteriores seguem para os blocos,
+            # que as ignoram ou informam, mantendo a numeração do arquivo
+            cabecalho = None
+            campos = ()
+            iniciais = []
+            for linha in arq_entrada:
+                iniciais.append(linha)
+                primeiro = _objeto_json(linha)
+                if primeiro is not None:
+                    campos = primeiro.keys()
+                    break
+            linhas = itertools.chain(iniciais, arq_entrada)
+        fases = _detectar_fases(campos)
+
+        if formato_saida == 'csv':
+            csv.writer(arq_saida, lineterminator='\n').writerow(colunas_saida(coluna_id, fases))
+
+        total = invalidos = 0
+        ignoradas = []
+        pendentes = collections.deque()
+        with ProcessPoolExecutor(max_workers=processos) as pool:
+            inicio = 0
+            while True:
+                bloco = list(itertools.islice(linhas, tamanho_bloco))
+                if bloco:
+                    pendentes.append(pool.submit(
+                        _processar_bloco, formato, formato_saida, cabecalho, coluna_id, fases, bloco, inicio))
+                    inicio += len(bloco)
+                # Limita a memória a alguns blocos por processo
+                while pendentes and (not bloco or len(pendentes) >= 2 * processos):
+                    texto, n, inv, inc = pendentes.popleft().result()
+                    arq_saida.write(texto)
+                    total += n
+                    invalidos += inv
+                    ignoradas += inc
+                if not bloco:
+                    break
+    return total, invalidos, ignoradas
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='python -m felkla.lote',
+        description='Pontua em lote avaliações FELKLA-1/2/3 exportadas em CSV ou JSONL.')
+    parser.add_argument('entrada', help='arquivo .csv ou .jsonl com as respostas')
+    parser.add_argument('-o', '--saida', required=True, help='arquivo de resultados (.csv ou .jsonl)')
+    parser.add_argument('--id', dest='coluna_id', default='id', help='coluna que identifica a avaliação (padrão: id)')
+    parser.add_argument('--processos', type=int, default=None, help='número de processos (padrão: núcleos disponíveis)')
+    parser.add_argument('--tamanho-bloco', type=int, default=TAMANHO_BLOCO, help='linhas por bloco de processamento')
+    args = parser.parse_args(argv)
+
+    inicio = time.perf_counter()
+    total, invalidos, ignoradas = pontuar_arquivo(args.entrada, args.saida, args.coluna_id, args.processos, args.tamanho_bloco)
+    duracao = time.perf_counter() - inicio
+
+    print(f'{total} avaliações pontuadas em {duracao:.1f}s ({total / max(duracao, 1e-9):,.0f}/s)', file=sys.stderr)
+    if invalidos:
+        print(f'⚠️ {invalidos} respostas com rótulo desconhecido foram tratadas como não respondidas', file=sys.stderr)
+    if ignoradas:
+        linhas = ', '.join(map(str, ignoradas[:LINHAS_IGNORADAS_EXIBIDAS]))
+        restantes = len(ignoradas) - LINHAS_IGNORADAS_EXIBIDAS
+        motivo = 'com menos campos que o cabeçalho' if _formato(args.entrada) == 'csv' else 'sem um objeto JSON válido'
+        print(f'⚠️ {len(ignoradas)} linhas {motivo} foram ignoradas: {linhas}'
+              + (f' e mais {restantes}' if restantes > 0 else ''), file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
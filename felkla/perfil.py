@@ -0,0 +1,168 @@
+"""Perfil opcional do tempo de renderização por seção do app.
+
+Ativado para todo o processo pela variável de ambiente FELKLA_PERFIL=1, ou
+para uma sessão pelo parâmetro ?perfil=1 (passado a `iniciar`). Há duas
+formas de medir:
+- marcos sequenciais, `etapa(nome)`: cada marco registra o tempo desde o
+  marco anterior da mesma execução. São usados nos blocos de nível de
+  módulo do script.
+- spans aninhados: `with secao(nome):`.
+
+As durações são agregadas no processo, somando todas as sessões, em janelas
+das últimas JANELA amostras por seção. Os percentis p50/p95/p99 são
+calculados sob demanda, em `resumo` e em `texto_prometheus`. Se
+FELKLA_PERFIL_ARQUIVO estiver definida, o texto no formato Prometheus é
+regravado nesse arquivo a cada INTERVALO_ARQUIVO segundos (coletor
+textfile do node_exporter).
+
+Desativado, cada chamada custa uma consulta a um atributo thread-local.
+"""
+import collections
+import contextlib
+import logging
+import math
+import os
+import threading
+import time
+
+JANELA = 1000
+INTERVALO_ARQUIVO = 5.0
+QUANTIS = (0.5, 0.95, 0.99)
+
+ATIVO_AMBIENTE = os.environ.get('FELKLA_PERFIL', '') not in ('', '0')
+ARQUIVO = os.environ.get('FELKLA_PERFIL_ARQUIVO')
+
+log = logging.getLogger(__name__)
+
+_local = threading.local()
+_trava = threading.Lock()
+# Uma gravação do arquivo por vez; as threads que chegam durante ela não esperam
+_trava_arquivo = threading.Lock()
+_secoes = {}
+_ultima_gravacao = 0.0
+_NULO = contextlib.nullcontext()
+
+
+class _Estatistica:
+    __slots__ = ('amostras', 'contagem', 'soma')
+
+    def __init__(self):
+        self.amostras = collections.deque(maxlen=JANELA)
+        self.contagem = 0
+        self.soma = 0.0
+
+
+def registrar(nome, duracao):
+    """Acrescenta uma duração (segundos) às estatísticas da seção."""
+    with _trava:
+        estatistica = _secoes.get(nome)
+        if estatistica is None:
+            estatistica = _secoes[nome] = _Estatistica()
+        estatistica.amostras.append(duracao)
+        estatistica.contagem += 1
+        estatistica.soma += duracao
+
+
+def iniciar(ativo=False):
+    """Início de uma execução do script na thread atual."""
+    _local.ativo = ATIVO_AMBIENTE or ativo
+    if _local.ativo:
+        _local.inicio = _local.marco = time.perf_counter()
+
+
+def ativo():
+    return getattr(_local, 'ativo', ATIVO_AMBIENTE)
+
+
+def etapa(nome):
+    """Registra o tempo decorrido desde o marco anterior da execução."""
+    if not getattr(_local, 'ativo', False):
+        return
+    agora = time.perf_counter()
+    registrar(nome, agora - _local.marco)
+    _local.marco = agora
+
+
+@contextlib.contextmanager
+def _span(nome):
+    inicio = time.perf_counter()
+    try:
+        yield
+    finally:
+        registrar(nome, time.perf_counter() - inicio)
+
+
+def secao(nome):
+    """Context manager que mede o bloco como a seção `nome`."""
+    if not getattr(_local, 'ativo', ATIVO_AMBIENTE):
+        return _NULO
+    return _span(nome)
+
+
+def finalizar():
+    """Fim da execução: registra o total do rerun e atualiza o arquivo, se configurado."""
+    global _ultima_gravacao
+    if not getattr(_local, 'ativo', False):
+        return
+    agora = time.perf_counter()
+    registrar('rerun', agora - _local.inicio)
+    _local.marco = agora
+
+    if ARQUIVO and agora - _ultima_gravacao >= INTERVALO_ARQUIVO and _trava_arquivo.acquire(blocking=False):
+        try:
+            # Outra thread pode ter gravado entre a verificação e a trava
+            if agora - _ultima_gravacao >= INTERVALO_ARQUIVO:
+                _ultima_gravacao = agora
+                temporario = f'{ARQUIVO}.{os.getpid()}.tmp'
+                with open(temporario, 'w', encoding='utf-8') as arquivo:
+                    arquivo.write(texto_prometheus())
+                os.replace(temporario, ARQUIVO)
+        except OSError as erro:
+            # O perfil nunca interrompe o rerun do usuário
+            log.warning('Falha ao gravar o perfil em %s: %s', ARQUIVO, erro)
+        finally:
+            _trava_arquivo.release()
+
+
+def quantil(ordenadas, q):
+    """Quantil q (0..1) de valores já ordenados, pelo método do posto mais próximo."""
+    return ordenadas[max(0, math.ceil(q * len(ordenadas)) - 1)]
+
+
+def _instantaneo():
+    with _trava:
+        return {nome: (sorted(e.amostras), e.contagem, e.soma) for nome, e in _secoes.items()}
+
+
+def resumo():
+    """Estatísticas por seção, da mais custosa (tempo total) para a menos."""
+    linhas = []
+    for nome, (ordenadas, contagem, soma) in _instantaneo().items():
+        linhas.append({
+            'seção': nome,
+            'execuções': contagem,
+            **{f'p{round(q * 100)} (ms)': round(quantil(ordenadas, q) * 1000, 2) for q in QUANTIS},
+            'total (s)': round(soma, 3),
+        })
+    return sorted(linhas, key=lambda linha: linha['total (s)'], reverse=True)
+
+
+def texto_prometheus():
+    """Estatísticas no formato de exposição em texto do Prometheus (summary)."""
+    linhas = [
+        '# HELP felkla_secao_segundos Tempo de renderização por seção do app FELKLA.',
+        '# TYPE felkla_secao_segundos summary',
+    ]
+    for nome, (ordenadas, contagem, soma) in sorted(_instantaneo().items()):
+        rotulo = nome.replace('\\', '\\\\').replace('"', '\\"')
+        for q in QUANTIS:
+            linhas.append(f'felkla_secao_segundos{{secao="{rotulo}",quantile="{q}"}} {quantil(ordenadas, q):.6f}')
+        linhas.append(f'felkla_secao_segundos_sum{{secao="{rotulo}"}} {soma:.6f}')
+        linhas.append(f'felkla_secao_segundos_count{{secao="{rotulo}"}} {contagem}')
+    return '\n'.join(linhas) + '\n'
+
+
+def limpar():
+    """Descarta as estatísticas acumuladas."""
+    with _trava:
+        _secoes.clear()
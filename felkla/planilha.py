@@ -0,0 +1,230 @@
+"""Importação de respostas de planilhas CSV ou XLSX para uma fase FELKLA.
+
+Dois formatos são reconhecidos pelo cabeçalho, que pode vir depois de linhas
+de título (até LINHAS_CABECALHO linhas):
+- checklist: uma questão por linha, com uma coluna "Resposta" e,
+  opcionalmente, uma coluna com o id (q11) ou o número (1.1) da questão.
+  Linhas sem questão reconhecida (títulos de seção) são ignoradas; sem a
+  coluna da questão, as respostas são lidas na ordem q11..q55.
+- colunas: uma avaliação por linha, com as respostas nas colunas q11..q55 (ou
+  q11_f2.., q11_f3.., como em `felkla.lote`) e o projeto em uma coluna
+  "Projeto" ou "id". Com uma única linha, ela preenche a fase; com várias, todas
+  são pontuadas de uma vez (`pontuar_planilha`).
+
+Os rótulos são validados contra as cinco opções, sem diferenciar maiúsculas
+nem acentos; células vazias são questões não respondidas. O arquivo é lido
+linha a linha: o XLSX é aberto pelo openpyxl em modo read_only, que não
+carrega a pasta de trabalho inteira, e as respostas acumuladas ocupam 25 bytes
+por avaliação. O openpyxl é uma dependência opcional, importada só quando um
+XLSX é enviado.
+"""
+import codecs
+import csv
+import io
+import itertools
+import unicodedata
+import zipfile
+
+import numpy as np
+
+from felkla.codificacao import ROTULOS
+from felkla.lote import colunas_fase
+from felkla.pontuacao import FASES, QUESTOES_POR_FASE, STATUS, classificar_lote, pontuar
+
+EXTENSOES = ('csv', 'xlsx', 'xlsm')
+LINHAS_CABECALHO = 20
+ERROS_EXIBIDOS = 10
+AMOSTRA_CSV = 64 * 1024
+
+COLUNAS_RESPOSTA = ('resposta', 'respostas', 'avaliacao')
+COLUNAS_QUESTAO = ('questao', 'id', 'numero', 'item', 'codigo')
+COLUNAS_PROJETO = ('projeto', 'identificacao do projeto', 'id', 'identificacao')
+
+
+def _normalizar(valor):
+    if valor is None:
+        return ''
+    texto = unicodedata.normalize('NFKD', str(valor)).encode('ascii', 'ignore').decode()
+    return ' '.join(texto.casefold().split())
+
+
+_CODIGOS = {_normalizar(rotulo): codigo for codigo, rotulo in enumerate(ROTULOS) if rotulo}
+
+
+def _linhas_csv(arquivo):
+    amostra = arquivo.read(AMOSTRA_CSV)
+    arquivo.seek(0)
+    try:
+        # Decodificador incremental: a amostra pode terminar no meio de um caractere
+        codecs.getincrementaldecoder('utf-8')().decode(amostra)
+        codificacao = 'utf-8-sig'
+    except UnicodeDecodeError:
+        # CSV salvo pelo Excel em português
+        codificacao = 'cp1252'
+    try:
+        dialeto = csv.Sniffer().sniff(amostra.decode(codificacao, 'ignore'), delimiters=',;\t')
+    except csv.Error:
+        dialeto = csv.excel
+    texto = io.TextIOWrapper(arquivo, encoding=codificacao, errors='replace', newline='')
+    try:
+        yield from csv.reader(texto, dialeto)
+    finally:
+        # Devolve o arquivo sem fechá-lo (o upload continua na sessão)
+        texto.detach()
+
+
+def _linhas_xlsx(arquivo):
+    from openpyxl import load_workbook
+    from openpyxl.utils.exceptions import InvalidFileException
+
+    try:
+        pasta = load_workbook(arquivo, read_only=True, data_only=True)
+    except (InvalidFileException, zipfile.BadZipFile, KeyError) as erro:
+        raise ValueError(f"Arquivo XLSX inválido: {erro}") from None
+    try:
+        for linha in pasta.active.iter_rows(values_only=True):
+            yield ['' if valor is None else str(valor) for valor in linha]
+    finally:
+        pasta.close()
+
+
+def ler_linhas(arquivo, nome):
+    """Linhas da planilha (listas de textos), lidas sob demanda."""
+    extensao = nome.rsplit('.', 1)[-1].lower()
+    if extensao == 'csv':
+        return _linhas_csv(arquivo)
+    if extensao in ('xlsx', 'xlsm'):
+        return _linhas_xlsx(arquivo)
+    raise ValueError(f"Formato não suportado: .{extensao} (use {', '.join(EXTENSOES)})")
+
+
+def _coluna(cabecalho, nomes):
+    for nome in nomes:
+        if nome in cabecalho:
+            return cabecalho.index(nome)
+    return None
+
+
+def _celula(linha, posicao):
+    return linha[posicao] if posicao < len(linha) else ''
+
+
+def _codigo(valor, local, erros):
+    texto = _normalizar(valor)
+    if not texto:
+        return 0
+    codigo = _CODIGOS.get(texto)
+    if codigo is None:
+        erros.append(f"{local}: resposta desconhecida {str(valor).strip()!r}")
+        return 0
+    return codigo
+
+
+def _ler_checklist(linhas, numero, cabecalho, posicoes, erros):
+    resposta = _coluna(cabecalho, COLUNAS_RESPOSTA)
+    questao = _coluna(cabecalho, COLUNAS_QUESTAO)
+    codigos = np.zeros(QUESTOES_POR_FASE, dtype=np.uint8)
+    encontradas = set()
+    ordem = 0
+    for numero, linha in enumerate(linhas, numero + 1):
+        if questao is None:
+            if not any(_normalizar(valor) for valor in linha):
+                continue
+            if ordem >= QUESTOES_POR_FASE:
+                erros.append(f"Linha {numero}: mais de {QUESTOES_POR_FASE} questões sem coluna de identificação")
+                break
+            indice, ordem = ordem, ordem + 1
+        else:
+            indice = posicoes.get(_normalizar(_celula(linha, questao)))
+            if indice is None:
+                continue
+            if indice in encontradas:
+                erros.append(f"Linha {numero}: questão {_celula(linha, questao)} repetida")
+                continue
+        encontradas.add(indice)
+        codigos[indice] = _codigo(_celula(linha, resposta), f"Linha {numero}", erros)
+    if not encontradas:
+        erros.append("Nenhuma questão da fase encontrada na planilha")
+    return codigos
+
+
+def _ler_colunas(linhas, numero, cabecalho, colunas, erros):
+    projeto = _coluna(cabecalho, COLUNAS_PROJETO)
+    posicoes = [cabecalho.index(coluna) for coluna in colunas]
+    ids = []
+    # 25 bytes por avaliação, sem um objeto Python por célula
+    codigos = bytearray()
+    for numero, linha in enumerate(linhas, numero + 1):
+        if not any(_normalizar(valor) for valor in linha):
+            continue
+        quantidade = len(erros)
+        linha_codigos = bytes(_codigo(_celula(linha, posicao), f"Linha {numero}, coluna {coluna}", erros)
+                              for posicao, coluna in zip(posicoes, colunas))
+        if len(erros) > quantidade:
+            # Avaliação com rótulo inválido: fica de fora do resultado
+            continue
+        identificacao = str(_celula(linha, projeto)).strip() if projeto is not None else ''
+        ids.append(identificacao or f"Linha {numero}")
+        codigos += linha_codigos
+    return ids, np.frombuffer(bytes(codigos), dtype=np.uint8).reshape(-1, QUESTOES_POR_FASE)
+
+
+def ler_planilha(arquivo, nome, fase, questoes):
+    """Lê as respostas da fase de uma planilha CSV ou XLSX.
+
+    `questoes` são as 25 questões da fase do catálogo, na ordem q11..q55.
+    Retorna um dicionário com 'formato' ('checklist' ou 'colunas'), 'ids' e
+    'codigos' (matriz (n, 25) de códigos, uma linha por avaliação), 'erros'
+    (mensagens, no máximo ERROS_EXIBIDOS) e 'total_erros'. Um cabeçalho não
+    reconhecido gera ValueError.
+    """
+    linhas = ler_linhas(arquivo, nome)
+    erros = []
+    try:
+        # Posição de cada questão pelo id (q11) e pelo número (1.1)
+        posicoes = {}
+        for indice, questao in enumerate(questoes):
+            posicoes[_normalizar(questao['id'])] = posicoes[_normalizar(questao['numero'])] = indice
+        alternativas = [colunas_fase(fase), [questao['id'] for questao in questoes]]
+
+        for numero, linha in enumerate(itertools.islice(linhas, LINHAS_CABECALHO), 1):
+            cabecalho = [_normalizar(valor) for valor in linha]
+            for colunas in alternativas:
+                if all(coluna in cabecalho for coluna in colunas):
+                    ids, codigos = _ler_colunas(linhas, numero, cabecalho, colunas, erros)
+                    formato = 'colunas'
+                    break
+            else:
+                if _coluna(cabecalho, COLUNAS_RESPOSTA) is None:
+                    continue
+                ids, codigos = [''], _ler_checklist(linhas, numero, cabecalho, posicoes, erros)[np.newaxis]
+                formato = 'checklist'
+            break
+        else:
+            raise ValueError("Cabeçalho não reconhecido: use uma coluna 'Resposta' (uma questão por linha) "
+                             f"ou as colunas {questoes[0]['id']}..{questoes[-1]['id']} (uma avaliação por linha)")
+    except csv.Error as erro:
+        raise ValueError(f"CSV inválido: {erro}") from None
+    finally:
+        linhas.close()
+
+    return {
+        'formato': formato,
+        'ids': ids,
+        'codigos': codigos,
+        'erros': erros[:ERROS_EXIBIDOS],
+        'total_erros': len(erros),
+    }
+
+
+def pontuar_planilha(fase, ids, codigos):
+    """Tabela das avaliações lidas, do maior para o menor score final ({coluna: valores})."""
+    scores, score_final = pontuar(fase, codigos)
+    ordem = np.argsort(-score_final, kind='stable')
+    tabela = {'Projeto': [ids[i] for i in ordem.tolist()]}
+    for j, dimensao in enumerate(FASES[fase]['dimensoes']):
+        tabela[dimensao] = scores[ordem, j]
+    tabela['Score final'] = score_final[ordem]
+    tabela['Status'] = np.array(STATUS)[classificar_lote(tabela['Score final'])]
+    tabela['Respondidas'] = np.count_nonzero(codigos[ordem], axis=1)
+    return tabela
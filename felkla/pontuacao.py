@@ -0,0 +1,107 @@
+"""Motor de pontuação FELKLA, independente do Streamlit.
+
+Cada fase tem 25 questões agrupadas em 5 dimensões de 5 questões, na ordem
+q11..q15, q21..q25, ..., q51..q55. As respostas são representadas por uma
+matriz de pontos (uma linha por avaliação), onde 0 indica questão não
+respondida e 1..5 correspondem a 'Não iniciado'..'Excelente'.
+"""
+import numpy as np
+
+from felkla.catalogo import DIMENSOES_POR_FASE, QUESTOES_POR_DIMENSAO, carregar_catalogo
+
+PONTUACAO = {
+    'Excelente': 5,
+    'Bom': 4,
+    'Regular': 3,
+    'Inadequado': 2,
+    'Não iniciado': 1,
+}
+
+PONTUACAO_MAXIMA = 5
+QUESTOES_POR_FASE = QUESTOES_POR_DIMENSAO * DIMENSOES_POR_FASE
+
+# Limites usados nos dashboards de resultado
+LIMIAR_APROVADO = 80
+LIMIAR_ATENCAO = 60
+
+STATUS = ('APROVADO', 'ATENÇÃO', 'NÃO APROVADO')
+FAIXAS = ('aprovado', 'atencao', 'reprovado')
+
+# Definição de cada fase para o cálculo, derivada do catálogo
+FASES = {
+    fase['id']: {
+        'nome': fase['nome'],
+        'dimensoes': tuple(d['nome'] for d in fase['dimensoes']),
+        'pesos': tuple(d['peso'] / 100 for d in fase['dimensoes']),
+    }
+    for fase in carregar_catalogo()['fases']
+}
+
+
+def matriz_pontos(avaliacoes):
+    """Converte sequências de 25 rótulos (None = não respondida) em matriz de pontos."""
+    pontos = [[PONTUACAO.get(resposta, 0) for resposta in respostas] for respostas in avaliacoes]
+    matriz = np.array(pontos, dtype=np.uint8).reshape(-1, QUESTOES_POR_FASE)
+    return matriz
+
+
+def pontuar(fase, pontos):
+    """Calcula os scores das dimensões (n, 5) e o score final ponderado (n,).
+
+    Reproduz exatamente o cálculo original: questões não respondidas não entram
+    no máximo de pontos da dimensão, e uma dimensão sem respostas vale 0.
+    """
+    pesos = FASES[fase]['pesos']
+    pontos = np.asarray(pontos).reshape(-1, DIMENSOES_POR_FASE, QUESTOES_POR_DIMENSAO)
+
+    soma = pontos.sum(axis=2, dtype=np.int64)
+    max_pontos = np.count_nonzero(pontos, axis=2) * PONTUACAO_MAXIMA
+
+    scores = np.zeros(soma.shape, dtype=np.float64)
+    np.divide(soma, max_pontos, out=scores, where=max_pontos > 0)
+    scores *= 100
+
+    # Soma ponderada na mesma ordem do cálculo original (sem produto matricial),
+    # para que o arredondamento em ponto flutuante seja idêntico.
+    score_final = scores[:, 0] * pesos[0]
+    for j in range(1, DIMENSOES_POR_FASE):
+        score_final = score_final + scores[:, j] * pesos[j]
+
+    return scores, score_final
+
+
+def _indice_faixa(score):
+    if score >= LIMIAR_APROVADO:
+        return 0
+    elif score >= LIMIAR_ATENCAO:
+        return 1
+    else:
+        return 2
+
+
+def classificar(score_final):
+    """Status do score final segundo os limites 80/60 dos dashboards."""
+    return STATUS[_indice_faixa(score_final)]
+
+
+def faixa(score):
+    """Faixa do score ('aprovado', 'atencao' ou 'reprovado') usada na interface."""
+    return FAIXAS[_indice_faixa(score)]
+
+
+def classificar_lote(scores):
+    """Índice em STATUS para cada score (0 = aprovado, 1 = atenção, 2 = não aprovado)."""
+    scores = np.asarray(scores)
+    return np.where(scores >= LIMIAR_APROVADO, 0, np.where(scores >= LIMIAR_ATENCAO, 1, 2)).astype(np.uint8)
+
+
+def pontuar_respostas(fase, respostas):
+    """Pontua uma única avaliação a partir dos rótulos das 25 respostas."""
+    scores, score_final = pontuar(fase, matriz_pontos([respostas]))
+    return {
+        'fase': fase,
+        'dimensoes': dict(zip(FASES[fase]['dimensoes'], scores[0].tolist())),
+        'score_final': float(score_final[0]),
+        'respondidas': len([r for r in respostas if r is not None]),
+        'total': len(respostas),
+    }
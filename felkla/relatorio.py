@@ -0,0 +1,283 @@
+"""Relatório completo de uma avaliação FELKLA em HTML e PDF.
+
+Os relatórios são gerados em um pool de threads compartilhado (`exportar`),
+fora da thread do script Streamlit. O PDF usa o fpdf2, importado apenas quando
+um PDF é pedido; sem ele, a exportação em HTML continua disponível.
+"""
+import html
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from felkla.pontuacao import LIMIAR_APROVADO, LIMIAR_ATENCAO, faixa, pontuar_respostas
+
+FORMATOS = {
+    'html': 'text/html',
+    'pdf': 'application/pdf',
+}
+
+TRABALHADORES = 4
+
+ROTULOS_FAIXA = {'aprovado': '🎯 Aprovado', 'atencao': '⚠️ Atenção', 'reprovado': '❌ Crítico'}
+CORES_FAIXA = {'aprovado': (0, 104, 55), 'atencao': (133, 100, 4), 'reprovado': (114, 28, 36)}
+FUNDOS_FAIXA = {'aprovado': (212, 237, 218), 'atencao': (255, 243, 205), 'reprovado': (248, 215, 218)}
+
+
+def analisar(fase, respostas):
+    """Resultado da avaliação e a análise exibida no dashboard e no relatório."""
+    resultado = pontuar_respostas(fase['id'], respostas)
+    scores = resultado['dimensoes']
+    return {
+        'resultado': resultado,
+        'faixa': faixa(resultado['score_final']),
+        'fortes': [k for k, v in scores.items() if v >= LIMIAR_APROVADO],
+        'atencao': [k for k, v in scores.items() if LIMIAR_ATENCAO <= v < LIMIAR_APROVADO],
+        'criticos': [k for k, v in scores.items() if v < LIMIAR_ATENCAO],
+        # Checklist de prontidão para execução (FELKLA-3)
+        'checklist': [(d['item_checklist'], scores[d['nome']] >= LIMIAR_APROVADO)
+                      for d in fase['dimensoes'] if 'item_checklist' in d],
+    }
+
+
+def resumo_executivo(analise):
+    """Linhas (rótulo, valor) do resumo executivo do relatório."""
+    resultado = analise['resultado']
+    scores = resultado['dimensoes']
+    melhor = max(scores, key=scores.get)
+    pior = min(scores, key=scores.get)
+    linhas = [
+        ("Score final", f"{resultado['score_final']:.1f}%"),
+        ("Dimensão mais forte", f"{melhor} ({scores[melhor]:.1f}%)"),
+        ("Dimensão crítica", f"{pior} ({scores[pior]:.1f}%)"),
+        ("Questões respondidas", f"{resultado['respondidas']}/{resultado['total']}"),
+    ]
+    if analise['checklist']:
+        aprovados = sum(1 for _, status in analise['checklist'] if status)
+        linhas.append(("Itens do checklist aprovados", f"{aprovados}/{len(analise['checklist'])}"))
+    return linhas
+
+
+def _blocos_markdown(texto):
+    """Divide o subconjunto de markdown do catálogo em blocos ('p', 'ul' ou 'ol', linhas)."""
+    blocos = []
+    for linha in texto.splitlines():
+        linha = linha.strip()
+        if not linha:
+            blocos.append(None)
+            continue
+        if linha.startswith('- '):
+            tipo, linha = 'ul', linha[2:]
+        elif re.match(r'\d+\. ', linha):
+            tipo, linha = 'ol', linha.split('. ', 1)[1]
+        else:
+            tipo = 'p'
+        if blocos and blocos[-1] and blocos[-1][0] == tipo:
+            blocos[-1][1].append(linha)
+        else:
+            blocos.append((tipo, [linha]))
+    return [bloco for bloco in blocos if bloco]
+
+
+def _negrito_html(texto):
+    return re.sub(r'\*\*(.+?)\*\*', r'<strong>\1</strong>', html.escape(texto))
+
+
+def _markdown_html(texto):
+    partes = []
+    for tipo, linhas in _blocos_markdown(texto):
+        if tipo == 'p':
+            partes.append(f"<p>{'<br>'.join(_negrito_html(linha) for linha in linhas)}</p>")
+        else:
+            itens = ''.join(f"<li>{_negrito_html(linha)}</li>" for linha in linhas)
+            partes.append(f"<{tipo}>{itens}</{tipo}>")
+    return '\n'.join(partes)
+
+
+_ESTILO_HTML = """
+body { font-family: 'Segoe UI', Arial, sans-serif; color: #2d5016; max-width: 960px; margin: 2rem auto; padding: 0 1rem; }
+h1 { background: linear-gradient(90deg, #006837 0%, #228B22 100%); color: white; padding: 1.5rem; border-radius: 10px; }
+h2 { color: #006837; border-bottom: 2px solid #e8f5e8; padding-bottom: 0.3rem; margin-top: 2rem; }
+.meta { color: #6c757d; }
+table { border-collapse: collapse; width: 100%; }
+th, td { border: 1px solid #dee2e6; padding: 0.5rem 0.75rem; text-align: left; }
+th { background: #006837; color: white; }
+.cartao { padding: 1.5rem; border-radius: 15px; text-align: center; border: 3px solid; margin: 1.5rem 0; }
+.cartao .score { font-size: 3rem; font-weight: bold; margin: 0; }
+.aprovado { background: #d4edda; border-color: #006837; color: #155724; }
+.atencao { background: #fff3cd; border-color: #ffc107; color: #856404; }
+.reprovado { background: #f8d7da; border-color: #dc3545; color: #721c24; }
+.colunas { display: flex; gap: 1.5rem; }
+.colunas > div { flex: 1; }
+.ok { color: #155724; }
+.pendente { color: #721c24; }
+"""
+
+
+def gerar_html(fase, respostas, projeto='', gerado_em=None):
+    """Relatório completo em um documento HTML autocontido (bytes UTF-8)."""
+    analise = analisar(fase, respostas)
+    resultado = analise['resultado']
+    scores = resultado['dimensoes']
+    textos = fase['resultado']
+    faixa_final = analise['faixa']
+    cartao = textos['cartoes'][faixa_final]
+    gerado_em = gerado_em or datetime.now()
+    e = html.escape
+
+    linhas_tabela = ''.join(
+        f"<tr><td>{e(d['nome'])}</td><td>{d['peso']}%</td><td>{scores[d['nome']]:.1f}%</td>"
+        f"<td>{ROTULOS_FAIXA[faixa(scores[d['nome']])]}</td></tr>"
+        for d in fase['dimensoes'])
+
+    def lista(titulo, icone, itens):
+        corpo = ''.join(f"<li>{icone} {e(item)}</li>" for item in itens) or "<li><em>Nenhum identificado</em></li>"
+        return f"<div><h3>{titulo}</h3><ul>{corpo}</ul></div>"
+
+    partes = [
+        f"<h1>🌲 Metodologia FELKLA — Relatório {e(fase['nome'])}</h1>",
+        f"<p class=\"meta\"><strong>Projeto:</strong> {e(projeto or 'não identificado')} · "
+        f"<strong>Gerado em:</strong> {gerado_em:%d/%m/%Y %H:%M} · "
+        f"<strong>Questões respondidas:</strong> {resultado['respondidas']}/{resultado['total']}</p>",
+        f"<p>{e(fase['objetivo'])}</p>",
+        f"<div class=\"cartao {faixa_final}\"><p class=\"score\">{resultado['score_final']:.1f}%</p>"
+        f"<h3>{e(cartao['titulo'])}</h3><p>{e(cartao['texto'])}</p></div>",
+        "<h2>📊 Scores por Dimensão</h2>",
+        f"<table><tr><th>Dimensão</th><th>Peso</th><th>Score</th><th>Situação</th></tr>{linhas_tabela}</table>",
+        "<h2>🎯 Interpretação dos Resultados</h2>",
+        _markdown_html(textos['interpretacao'][faixa_final]),
+        "<h2>📊 Análise Detalhada por Dimensão</h2>",
+        "<div class=\"colunas\">"
+        + lista("🟢 Pontos Fortes", "✅", analise['fortes'])
+        + lista("🟡 Necessita Atenção", "⚠️", analise['atencao'])
+        + lista("🔴 Pontos Críticos", "❌", analise['criticos'])
+        + "</div>",
+    ]
+
+    if analise['checklist']:
+        itens = ''.join(f"<li class=\"{'ok' if status else 'pendente'}\">{'✅' if status else '❌'} {e(item)}</li>"
+                        for item, status in analise['checklist'])
+        partes += ["<h2>✅ Checklist de Prontidão para Execução</h2>", f"<ul>{itens}</ul>"]
+
+    partes += ["<h2>🚀 Próximos Passos Recomendados</h2>", _markdown_html(textos['proximos_passos'][faixa_final])]
+
+    linhas_resumo = ''.join(f"<li><strong>{rotulo}:</strong> {e(valor)}</li>" for rotulo, valor in resumo_executivo(analise))
+    partes += ["<h2>📋 Resumo Executivo</h2>", f"<ul>{linhas_resumo}</ul>"]
+
+    documento = f"""<!DOCTYPE html>
+<html lang="pt-BR">
+<head>
+<meta charset="utf-8">
+<title>Relatório {e(fase['nome'])} — {e(projeto or 'FELKLA')}</title>
+<style>{_ESTILO_HTML}</style>
+</head>
+<body>
+{chr(10).join(partes)}
+</body>
+</html>
+"""
+    return documento.encode('utf-8')
+
+
+def _latin1(texto):
+    # As fontes padrão do PDF cobrem apenas latin-1: emojis são removidos
+    texto = texto.replace('≥', '>=').replace('≤', '<=').replace('—', '-').replace('–', '-')
+    texto = texto.encode('latin-1', 'ignore').decode('latin-1')
+    return re.sub(r'^ +| +$', '', texto, flags=re.MULTILINE)
+
+
+def gerar_pdf(fase, respostas, projeto='', gerado_em=None):
+    """Relatório completo em PDF (bytes); requer o pacote fpdf2."""
+    from fpdf import FPDF  # dependência opcional, carregada só quando um PDF é pedido
+
+    analise = analisar(fase, respostas)
+    resultado = analise['resultado']
+    scores = resultado['dimensoes']
+    textos = fase['resultado']
+    faixa_final = analise['faixa']
+    cartao = textos['cartoes'][faixa_final]
+    gerado_em = gerado_em or datetime.now()
+
+    pdf = FPDF()
+    pdf.set_auto_page_break(True, margin=15)
+    pdf.add_page()
+
+    def titulo(texto, tamanho=13):
+        pdf.ln(3)
+        pdf.set_font('Helvetica', 'B', tamanho)
+        pdf.set_text_color(0, 104, 55)
+        pdf.multi_cell(0, 8, _latin1(texto), new_x='LMARGIN', new_y='NEXT')
+        pdf.set_text_color(45, 80, 22)
+        pdf.set_font('Helvetica', '', 10)
+
+    def markdown(texto):
+        for tipo, linhas in _blocos_markdown(texto):
+            for i, linha in enumerate(linhas, 1):
+                marcador = {'p': '', 'ul': '-  ', 'ol': f'{i}.  '}[tipo]
+                pdf.multi_cell(0, 5.5, _latin1(marcador + linha), markdown=True, new_x='LMARGIN', new_y='NEXT')
+            pdf.ln(1.5)
+
+    titulo(f"Metodologia FELKLA - Relatório {fase['nome']}", 17)
+    pdf.multi_cell(0, 5.5, _latin1(f"Projeto: {projeto or 'não identificado'}   |   Gerado em: {gerado_em:%d/%m/%Y %H:%M}   |   "
+                                   f"Questões respondidas: {resultado['respondidas']}/{resultado['total']}"),
+                   new_x='LMARGIN', new_y='NEXT')
+
+    # Cartão do score final
+    pdf.ln(4)
+    pdf.set_fill_color(*FUNDOS_FAIXA[faixa_final])
+    pdf.set_draw_color(*CORES_FAIXA[faixa_final])
+    pdf.set_text_color(*CORES_FAIXA[faixa_final])
+    pdf.set_font('Helvetica', 'B', 26)
+    pdf.cell(0, 14, f"{resultado['score_final']:.1f}%", border='LTR', fill=True, align='C', new_x='LMARGIN', new_y='NEXT')
+    pdf.set_font('Helvetica', 'B', 12)
+    pdf.cell(0, 7, _latin1(cartao['titulo']), border='LR', fill=True, align='C', new_x='LMARGIN', new_y='NEXT')
+    pdf.set_font('Helvetica', '', 10)
+    pdf.cell(0, 7, _latin1(cartao['texto']), border='LBR', fill=True, align='C', new_x='LMARGIN', new_y='NEXT')
+    pdf.set_fill_color(232, 245, 232)
+    pdf.set_draw_color(200, 200, 200)
+
+    titulo("Scores por Dimensão")
+    with pdf.table(col_widths=(50, 12, 14, 20), text_align=('LEFT', 'CENTER', 'CENTER', 'LEFT')) as tabela:
+        tabela.row(('Dimensão', 'Peso', 'Score', 'Situação'))
+        for d in fase['dimensoes']:
+            score = scores[d['nome']]
+            tabela.row((_latin1(d['nome']), f"{d['peso']}%", f"{score:.1f}%", _latin1(ROTULOS_FAIXA[faixa(score)])))
+
+    titulo("Interpretação dos Resultados")
+    markdown(textos['interpretacao'][faixa_final])
+
+    titulo("Análise Detalhada por Dimensão")
+    for rotulo, itens in (("Pontos Fortes", analise['fortes']), ("Necessita Atenção", analise['atencao']),
+                          ("Pontos Críticos", analise['criticos'])):
+        markdown(f"**{rotulo}:** {', '.join(itens) or 'nenhum identificado'}")
+
+    if analise['checklist']:
+        titulo("Checklist de Prontidão para Execução")
+        markdown('\n'.join(f"- {'[OK]' if status else '[PENDENTE]'} {item}" for item, status in analise['checklist']))
+
+    titulo("Próximos Passos Recomendados")
+    markdown(textos['proximos_passos'][faixa_final])
+
+    titulo("Resumo Executivo")
+    markdown('\n'.join(f"- **{rotulo}:** {valor}" for rotulo, valor in resumo_executivo(analise)))
+
+    return bytes(pdf.output())
+
+
+GERADORES = {'html': gerar_html, 'pdf': gerar_pdf}
+
+_pool = None
+_trava_pool = threading.Lock()
+
+
+def _executor():
+    global _pool
+    with _trava_pool:
+        if _pool is None:
+            _pool = ThreadPoolExecutor(max_workers=TRABALHADORES, thread_name_prefix='felkla-relatorio')
+        return _pool
+
+
+def exportar(formato, fase, respostas, projeto=''):
+    """Agenda a geração do relatório no pool e retorna o Future com os bytes."""
+    return _executor().submit(GERADORES[formato], fase, list(respostas), projeto, datetime.now())
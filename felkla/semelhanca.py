@@ -0,0 +1,192 @@
+"""Busca de projetos com perfil de respostas semelhante (vizinhos mais próximos).
+
+Cada avaliação gravada de uma fase entra no índice pelas suas 25 respostas em
+código termômetro: o código c (0..5, ver `felkla.codificacao`) vira c bits 1
+seguidos de 5 - c bits 0. Entre dois códigos termômetro, os bits diferentes
+são exatamente |a - b|, então a distância de Hamming entre os 125 bits de duas
+avaliações é a distância L1 entre os seus perfis de respostas (0..125), e uma
+resposta 'Excelente' fica mais perto de 'Bom' que de 'Não iniciado'. Questões
+não respondidas contam como código 0, abaixo de 'Não iniciado'.
+
+Os 125 bits ocupam 2 palavras uint64 por avaliação (16 MB por milhão),
+guardadas em dois vetores contíguos, um por palavra. Uma consulta é um XOR e
+uma contagem de bits (np.bitwise_count, ou uma tabela por byte no numpy 1.x)
+por palavra, sem desempacotar nada. Como as distâncias são inteiros de 0 a
+125, os candidatos saem de uma contagem por distância (np.bincount) e de um
+limiar, sem ordenar o milhão de distâncias: poucos milissegundos sobre um
+milhão de avaliações. Com `dimensao`, uma máscara restringe a distância às 5
+questões da dimensão, e a palavra sem nenhuma delas nem é lida.
+
+O resultado traz projetos distintos, cada um com a sua avaliação mais próxima
+da consulta (reavaliações do mesmo projeto não ocupam várias posições).
+O índice é atualizado de forma incremental pelos ids do armazenamento
+(`Armazenamento.vetores`): `atualizar` lê só as avaliações gravadas depois da
+última leitura. Os vetores do índice têm capacidade de reserva que dobra
+quando se esgota, então acrescentar avaliações custa O(1) amortizado por
+avaliação, sem copiar o índice inteiro a cada gravação.
+"""
+import threading
+
+import numpy as np
+
+from felkla.catalogo import QUESTOES_POR_DIMENSAO
+from felkla.codificacao import BYTES_POR_AVALIACAO, CODIGO_MAXIMO, desempacotar_lote
+from felkla.pontuacao import QUESTOES_POR_FASE
+
+BITS_POR_AVALIACAO = QUESTOES_POR_FASE * CODIGO_MAXIMO
+PALAVRAS = -(-BITS_POR_AVALIACAO // 64)
+VIZINHOS_PADRAO = 5
+CAPACIDADE_INICIAL = 1024
+
+# Bits 1 de cada byte, para o numpy sem np.bitwise_count
+_BITS_POR_BYTE = np.array([bin(i).count('1') for i in range(256)], dtype=np.uint8)
+
+
+def termometro(codigos):
+    """Matriz (n, 25) de códigos → matriz (n, 2) de palavras uint64 em código termômetro."""
+    codigos = np.asarray(codigos, dtype=np.uint8).reshape(-1, QUESTOES_POR_FASE)
+    bits = codigos[:, :, np.newaxis] > np.arange(CODIGO_MAXIMO, dtype=np.uint8)
+    bytes_ = np.packbits(bits.reshape(len(codigos), BITS_POR_AVALIACAO), axis=1)
+    completos = np.zeros((len(codigos), PALAVRAS * 8), dtype=np.uint8)
+    completos[:, :bytes_.shape[1]] = bytes_
+    return completos.view(np.uint64)
+
+
+def mascara(dimensao=None):
+    """Palavras (2,) com os bits das questões da dimensão (0..4), ou de todas."""
+    codigos = np.zeros(QUESTOES_POR_FASE, dtype=np.uint8)
+    if dimensao is None:
+        codigos[:] = CODIGO_MAXIMO
+    else:
+        codigos[dimensao * QUESTOES_POR_DIMENSAO:(dimensao + 1) * QUESTOES_POR_DIMENSAO] = CODIGO_MAXIMO
+    return termometro(codigos)[0]
+
+
+def _contar_bits(palavras):
+    if hasattr(np, 'bitwise_count'):
+        return np.bitwise_count(palavras)
+    return _BITS_POR_BYTE[palavras.view(np.uint8)].reshape(len(palavras), -1).sum(axis=1, dtype=np.uint8)
+
+
+def distancias(palavras, consulta, filtro=None):
+    """Distância L1 (0..125) entre cada avaliação e a consulta, ambas em código termômetro.
+
+    `palavras` é a matriz (2, n) do índice (uma linha por palavra) e
+    `consulta` e `filtro` (ver `mascara`) são vetores (2,).
+    """
+    distancia = np.zeros(palavras.shape[1], dtype=np.uint8)
+    diferencas = np.empty(palavras.shape[1], dtype=np.uint64)
+    for i, (palavra, bits_consulta) in enumerate(zip(palavras, consulta)):
+        if filtro is not None and not filtro[i]:
+            continue
+        np.bitwise_xor(palavra, bits_consulta, out=diferencas)
+        if filtro is not None:
+            np.bitwise_and(diferencas, filtro[i], out=diferencas)
+        distancia += _contar_bits(diferencas)
+    return distancia
+
+
+class IndiceSemelhanca:
+    """Perfis de respostas das avaliações gravadas de uma fase, em código termômetro."""
+
+    def __init__(self, fase):
+        self.fase = fase
+        self.ultimo_id = 0
+        self.nomes = []
+        self._numeros = {}
+        # (palavras (2, capacidade), projeto (capacidade,) índice em `nomes`, score_final,
+        # instantes, total preenchido), trocados de uma vez: uma busca concorrente usa só
+        # as `total` primeiras posições, que uma atualização não altera
+        self._dados = (np.empty((PALAVRAS, 0), dtype=np.uint64), np.empty(0, dtype=np.int32),
+                       np.empty(0), np.empty(0), 0)
+        self._trava = threading.Lock()
+
+    def __len__(self):
+        return self._dados[-1]
+
+    def _reservar(self, necessario):
+        palavras, projetos, scores, instantes, total = self._dados
+        capacidade = projetos.shape[0]
+        if necessario <= capacidade:
+            return self._dados
+        capacidade = max(CAPACIDADE_INICIAL, capacidade)
+        while capacidade < necessario:
+            capacidade *= 2
+        novos = (np.empty((PALAVRAS, capacidade), dtype=np.uint64), np.empty(capacidade, dtype=np.int32),
+                 np.empty(capacidade), np.empty(capacidade))
+        novos[0][:, :total] = palavras[:, :total]
+        for novo, atual in zip(novos[1:], (projetos, scores, instantes)):
+            novo[:total] = atual[:total]
+        return (*novos, total)
+
+    def adicionar(self, projetos, respostas, score_final, instantes):
+        """Acrescenta avaliações: projetos (lista), respostas empacotadas (n, 10), scores e instantes (n,)."""
+        respostas = np.asarray(respostas, dtype=np.uint8).reshape(-1, BYTES_POR_AVALIACAO)
+        numeros = np.empty(len(projetos), dtype=np.int32)
+        for i, projeto in enumerate(projetos):
+            numero = self._numeros.get(projeto)
+            if numero is None:
+                numero = self._numeros[projeto] = len(self.nomes)
+                self.nomes.append(projeto)
+            numeros[i] = numero
+        palavras, atuais, scores, datas, total = self._reservar(len(self) + len(numeros))
+        fim = total + len(numeros)
+        # Escrita além do total publicado, invisível às buscas em andamento
+        palavras[:, total:fim] = termometro(desempacotar_lote(respostas)).T
+        atuais[total:fim] = numeros
+        scores[total:fim] = score_final
+        datas[total:fim] = instantes
+        self._dados = (palavras, atuais, scores, datas, fim)
+
+    def atualizar(self, armazenamento):
+        """Lê do armazenamento as avaliações da fase gravadas desde a última atualização."""
+        with self._trava:
+            ids, projetos, respostas, score_final, instantes = armazenamento.vetores(self.fase, self.ultimo_id)
+            if len(ids):
+                self.adicionar(projetos, respostas, score_final, instantes)
+                self.ultimo_id = int(ids[-1])
+        return len(self)
+
+    def buscar(self, codigos, k=VIZINHOS_PADRAO, excluir=None, dimensao=None):
+        """Os k projetos com avaliação mais próxima dos 25 códigos, do mais ao menos semelhante.
+
+        Cada item traz 'projeto', 'distancia' (soma das diferenças entre as
+        respostas), 'semelhanca' (0..1), 'score_final' e 'criado_em' da
+        avaliação mais próxima do projeto. `excluir` é um projeto a ignorar
+        (o da própria avaliação) e `dimensao` (0..4) restringe a comparação às
+        questões de uma dimensão.
+        """
+        palavras, projetos, score_final, instantes, total = self._dados
+        if not total or k <= 0:
+            return []
+        palavras, projetos = palavras[:, :total], projetos[:total]
+        score_final, instantes = score_final[:total], instantes[:total]
+        filtro = None if dimensao is None else mascara(dimensao)
+        bits = BITS_POR_AVALIACAO if dimensao is None else QUESTOES_POR_DIMENSAO * CODIGO_MAXIMO
+        distancia = distancias(palavras, termometro(codigos)[0], filtro)
+        acumulado = np.cumsum(np.bincount(distancia, minlength=bits + 1))
+        numero_excluido = self._numeros.get(excluir)
+
+        # Candidatos em número crescente até reunir k projetos distintos
+        candidatos = 4 * k
+        while True:
+            # Todas as avaliações até a menor distância que reúne `candidatos`
+            limite = min(int(np.searchsorted(acumulado, candidatos)), bits)
+            indices = np.flatnonzero(distancia <= limite)
+            if numero_excluido is not None:
+                indices = indices[projetos[indices] != numero_excluido]
+            # Mais próximas primeiro; no empate, a mais recente
+            indices = indices[np.lexsort((-instantes[indices], distancia[indices]))]
+            _, primeiros = np.unique(projetos[indices], return_index=True)
+            if len(primeiros) >= k or limite == bits:
+                break
+            candidatos *= 4
+
+        escolhidos = indices[np.sort(primeiros)[:k]].tolist()
+        return [{
+            'projeto': self.nomes[projetos[i]],
+            'distancia': int(distancia[i]),
+            'semelhanca': 1 - int(distancia[i]) / bits,
+            'score_final': float(score_final[i]),
+            'criado_em': float(instantes[i]),
+        } for i in escolhidos]
@@ -0,0 +1,121 @@
+"""Sensibilidade das decisões do portfólio aos pesos das dimensões.
+
+Parte dos scores das 5 dimensões da avaliação mais recente de cada projeto
+(já gravados pelo armazenamento, sem repontuar respostas) e de um conjunto
+de vetores de pesos:
+- `grade_simplex`: todos os vetores com componentes múltiplas de `passo`
+  que somam 1.
+- `amostrar_simplex`: amostras aleatórias de uma distribuição de Dirichlet,
+  uniformes no simplex ou concentradas em torno dos pesos atuais.
+
+`varrer` calcula o score final de todas as combinações projeto × pesos como
+um produto matricial (n, 5) @ (5, m), em blocos de BLOCO vetores de pesos
+para limitar a memória. Para cada projeto, conta em quantos vetores ele cai
+em cada faixa (80% / 60%); para cada vetor, conta os projetos aprovados.
+Milhões de combinações levam frações de segundo.
+"""
+import itertools
+
+import numpy as np
+
+from felkla.catalogo import DIMENSOES_POR_FASE
+from felkla.pontuacao import FASES, LIMIAR_APROVADO, LIMIAR_ATENCAO, STATUS, classificar_lote
+
+BLOCO = 4096
+PASSO_PADRAO = 0.05
+AMOSTRAS_PADRAO = 20_000
+
+# O produto matricial soma em ordem diferente de `pontuacao.pontuar`; sem esta
+# folga, um score exatamente no limiar poderia cair do lado errado
+TOLERANCIA = 1e-9
+
+
+def grade_simplex(passo=PASSO_PADRAO, dimensoes=DIMENSOES_POR_FASE):
+    """Matriz (m, dimensoes) com todos os vetores de pesos múltiplos de `passo`."""
+    divisoes = round(1 / passo)
+    if not np.isclose(divisoes * passo, 1):
+        raise ValueError(f"O passo deve dividir 1 (recebido {passo})")
+    # Composições de `divisoes` em `dimensoes` partes: posições das barras entre as unidades
+    barras = np.array(list(itertools.combinations(range(divisoes + dimensoes - 1), dimensoes - 1)))
+    bordas = np.hstack([np.full((len(barras), 1), -1), barras,
+                        np.full((len(barras), 1), divisoes + dimensoes - 1)])
+    return (np.diff(bordas, axis=1) - 1) / divisoes
+
+
+def amostrar_simplex(quantidade=AMOSTRAS_PADRAO, centro=None, concentracao=None, semente=None):
+    """Matriz (quantidade, 5) de pesos sorteados de uma Dirichlet.
+
+    Sem `concentracao`, a distribuição é uniforme no simplex. Com ela, os
+    sorteios se concentram em torno de `centro` (os pesos atuais); quanto
+    maior a concentração, menor a variação.
+    """
+    gerador = np.random.default_rng(semente)
+    if concentracao is None:
+        alfa = np.ones(DIMENSOES_POR_FASE)
+    else:
+        alfa = np.asarray(centro, dtype=np.float64) * concentracao
+    return gerador.dirichlet(alfa, size=quantidade)
+
+
+def varrer(scores, pesos, bloco=BLOCO):
+    """Classifica cada avaliação sob cada vetor de pesos.
+
+    `scores` é a matriz (n, 5) dos scores das dimensões e `pesos` a matriz
+    (m, 5) dos vetores. Retorna um dicionário com:
+    - 'faixas': (n, 3) quantos vetores põem cada avaliação em cada faixa de STATUS
+    - 'minimo', 'maximo': (n,) extremos do score final
+    - 'aprovados': (m,) avaliações aprovadas com cada vetor
+    """
+    scores = np.asarray(scores, dtype=np.float64).reshape(-1, DIMENSOES_POR_FASE)
+    pesos = np.asarray(pesos, dtype=np.float64).reshape(-1, DIMENSOES_POR_FASE)
+    n, m = len(scores), len(pesos)
+
+    acima_aprovado = np.zeros(n, dtype=np.int64)
+    acima_atencao = np.zeros(n, dtype=np.int64)
+    minimo = np.full(n, np.inf)
+    maximo = np.full(n, -np.inf)
+    aprovados = np.zeros(m, dtype=np.int64)
+
+    for inicio in range(0, m, bloco):
+        finais = scores @ pesos[inicio:inicio + bloco].T
+        finais += TOLERANCIA
+        aprovado = finais >= LIMIAR_APROVADO
+        acima_aprovado += aprovado.sum(axis=1)
+        acima_atencao += (finais >= LIMIAR_ATENCAO).sum(axis=1)
+        aprovados[inicio:inicio + bloco] = aprovado.sum(axis=0)
+        np.minimum(minimo, finais.min(axis=1), out=minimo)
+        np.maximum(maximo, finais.max(axis=1), out=maximo)
+
+    faixas = np.stack([acima_aprovado, acima_atencao - acima_aprovado, m - acima_atencao], axis=1)
+    return {'faixas': faixas, 'minimo': minimo - TOLERANCIA, 'maximo': maximo - TOLERANCIA,
+            'aprovados': aprovados}
+
+
+def analisar_portfolio(projetos, scores, score_final, pesos):
+    """Projetos cuja decisão muda com algum vetor de pesos, dos mais sensíveis aos menos.
+
+    Retorna (linhas, varredura): uma linha por projeto que muda de faixa e o
+    resultado de `varrer`.
+    """
+    varredura = varrer(scores, pesos)
+    atual = classificar_lote(score_final)
+    total = len(pesos)
+    mudancas = total - varredura['faixas'][np.arange(len(atual)), atual]
+
+    linhas = []
+    for i in np.flatnonzero(mudancas)[np.argsort(-mudancas[mudancas > 0], kind='stable')]:
+        linhas.append({
+            'projeto': projetos[i],
+            'score atual (%)': round(float(score_final[i]), 1),
+            'status atual': STATUS[atual[i]],
+            'muda em (%)': round(100 * float(mudancas[i]) / total, 1),
+            **{f'{status.lower()} (%)': round(100 * float(varredura['faixas'][i, k]) / total, 1)
+               for k, status in enumerate(STATUS)},
+            'mínimo (%)': round(float(varredura['minimo'][i]), 1),
+            'máximo (%)': round(float(varredura['maximo'][i]), 1),
+        })
+    return linhas, varredura
+
+
+def pesos_atuais(fase):
+    return np.array(FASES[fase]['pesos'])
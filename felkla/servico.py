@@ -0,0 +1,337 @@
+"""Serviço HTTP de pontuação FELKLA, sem a interface Streamlit.
+
+Uso:
+    python -m felkla.servico --porta 8502
+    curl -d '{"fase": "felkla1", "respostas": ["Bom", "Regular", ..., null]}' localhost:8502/pontuar
+
+POST /pontuar recebe uma avaliação {"fase": ..., "respostas": [...]}, com os
+25 rótulos na ordem q11..q55 (null = não respondida) e um "id" opcional, que
+é devolvido. Também aceita uma lista de avaliações, respondida com uma lista,
+ou {"avaliacoes": [...]}, respondido com {"resultados": [...]}. Cada
+resultado traz os scores das dimensões, o score final ponderado, o status
+(APROVADO / ATENÇÃO / NÃO APROVADO), as questões respondidas e o total: os
+mesmos valores que o teste2.py exibe, calculados por `pontuacao.pontuar`.
+GET /saude responde com os contadores do serviço.
+
+O front end é um servidor asyncio com um HTTP/1.1 mínimo (keep-alive e
+Content-Length, sem chunked). As avaliações validadas de cada requisição vão
+para uma fila (`Agrupador`). Uma tarefa retira de uma vez tudo o que estiver
+pendente, até `tamanho_lote` avaliações, e chama `pontuar` uma vez por fase
+com as respostas de todas as requisições concatenadas (micro-batching). Sob
+carga, as requisições lidas na mesma volta do loop de eventos são pontuadas
+juntas sem espera adicional; `espera` (--espera-ms) abre uma janela para
+juntar mais, à custa de latência.
+"""
+import argparse
+import asyncio
+import contextlib
+import json
+import logging
+import sys
+
+import numpy as np
+
+from felkla.codificacao import codificar
+from felkla.pontuacao import FASES, QUESTOES_POR_FASE, STATUS, classificar_lote, pontuar
+
+log = logging.getLogger(__name__)
+
+HOST_PADRAO = '127.0.0.1'
+PORTA_PADRAO = 8502
+TAMANHO_LOTE = 4096
+ESPERA = 0.0
+TAMANHO_MAXIMO_CORPO = 8 * 1024 * 1024
+# Conexões keep-alive ociosas por mais tempo são fechadas
+OCIOSIDADE = 60.0
+
+MOTIVOS = {
+    200: 'OK',
+    400: 'Bad Request',
+    404: 'Not Found',
+    405: 'Method Not Allowed',
+    411: 'Length Required',
+    413: 'Payload Too Large',
+    500: 'Internal Server Error',
+}
+
+CONTADORES = ('requisicoes', 'avaliacoes', 'lotes', 'erros')
+
+
+class ErroRequisicao(ValueError):
+    """Requisição inválida; `status` é o código HTTP da resposta."""
+
+    def __init__(self, mensagem, status=400):
+        super().__init__(mensagem)
+        self.status = status
+
+
+def preparar(avaliacao):
+    """Valida uma avaliação do JSON e retorna (fase, vetor de códigos)."""
+    if not isinstance(avaliacao, dict):
+        raise ErroRequisicao("Cada avaliação deve ser um objeto com 'fase' e 'respostas'")
+    fase = avaliacao.get('fase')
+    if fase not in FASES:
+        raise ErroRequisicao(f"Fase desconhecida: {fase!r} (esperada uma de {', '.join(FASES)})")
+    respostas = avaliacao.get('respostas')
+    if not isinstance(respostas, list):
+        raise ErroRequisicao(f"'respostas' deve ser uma lista de {QUESTOES_POR_FASE} rótulos")
+    try:
+        return fase, codificar(respostas)
+    except TypeError:
+        raise ErroRequisicao("As respostas devem ser rótulos (texto) ou null") from None
+    except ValueError as erro:
+        raise ErroRequisicao(str(erro)) from None
+
+
+def pontuar_lote(itens):
+    """Pontua [(fase, códigos), ...] com uma chamada de `pontuar` por fase.
+
+    Retorna os resultados na ordem de `itens`.
+    """
+    resultados = [None] * len(itens)
+    por_fase = {}
+    for posicao, (fase, _) in enumerate(itens):
+        por_fase.setdefault(fase, []).append(posicao)
+
+    for fase, posicoes in por_fase.items():
+        pontos = np.stack([itens[posicao][1] for posicao in posicoes])
+        scores, score_final = pontuar(fase, pontos)
+        dimensoes = FASES[fase]['dimensoes']
+        for posicao, linha, final, indice, respondidas in zip(
+                posicoes, scores.tolist(), score_final.tolist(), classificar_lote(score_final).tolist(),
+                np.count_nonzero(pontos, axis=1).tolist()):
+            resultados[posicao] = {
+                'fase': fase,
+                'dimensoes': dict(zip(dimensoes, linha)),
+                'score_final': final,
+                'status': STATUS[indice],
+                'respondidas': respondidas,
+                'total': QUESTOES_POR_FASE,
+            }
+    return resultados
+
+
+class Agrupador:
+    """Junta as avaliações de requisições concorrentes em chamadas vetorizadas de `pontuar`."""
+
+    def __init__(self, tamanho_lote=TAMANHO_LOTE, espera=ESPERA):
+        self.tamanho_lote = tamanho_lote
+        self.espera = espera
+        self.contadores = dict.fromkeys(CONTADORES, 0)
+        self._fila = asyncio.Queue()
+        self._tarefa = None
+
+    def iniciar(self):
+        self._tarefa = asyncio.get_running_loop().create_task(self._executar())
+
+    async def fechar(self):
+        if self._tarefa is not None:
+            self._tarefa.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._tarefa
+
+    async def pontuar(self, itens):
+        """Resultados de [(fase, códigos), ...], na mesma ordem."""
+        futuro = asyncio.get_running_loop().create_future()
+        self._fila.put_nowait((itens, futuro))
+        return await futuro
+
+    async def _proximo(self, prazo):
+        # Pedido já na fila ou, dentro da janela de espera, o próximo a chegar
+        try:
+            return self._fila.get_nowait()
+        except asyncio.QueueEmpty:
+            restante = prazo - asyncio.get_running_loop().time()
+            if restante <= 0:
+                return None
+        try:
+            return await asyncio.wait_for(self._fila.get(), restante)
+        except asyncio.TimeoutError:
+            return None
+
+    async def _executar(self):
+        while True:
+            pedidos = [await self._fila.get()]
+            quantidade = len(pedidos[0][0])
+            prazo = asyncio.get_running_loop().time() + self.espera
+            while quantidade < self.tamanho_lote:
+                pedido = await self._proximo(prazo)
+                if pedido is None:
+                    break
+                pedidos.append(pedido)
+                quantidade += len(pedido[0])
+
+            try:
+                resultados = pontuar_lote([item for itens, _ in pedidos for item in itens])
+            except Exception as erro:
+                log.exception('Falha ao pontuar lote de %d avaliações', quantidade)
+                for _, futuro in pedidos:
+                    if not futuro.done():
+                        futuro.set_exception(erro)
+                continue
+
+            inicio = 0
+            for itens, futuro in pedidos:
+                # O futuro de uma conexão encerrada pode ter sido cancelado
+                if not futuro.done():
+                    futuro.set_result(resultados[inicio:inicio + len(itens)])
+                inicio += len(itens)
+            self.contadores['lotes'] += 1
+            self.contadores['avaliacoes'] += quantidade
+
+
+class Servico:
+    """Servidor HTTP/1.1 mínimo sobre asyncio com as rotas /pontuar e /saude."""
+
+    def __init__(self, agrupador):
+        self.agrupador = agrupador
+
+    async def responder(self, metodo, caminho, corpo):
+        """(status, objeto JSON da resposta) de uma requisição."""
+        caminho = caminho.split('?', 1)[0]
+        if caminho == '/saude':
+            if metodo != 'GET':
+                return 405, {'erro': 'Use GET em /saude'}
+            return 200, {'status': 'ok', **self.agrupador.contadores}
+        if caminho != '/pontuar':
+            return 404, {'erro': f'Rota desconhecida: {caminho}'}
+        if metodo != 'POST':
+            return 405, {'erro': 'Use POST em /pontuar'}
+
+        try:
+            dados = json.loads(corpo)
+        except (UnicodeDecodeError, json.JSONDecodeError):
+            return 400, {'erro': 'Corpo da requisição não é um JSON válido'}
+
+        if isinstance(dados, dict) and 'avaliacoes' in dados:
+            formato, avaliacoes = 'avaliacoes', dados['avaliacoes']
+        elif isinstance(dados, list):
+            formato, avaliacoes = 'lista', dados
+        else:
+            formato, avaliacoes = 'unica', [dados]
+        if not isinstance(avaliacoes, list):
+            return 400, {'erro': "'avaliacoes' deve ser uma lista"}
+
+        itens = []
+        for i, avaliacao in enumerate(avaliacoes):
+            try:
+                itens.append(preparar(avaliacao))
+            except ErroRequisicao as erro:
+                prefixo = '' if formato == 'unica' else f'Avaliação {i}: '
+                return erro.status, {'erro': prefixo + str(erro)}
+
+        resultados = await self.agrupador.pontuar(itens) if itens else []
+        for avaliacao, resultado in zip(avaliacoes, resultados):
+            if 'id' in avaliacao:
+                resultado['id'] = avaliacao['id']
+
+        if formato == 'unica':
+            return 200, resultados[0]
+        if formato == 'avaliacoes':
+            return 200, {'resultados': resultados}
+        return 200, resultados
+
+    async def atender(self, leitor, escritor):
+        """Atende as requisições de uma conexão até ela ser fechada."""
+        try:
+            while True:
+                try:
+                    linha = await asyncio.wait_for(leitor.readline(), OCIOSIDADE)
+                except asyncio.TimeoutError:
+                    break
+                if not linha:
+                    break
+                partes = linha.decode('latin-1').split()
+                if len(partes) != 3:
+                    break
+                metodo, caminho, versao = partes
+
+                cabecalhos = {}
+                while True:
+                    linha = await leitor.readline()
+                    if linha in (b'\r\n', b'\n', b''):
+                        break
+                    nome, _, valor = linha.decode('latin-1').partition(':')
+                    cabecalhos[nome.strip().lower()] = valor.strip()
+                conexao = cabecalhos.get('connection', '').lower()
+                manter = conexao == 'keep-alive' if versao == 'HTTP/1.0' else conexao != 'close'
+
+                if 'chunked' in cabecalhos.get('transfer-encoding', '').lower():
+                    status, resposta, manter = 411, {'erro': 'Envie o corpo com Content-Length'}, False
+                else:
+                    try:
+                        tamanho = int(cabecalhos.get('content-length') or 0)
+                    except ValueError:
+                        tamanho = -1
+                    if tamanho < 0:
+                        status, resposta, manter = 400, {'erro': 'Content-Length inválido'}, False
+                    elif tamanho > TAMANHO_MAXIMO_CORPO:
+                        status, resposta, manter = 413, {'erro': f'Corpo acima de {TAMANHO_MAXIMO_CORPO} bytes'}, False
+                    else:
+                        corpo = await leitor.readexactly(tamanho) if tamanho else b''
+                        try:
+                            status, resposta = await self.responder(metodo, caminho, corpo)
+                        except Exception:
+                            log.exception('Falha ao atender %s %s', metodo, caminho)
+                            status, resposta = 500, {'erro': 'Erro interno'}
+
+                self.agrupador.contadores['requisicoes'] += 1
+                if status != 200:
+                    self.agrupador.contadores['erros'] += 1
+                escritor.write(_resposta_http(status, resposta, manter))
+                await escritor.drain()
+                if not manter:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            escritor.close()
+            with contextlib.suppress(ConnectionError):
+                await escritor.wait_closed()
+
+
+def _resposta_http(status, resposta, manter):
+    corpo = json.dumps(resposta, ensure_ascii=False).encode('utf-8')
+    cabecalho = (f"HTTP/1.1 {status} {MOTIVOS[status]}\r\n"
+                 "Content-Type: application/json; charset=utf-8\r\n"
+                 f"Content-Length: {len(corpo)}\r\n")
+    if not manter:
+        cabecalho += "Connection: close\r\n"
+    return cabecalho.encode('latin-1') + b"\r\n" + corpo
+
+
+async def servir(host=HOST_PADRAO, porta=PORTA_PADRAO, tamanho_lote=TAMANHO_LOTE, espera=ESPERA):
+    """Executa o serviço até ser cancelado."""
+    agrupador = Agrupador(tamanho_lote, espera)
+    agrupador.iniciar()
+    servidor = await asyncio.start_server(Servico(agrupador).atender, host, porta)
+    endereco = servidor.sockets[0].getsockname()
+    # O benchmark de carga lê a porta desta linha (útil com --porta 0)
+    print(f"Serviço de pontuação FELKLA em http://{endereco[0]}:{endereco[1]}", file=sys.stderr, flush=True)
+    try:
+        async with servidor:
+            await servidor.serve_forever()
+    finally:
+        await agrupador.fechar()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Serviço HTTP de pontuação FELKLA.')
+    parser.add_argument('--host', default=HOST_PADRAO, help='endereço de escuta (padrão: %(default)s)')
+    parser.add_argument('--porta', type=int, default=PORTA_PADRAO, help='porta; 0 escolhe uma livre (padrão: %(default)s)')
+    parser.add_argument('--lote', type=int, default=TAMANHO_LOTE,
+                        help='máximo de avaliações por chamada de pontuação (padrão: %(default)s)')
+    parser.add_argument('--espera-ms', type=float, default=ESPERA * 1000,
+                        help='janela para juntar requisições em um lote, em ms (padrão: %(default)s)')
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s %(levelname)s %(name)s: %(message)s')
+    try:
+        asyncio.run(servir(args.host, args.porta, max(1, args.lote), args.espera_ms / 1000))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
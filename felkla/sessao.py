@@ -0,0 +1,196 @@
+"""Modelo das respostas de uma sessão do app, para todas as fases.
+
+As respostas de cada fase ficam em um vetor de 25 códigos (ver
+`felkla.codificacao`), que é a fonte de verdade da sessão: os widgets do
+questionário são apenas uma visão dele. Assim as respostas de uma fase
+sobrevivem enquanto os seus widgets não são renderizados (outra aba ativa)
+e podem ser carregadas de uma avaliação salva de uma só vez.
+
+Ao informar o projeto, `carregar` preenche cada fase com a última avaliação
+salva do projeto. Fases que o avaliador já começou a responder não são
+sobrescritas; fases preenchidas a partir de outro projeto e ainda não
+editadas são substituídas.
+
+Para a prévia do resultado, o modelo mantém por fase a soma dos pontos e o
+número de respostas de cada dimensão. Uma resposta alterada atualiza apenas
+a sua dimensão em O(1), e `previa` obtém os scores das 5 dimensões e o score
+final a partir dessas somas, sem percorrer as 25 respostas. O cálculo segue a
+ordem das operações de `pontuacao.pontuar`, então os valores são idênticos.
+
+Com um token de sessão (parâmetro ?sessao= da URL), o modelo é gravado como
+checkpoint no armazenamento compartilhado a cada alteração (`checkpoint`) e
+restaurado por `obter` quando a sessão do Streamlit não o tem, por exemplo
+depois que o balanceador de carga envia o usuário a outra réplica ou que o
+processo é reiniciado. Com FELKLA_SESSOES_COMPARTILHADAS=1, o app gera um
+token para toda sessão que chega sem um.
+"""
+import base64
+import os
+import secrets
+
+import numpy as np
+
+from felkla.armazenamento import novo_registro
+from felkla.codificacao import CODIGOS, ROTULOS, codificar, decodificar, desempacotar, empacotar
+from felkla.catalogo import DIMENSOES_POR_FASE, QUESTOES_POR_DIMENSAO
+from felkla.pontuacao import FASES, PONTUACAO_MAXIMA, QUESTOES_POR_FASE
+
+CHAVE_ESTADO = 'felkla_sessao'
+
+COMPARTILHADAS = os.environ.get('FELKLA_SESSOES_COMPARTILHADAS', '') not in ('', '0')
+
+
+class Sessao:
+    """Respostas das fases (vetores uint8 de códigos) e o projeto carregado."""
+
+    __slots__ = ('codigos', 'somas', 'contagens', 'projeto', 'carregadas', 'token')
+
+    def __init__(self, fases_ids, token=None):
+        self.codigos = {fase_id: np.zeros(QUESTOES_POR_FASE, dtype=np.uint8) for fase_id in fases_ids}
+        # Pontos e respostas por dimensão de cada fase, mantidos por `definir`
+        self.somas = {fase_id: [0] * DIMENSOES_POR_FASE for fase_id in self.codigos}
+        self.contagens = {fase_id: [0] * DIMENSOES_POR_FASE for fase_id in self.codigos}
+        self.projeto = ''
+        # Respostas empacotadas com que cada fase foi preenchida por `carregar`
+        self.carregadas = {}
+        self.token = token
+
+    def resposta(self, fase_id, indice):
+        """Rótulo da resposta da questão `indice` (0..24), ou None."""
+        return ROTULOS[self.codigos[fase_id][indice]]
+
+    def definir(self, fase_id, indice, rotulo):
+        try:
+            novo = CODIGOS[rotulo]
+        except KeyError:
+            raise ValueError(f"Resposta desconhecida: {rotulo!r}") from None
+        codigos = self.codigos[fase_id]
+        anterior = int(codigos[indice])
+        codigos[indice] = novo
+        # O código é a pontuação da resposta (0 = não respondida)
+        dimensao = indice // QUESTOES_POR_DIMENSAO
+        self.somas[fase_id][dimensao] += novo - anterior
+        self.contagens[fase_id][dimensao] += (novo > 0) - (anterior > 0)
+
+    def _recontar(self, fase_id):
+        # Depois de trocar todas as respostas da fase de uma vez
+        por_dimensao = self.codigos[fase_id].reshape(DIMENSOES_POR_FASE, QUESTOES_POR_DIMENSAO)
+        self.somas[fase_id] = por_dimensao.sum(axis=1, dtype=np.int64).tolist()
+        self.contagens[fase_id] = np.count_nonzero(por_dimensao, axis=1).tolist()
+
+    def preencher(self, fase_id, codigos):
+        """Troca todas as respostas da fase de uma vez (vetor de 25 códigos)."""
+        self.codigos[fase_id][:] = codigos
+        self._recontar(fase_id)
+
+    def previa(self, fase_id):
+        """Scores das dimensões, score final e respostas da fase, a partir das somas por dimensão."""
+        fase = FASES[fase_id]
+        scores = [soma / (contagem * PONTUACAO_MAXIMA) * 100 if contagem else 0.0
+                  for soma, contagem in zip(self.somas[fase_id], self.contagens[fase_id])]
+        score_final = scores[0] * fase['pesos'][0]
+        for score, peso in zip(scores[1:], fase['pesos'][1:]):
+            score_final = score_final + score * peso
+        return {
+            'dimensoes': dict(zip(fase['dimensoes'], scores)),
+            'score_final': score_final,
+            'respondidas': sum(self.contagens[fase_id]),
+        }
+
+    def respostas(self, fase_id):
+        """Lista dos 25 rótulos da fase (None = não respondida)."""
+        return decodificar(self.codigos[fase_id])
+
+    def preenchidas(self, fase_id):
+        return sum(self.contagens[fase_id])
+
+    def empacotadas(self, fase_id):
+        """Respostas da fase em 10 bytes (ver `codificacao.empacotar`)."""
+        return empacotar(self.codigos[fase_id])
+
+    def editada(self, fase_id):
+        """A fase tem respostas que não vieram de `carregar`."""
+        if fase_id in self.carregadas:
+            return self.empacotadas(fase_id) != self.carregadas[fase_id]
+        return self.preenchidas(fase_id) > 0
+
+    def carregar(self, armazenamento, projeto):
+        """Preenche as fases com a última avaliação salva do projeto.
+
+        Retorna {fase_id: registro} das fases preenchidas.
+        """
+        self.projeto = projeto
+        preenchidas = {}
+        for fase_id, codigos in self.codigos.items():
+            if self.editada(fase_id):
+                continue
+            registro = armazenamento.ultima(projeto, fase_id) if projeto else None
+            if registro is None:
+                if fase_id in self.carregadas:
+                    # Respostas de outro projeto, não editadas: descartadas
+                    codigos[:] = 0
+                    self._recontar(fase_id)
+                    del self.carregadas[fase_id]
+                continue
+            codigos[:] = codificar(registro['respostas'])
+            self._recontar(fase_id)
+            self.carregadas[fase_id] = self.empacotadas(fase_id)
+            preenchidas[fase_id] = registro
+        return preenchidas
+
+    def salvar(self, armazenamento, fase_id, resultado):
+        """Enfileira a avaliação atual da fase para o projeto da sessão."""
+        armazenamento.salvar(novo_registro(self.projeto, fase_id, self.respostas(fase_id), resultado))
+        # Salvas, as respostas passam a ser as do projeto e podem ser trocadas
+        # pelas de outro projeto em `carregar`
+        self.carregadas[fase_id] = self.empacotadas(fase_id)
+
+    def exportar(self):
+        """Estado da sessão serializável em JSON (respostas em base64 de 10 bytes por fase)."""
+        return {
+            'projeto': self.projeto,
+            'respostas': {fase_id: _texto(self.empacotadas(fase_id)) for fase_id in self.codigos},
+            'carregadas': {fase_id: _texto(dados) for fase_id, dados in self.carregadas.items()},
+        }
+
+    def restaurar(self, dados):
+        """Inverso de `exportar`; fases ausentes do catálogo atual são ignoradas."""
+        self.projeto = dados['projeto']
+        for fase_id, texto in dados['respostas'].items():
+            if fase_id in self.codigos:
+                self.codigos[fase_id][:] = desempacotar(_bytes(texto))
+                self._recontar(fase_id)
+        self.carregadas = {fase_id: _bytes(texto) for fase_id, texto in dados['carregadas'].items()
+                           if fase_id in self.codigos}
+
+    def checkpoint(self, armazenamento):
+        """Grava o estado da sessão no armazenamento, se ela tiver token."""
+        if self.token:
+            armazenamento.salvar_sessao(self.token, self.exportar())
+
+
+def _texto(dados):
+    return base64.urlsafe_b64encode(dados).decode('ascii')
+
+
+def _bytes(texto):
+    return base64.urlsafe_b64decode(texto)
+
+
+def novo_token():
+    return secrets.token_urlsafe(16)
+
+
+def obter(estado, fases_ids, armazenamento=None, token=None):
+    """Modelo guardado no mapeamento `estado` (o session_state), criado na primeira chamada.
+
+    Com `token`, um modelo novo parte do último checkpoint da sessão no armazenamento.
+    """
+    sessao = estado.get(CHAVE_ESTADO)
+    if sessao is None:
+        sessao = Sessao(fases_ids, token)
+        dados = armazenamento.carregar_sessao(token) if token else None
+        if dados:
+            sessao.restaurar(dados)
+        estado[CHAVE_ESTADO] = sessao
+    return sessao
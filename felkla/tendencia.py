@@ -0,0 +1,68 @@
+"""Tendência dos scores de um projeto ao longo das reavaliações.
+
+Um projeto pode ser reavaliado milhares de vezes em uma fase. Para o gráfico,
+a série lida de `Armazenamento.serie` é reduzida no servidor a no máximo
+PONTOS_PADRAO pontos com o algoritmo Largest-Triangle-Three-Buckets (LTTB,
+Steinarsson 2013), e só os pontos escolhidos vão para o navegador.
+
+O LTTB mantém o primeiro e o último ponto e divide os demais em baldes
+consecutivos. De cada balde escolhe o ponto que forma o maior triângulo com o
+ponto escolhido no balde anterior e a média do balde seguinte, o que preserva
+picos e quedas que uma média ou uma amostragem regular apagariam. Aqui o
+score final e os das 5 dimensões são reduzidos juntos: a área do triângulo é
+somada entre as séries, e todas usam os mesmos instantes.
+"""
+import numpy as np
+
+PONTOS_PADRAO = 300
+
+
+def lttb(x, y, limite=PONTOS_PADRAO):
+    """Índices dos pontos mantidos, em ordem crescente.
+
+    `x` é o vetor (n,) em ordem crescente e `y` o vetor (n,) ou a matriz
+    (n, k) das séries. Com n <= limite, todos os pontos são mantidos.
+    """
+    x = np.asarray(x, dtype=np.float64)
+    n = len(x)
+    if n <= limite or limite < 3:
+        return np.arange(n)
+    y = np.asarray(y, dtype=np.float64).reshape(n, -1)
+
+    # Baldes dos pontos internos, com as bordas arredondadas para baixo como no
+    # algoritmo original; o último "balde seguinte" é o último ponto
+    largura = (n - 2) / (limite - 2)
+    bordas = np.minimum(np.floor(np.arange(limite) * largura).astype(np.int64) + 1, n)
+    acumulado_x = np.concatenate([[0.0], np.cumsum(x)])
+    acumulado_y = np.vstack([np.zeros((1, y.shape[1])), np.cumsum(y, axis=0)])
+    tamanhos = (bordas[2:] - bordas[1:-1])[:, None]
+    media_x = (acumulado_x[bordas[2:]] - acumulado_x[bordas[1:-1]]) / tamanhos[:, 0]
+    media_y = (acumulado_y[bordas[2:]] - acumulado_y[bordas[1:-1]]) / tamanhos
+
+    indices = np.empty(limite, dtype=np.int64)
+    indices[0] = anterior = 0
+    for balde in range(limite - 2):
+        inicio, fim = bordas[balde], bordas[balde + 1]
+        dx = x[anterior] - media_x[balde]
+        dy = media_y[balde] - y[anterior]
+        # Dobro da área de cada triângulo, somado entre as séries
+        areas = np.abs(dx * (y[inicio:fim] - y[anterior]) - (x[anterior] - x[inicio:fim, None]) * dy).sum(axis=1)
+        indices[balde + 1] = anterior = inicio + int(np.argmax(areas))
+    indices[-1] = n - 1
+    return indices
+
+
+def tendencia(armazenamento, projeto, fase, pontos=PONTOS_PADRAO, inicio=None, fim=None):
+    """Série reduzida do projeto na fase para o gráfico.
+
+    Retorna um dicionário com 'instantes', 'dimensoes' (n, 5) e 'score_final'
+    dos pontos mantidos e 'total', o número de avaliações da série completa.
+    """
+    instantes, scores, score_final = armazenamento.serie(projeto, fase, inicio, fim)
+    mantidos = lttb(instantes, np.column_stack([score_final, scores]), pontos)
+    return {
+        'instantes': instantes[mantidos],
+        'dimensoes': scores[mantidos],
+        'score_final': score_final[mantidos],
+        'total': len(instantes),
+    }
@@ -0,0 +1,313 @@
+"""Textos fixos da interface: guia de pontuação, instruções e página de metodologia.
+
+Ficam fora de teste2.py para que o script do app contenha apenas a lógica de
+renderização. Como módulo, são compilados para bytecode uma única vez (cache
+.pyc) e não são recompilados quando o observador de arquivos do Streamlit
+recarrega o script. O layout (colunas, ordem dos elementos) continua no app.
+"""
+
+# Expander de critérios detalhados de avaliação
+GUIA_PONTUACAO = """
+<div class="caixa-guia">
+    <h3>📋 Guia de Pontuação para Avaliações</h3>
+</div>
+"""
+
+# Cartões dos critérios de pontuação, por coluna
+CRITERIOS = (
+    (
+        """
+<div class="criterio nota-5">
+    <h4>🟢 Pontuação 5 - EXCELENTE</h4>
+    <p><strong>Evidências Necessárias:</strong></p>
+    <ul>
+        <li>Documentação completa e aprovada pelos stakeholders</li>
+        <li>Análises realizadas com metodologia adequada</li>
+        <li>Resultados validados por especialistas</li>
+        <li>Aprovação formal da liderança/comitê</li>
+        <li>Benchmarks ou melhores práticas considerados</li>
+    </ul>
+    <div class="exemplo">
+        <strong>Exemplo:</strong> <em>"Estudo de viabilidade econômica concluído com VPL, TIR, payback e cenários de sensibilidade, validado pela área financeira e aprovado pelo comitê."</em>
+    </div>
+</div>
+""",
+        """
+<div class="criterio nota-3">
+    <h4>🟡 Pontuação 3 - REGULAR</h4>
+    <p><strong>Evidências Necessárias:</strong></p>
+    <ul>
+        <li>Trabalho iniciado com progresso significativo (50-79%)</li>
+        <li>Estrutura básica estabelecida</li>
+        <li>Algumas análises completas, outras em andamento</li>
+        <li>Lacunas identificadas com plano para resolução</li>
+        <li>Recursos alocados para conclusão</li>
+    </ul>
+    <div class="exemplo">
+        <strong>Exemplo:</strong> <em>"Mapeamento de riscos identificou principais riscos técnicos e comerciais, mas faltam quantificação de impactos e planos de mitigação detalhados."</em>
+    </div>
+</div>
+""",
+        """
+<div class="criterio nota-1">
+    <h4>🔴 Pontuação 1 - NÃO INICIADO</h4>
+    <p><strong>Evidências Necessárias:</strong></p>
+    <ul>
+        <li>Atividade não foi iniciada (0-19%)</li>
+        <li>Apenas intenções ou ideias preliminares</li>
+        <li>Falta de recursos ou priorização</li>
+        <li>Não aplicável ao tipo específico de projeto</li>
+        <li>Dependência de outras atividades não concluídas</li>
+    </ul>
+    <div class="exemplo">
+        <strong>Exemplo:</strong> <em>"Projeto na fase de ideação, com apenas conceitos preliminares, aguardando aprovação de recursos para iniciar estudos."</em>
+    </div>
+</div>
+""",
+    ),
+    (
+        """
+<div class="criterio nota-4">
+    <h4>🔵 Pontuação 4 - BOM</h4>
+    <p><strong>Evidências Necessárias:</strong></p>
+    <ul>
+        <li>Trabalho substancialmente completo (80-99%)</li>
+        <li>Pequenos ajustes ou complementações pendentes</li>
+        <li>Qualidade técnica adequada</li>
+        <li>Revisão técnica realizada</li>
+        <li>Cronograma para finalização definido</li>
+    </ul>
+    <div class="exemplo">
+        <strong>Exemplo:</strong> <em>"Análise de alternativas tecnológicas 90% completa, faltando apenas validação final dos custos de uma opção, com conclusão em 1 semana."</em>
+    </div>
+</div>
+""",
+        """
+<div class="criterio nota-2">
+    <h4>🟠 Pontuação 2 - INADEQUADO</h4>
+    <p><strong>Evidências Necessárias:</strong></p>
+    <ul>
+        <li>Trabalho iniciado mas com grandes lacunas (20-49%)</li>
+        <li>Informações preliminares disponíveis</li>
+        <li>Metodologia definida mas não aplicada completamente</li>
+        <li>Necessidade de recursos adicionais significativos</li>
+        <li>Cronograma para conclusão indefinido ou muito extenso</li>
+    </ul>
+    <div class="exemplo">
+        <strong>Exemplo:</strong> <em>"Levantamento de fornecedores iniciado, mas apenas 3 empresas contactadas de um universo de 15 identificadas como relevantes."</em>
+    </div>
+</div>
+""",
+    ),
+)
+
+DICAS = """
+<div class="caixa-dicas">
+    <h4>💡 Dicas Importantes para Avaliação:</h4>
+    <div class="colunas">
+        <div>
+            <p><strong>🎯 Seja Objetivo:</strong><br>Base sua avaliação em evidências concretas e documentadas</p>
+            <p><strong>📝 Documente:</strong><br>Mantenha registros das evidências utilizadas na avaliação</p>
+        </div>
+        <div>
+            <p><strong>🔄 Revise:</strong><br>Reavalie periodicamente conforme o projeto evolui</p>
+            <p><strong>⚖️ Consistência:</strong><br>Use os mesmos critérios em todas as avaliações</p>
+        </div>
+    </div>
+</div>
+"""
+
+INSTRUCOES = """
+<div class="caixa-instrucoes">
+    <p>
+        <strong>📖 Instruções:</strong> Responda cada questão selecionando a opção que melhor representa o status atual do seu projeto. 
+        Consulte os critérios detalhados acima para uma avaliação precisa e consistente.
+    </p>
+</div>
+"""
+
+# Página de metodologia
+METODOLOGIA_CABECALHO = """
+<div class="cabecalho-pagina">
+    <h2>📚 METODOLOGIA FELKLA</h2>
+    <p>
+        <strong>Front-End Loading (FEL)</strong> adaptado para o setor de papel e celulose
+    </p>
+</div>
+"""
+
+METODOLOGIA_INTRODUCAO = """
+### 🎯 O que é a Metodologia FELKLA?
+
+A **Metodologia FELKLA** é uma adaptação da metodologia Front-End Loading (FEL) especificamente desenvolvida para projetos do setor de papel e celulose. 
+Esta abordagem estruturada garante que os projetos sejam adequadamente avaliados, planejados e definidos antes da execução, 
+minimizando riscos e maximizando as chances de sucesso.
+
+**Benefícios principais:**
+- 🎯 **Redução de riscos** através de planejamento estruturado
+- 💰 **Melhores estimativas** de custo e cronograma  
+- 🔍 **Decisões mais assertivas** baseadas em análises detalhadas
+- 🌱 **Alinhamento** com objetivos de sustentabilidade
+- ⚖️ **Padronização** do processo de avaliação de projetos
+"""
+
+# (cartão, objetivo/atividades/entregáveis) de cada fase
+METODOLOGIA_FASES = (
+    (
+        """
+<div class="cartao-fase f1">
+    <h3>🔍 FELKLA-1</h3>
+    <p class="nome">
+        Avaliação de Oportunidades
+    </p>
+    <p>
+        Precisão de Estimativas: ±50%
+    </p>
+</div>
+""",
+        """
+**🎯 Objetivo Principal:**  
+Avaliar a viabilidade técnica e econômica do projeto, definindo se vale a pena prosseguir.
+
+**📋 Principais Atividades:**
+- Definição do problema/oportunidade de negócio
+- Estudos de mercado e análise de demanda
+- Avaliação de alternativas tecnológicas
+- Estimativas preliminares de CAPEX/OPEX
+- Análise de viabilidade econômica básica
+- Identificação de riscos principais
+- Definição do escopo conceitual
+
+**📦 Entregáveis:**
+- Documento de definição da oportunidade
+- Estudo de viabilidade preliminar  
+- Estimativa de custos classe 5
+- Cronograma macro
+- Análise de riscos inicial
+""",
+    ),
+    (
+        """
+<div class="cartao-fase f2">
+    <h3>⚖️ FELKLA-2</h3>
+    <p class="nome">
+        Seleção de Alternativas
+    </p>
+    <p>
+        Precisão de Estimativas: ±30%
+    </p>
+</div>
+""",
+        """
+**�� Objetivo Principal:**  
+Selecionar a melhor alternativa técnica e desenvolver o conceito básico do projeto.
+
+**📋 Principais Atividades:**
+- Desenvolvimento de alternativas técnicas detalhadas
+- Estudos de engenharia básica (fluxogramas, balanços)
+- Seleção de tecnologia e fornecedores principais
+- Definição do layout básico e localização
+- Estimativas de custo mais precisas
+- Análise de riscos detalhada
+- Estudos ambientais e de permissões
+- Estratégia de execução preliminar
+
+**📦 Entregáveis:**
+- Documento de seleção de alternativa
+- Fluxogramas de processo (PFDs)
+- Layout preliminar do projeto
+- Estimativa de custos classe 4
+- Cronograma detalhado
+- Plano de gerenciamento de riscos
+- Estudos de impacto ambiental
+""",
+    ),
+    (
+        """
+<div class="cartao-fase f3">
+    <h3>✅ FELKLA-3</h3>
+    <p class="nome">
+        Definição do Projeto
+    </p>
+    <p>
+        Precisão de Estimativas: ±15%
+    </p>
+</div>
+""",
+        """
+**🎯 Objetivo Principal:**  
+Definir completamente o projeto antes da execução, minimizando mudanças durante a construção.
+
+**📋 Principais Atividades:**
+- Engenharia de detalhe avançada (P&IDs, especificações)
+- Definição completa do escopo de trabalho
+- Cotações firmes de equipamentos principais
+- Plano de execução detalhado
+- Estimativas de custo de alta precisão
+- Cronograma executivo detalhado
+- Planos de qualidade, segurança e meio ambiente
+- Estratégia de contratação e aquisições
+- Obtenção de licenças e permissões
+
+**📦 Entregáveis:**
+- Pacote completo de engenharia básica
+- P&IDs (Piping & Instrumentation Diagrams)
+- Especificações técnicas detalhadas
+- Estimativa de custos classe 3
+- Cronograma executivo
+- Plano de execução do projeto
+- Contratos principais negociados
+- Todas as licenças aprovadas
+""",
+    ),
+)
+
+FLUXO = """
+<div class="fluxo">
+    <div class="fluxo-etapa">
+        <div class="fluxo-circulo f1"><strong>F1</strong></div>
+        <p>Oportunidade</p>
+    </div>
+    <div class="fluxo-seta">→</div>
+    <div class="fluxo-etapa">
+        <div class="fluxo-circulo f2"><strong>F2</strong></div>
+        <p>Seleção</p>
+    </div>
+    <div class="fluxo-seta">→</div>
+    <div class="fluxo-etapa">
+        <div class="fluxo-circulo f3"><strong>F3</strong></div>
+        <p>Definição</p>
+    </div>
+    <div class="fluxo-seta">→</div>
+    <div class="fluxo-etapa">
+        <div class="fluxo-circulo execucao"><strong>🚀</strong></div>
+        <p>Execução</p>
+    </div>
+</div>
+"""
+
+CRITERIOS_APROVACAO = (
+    """
+**🔍 FELKLA-1**
+- Score ≥ 80%: Aprovado para F2
+- Score 60-79%: Melhorias necessárias
+- Score < 60%: Não recomendado
+""",
+    """
+**⚖️ FELKLA-2**
+- Score ≥ 80%: Aprovado para F3
+- Score 60-79%: Ajustes necessários
+- Score < 60%: Retornar ao F1
+""",
+    """
+**✅ FELKLA-3**
+- Score ≥ 80%: Pronto para execução
+- Score 60-79%: Finalizar pendências
+- Score < 60%: Revisar projeto
+""",
+)
+
+NOTA_METODOLOGIA = """
+💡 **Nota Importante:** Esta metodologia foi especificamente adaptada para o setor de papel e celulose, 
+considerando as particularidades técnicas, ambientais e regulatórias desta indústria.
+"""
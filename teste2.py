@@ -1,173 +1,32 @@
+import time
+from datetime import datetime
+
 import streamlit as st
 
+from felkla import perfil, textos
+from felkla.armazenamento import FAIXAS_HISTOGRAMA, criar_armazenamento, resumo_portfolio
+from felkla.catalogo import carregar_catalogo, questoes_fase
+from felkla.codificacao import ROTULOS, codificar, decodificar, desempacotar, empacotar
+from felkla.estilo import folha_de_estilo
+from felkla.fila import FilaCheia
+from felkla.pontuacao import LIMIAR_APROVADO, LIMIAR_ATENCAO, faixa
+from felkla.relatorio import FORMATOS, analisar, exportar
+from felkla.sessao import COMPARTILHADAS, novo_token
+from felkla.sessao import obter as obter_sessao
+
+# Perfil de tempo por seção (opcional): FELKLA_PERFIL=1 ou ?perfil=1
+perfil.iniciar(st.query_params.get('perfil') == '1')
+
 # Configuração da página com melhorias
 st.set_page_config(
     page_title='Metodologia FELKLA - Avaliação de Projetos',
-    page_icon='🌲',
     layout='wide',
     initial_sidebar_state='collapsed'
 )
 
-# CSS customizado com cores da Klabin
-st.markdown("""
-<style>
-    /* Estilo geral da aplicação */
-    .main-header {
-        background: linear-gradient(90deg, #006837 0%, #228B22 100%);
-        padding: 2rem;
-        border-radius: 10px;
-        margin-bottom: 2rem;
-        box-shadow: 0 4px 6px rgba(0, 0, 0, 0.1);
-    }
-
-    .main-title {
-        color: white;
-        text-align: center;
-        font-size: 2.5rem;
-        font-weight: bold;
-        margin: 0;
-    }
-
-    .main-subtitle {
-        color: #e8f5e8;
-        text-align: center;
-        font-size: 1.2rem;
-        margin-top: 0.5rem;
-    }
-
-    /* Estilo das abas */
-    .stTabs [data-baseweb="tab-list"] {
-        gap: 8px;
-        background-color: #f8f9fa;
-        padding: 0.5rem;
-        border-radius: 10px;
-    }
-
-    .stTabs [data-baseweb="tab"] {
-        height: 60px;
-        padding: 0 24px;
-        background-color: white;
-        border-radius: 8px;
-        border: 2px solid #e9ecef;
-        font-weight: 600;
-        transition: all 0.3s ease;
-    }
-
-    .stTabs [aria-selected="true"] {
-        background: linear-gradient(90deg, #006837 0%, #228B22 100%);
-        color: white !important;
-        border-color: #006837;
-    }
-
-    /* Estilo das seções */
-    .section-header {
-        background: linear-gradient(90deg, #f0f8f0 0%, #e8f5e8 100%);
-        padding: 1rem;
-        border-radius: 8px;
-        border-left: 4px solid #006837;
-        margin-bottom: 1rem;
-        font-weight: bold;
-        font-size: 1.1rem;
-        color: #2d5016;
-    }
-
-    /* Melhorias nos selectbox */
-    .stSelectbox > div > div {
-        border-radius: 8px;
-        border: 2px solid #e9ecef;
-        transition: border-color 0.3s ease;
-    }
-
-    .stSelectbox > div > div:focus-within {
-        border-color: #006837;
-        box-shadow: 0 0 0 2px rgba(0, 104, 55, 0.1);
-    }
-
-    /* Estilo dos botões */
-    .stButton > button {
-        background: linear-gradient(90deg, #006837 0%, #228B22 100%);
-        color: white;
-        border: none;
-        border-radius: 8px;
-        padding: 0.75rem 2rem;
-        font-weight: 600;
-        font-size: 1rem;
-        transition: all 0.3s ease;
-        box-shadow: 0 2px 4px rgba(0, 0, 0, 0.1);
-    }
-
-    .stButton > button:hover {
-        background: linear-gradient(90deg, #004d28 0%, #1a6b1a 100%);
-        transform: translateY(-2px);
-        box-shadow: 0 4px 8px rgba(0, 0, 0, 0.2);
-    }
-
-    /* Estilo das métricas */
-    [data-testid="metric-container"] {
-        background: white;
-        border: 1px solid #e9ecef;
-        padding: 1rem;
-        border-radius: 8px;
-        box-shadow: 0 2px 4px rgba(0, 0, 0, 0.05);
-        border-top: 3px solid #006837;
-    }
-
-    [data-testid="metric-container"] [data-testid="metric-value"] {
-        color: #006837;
-        font-weight: bold;
-    }
-
-    /* Divisores personalizados */
-    .custom-divider {
-        height: 2px;
-        background: linear-gradient(90deg, transparent 0%, #006837 50%, transparent 100%);
-        border: none;
-        margin: 2rem 0;
-    }
-
-    /* Alertas personalizados */
-    .stAlert {
-        border-radius: 8px;
-        border: none;
-        box-shadow: 0 2px 4px rgba(0, 0, 0, 0.1);
-    }
-
-    /* Cores específicas para alertas */
-    .stSuccess {
-        background-color: #d4edda;
-        border-left: 4px solid #006837;
-        color: #155724;
-    }
-
-    .stWarning {
-        background-color: #fff3cd;
-        border-left: 4px solid #ffc107;
-        color: #856404;
-    }
-
-    .stError {
-        background-color: #f8d7da;
-        border-left: 4px solid #dc3545;
-        color: #721c24;
-    }
-
-    /* Estilo para headers das seções */
-    .question-section {
-        background: linear-gradient(135deg, #f0f8f0 0%, #ffffff 100%);
-        padding: 1.5rem;
-        border-radius: 10px;
-        margin-bottom: 1.5rem;
-        border: 1px solid #e8f5e8;
-        box-shadow: 0 2px 4px rgba(0, 104, 55, 0.05);
-    }
-
-    /* Melhorias no layout geral */
-    .main .block-container {
-        padding-top: 2rem;
-        padding-bottom: 2rem;
-    }
-</style>
-""", unsafe_allow_html=True)
+# CSS customizado com cores da Klabin (felkla/estilo.css)
+st.markdown(folha_de_estilo(), unsafe_allow_html=True)
+perfil.etapa('css')
 
 # Header principal da aplicação
 st.markdown("""
@@ -176,2150 +35,1070 @@ st.markdown("""
     <p class="main-subtitle">Sistema de Avaliação e Gestão de Projetos - Klabin</p>
 </div>
 """, unsafe_allow_html=True)
+perfil.etapa('cabecalho')
 
 # Seção de critérios de avaliação expansível
 with st.expander("📋 **CRITÉRIOS DETALHADOS DE AVALIAÇÃO FELKLA**", expanded=False):
-    st.markdown("""
-    <div style="background: linear-gradient(135deg, #f0f8f0 0%, #ffffff 100%); padding: 1.5rem; border-radius: 10px; margin-bottom: 1rem;">
-        <h3 style="color: #006837; text-align: center; margin-bottom: 1.5rem;">
-            📋 Guia de Pontuação para Avaliações
-        </h3>
-    </div>
-    """, unsafe_allow_html=True)
+    st.markdown(textos.GUIA_PONTUACAO, unsafe_allow_html=True)
 
-    col1, col2 = st.columns(2)
-
-    with col1:
-        st.markdown("""
-        <div style="background: linear-gradient(135deg, #d4edda 0%, #c3e6cb 100%); 
-                    border-left: 4px solid #28a745; padding: 1rem; border-radius: 8px; margin-bottom: 1rem;">
-            <h4 style="color: #155724; margin-top: 0;">🟢 Pontuação 5 - EXCELENTE</h4>
-            <p><strong>Evidências Necessárias:</strong></p>
-            <ul style="color: #155724;">
-                <li>Documentação completa e aprovada pelos stakeholders</li>
-                <li>Análises realizadas com metodologia adequada</li>
-                <li>Resultados validados por especialistas</li>
-                <li>Aprovação formal da liderança/comitê</li>
-                <li>Benchmarks ou melhores práticas considerados</li>
-            </ul>
-            <div style="background: rgba(21, 87, 36, 0.1); padding: 0.8rem; border-radius: 5px; margin-top: 0.5rem;">
-                <strong>Exemplo:</strong> <em>"Estudo de viabilidade econômica concluído com VPL, TIR, payback e cenários de sensibilidade, validado pela área financeira e aprovado pelo comitê."</em>
-            </div>
-        </div>
-        """, unsafe_allow_html=True)
-
-        st.markdown("""
-        <div style="background: linear-gradient(135deg, #fff3cd 0%, #ffeaa7 100%); 
-                    border-left: 4px solid #ffc107; padding: 1rem; border-radius: 8px; margin-bottom: 1rem;">
-            <h4 style="color: #856404; margin-top: 0;">🟡 Pontuação 3 - REGULAR</h4>
-            <p><strong>Evidências Necessárias:</strong></p>
-            <ul style="color: #856404;">
-                <li>Trabalho iniciado com progresso significativo (50-79%)</li>
-                <li>Estrutura básica estabelecida</li>
-                <li>Algumas análises completas, outras em andamento</li>
-                <li>Lacunas identificadas com plano para resolução</li>
-                <li>Recursos alocados para conclusão</li>
-            </ul>
-            <div style="background: rgba(133, 100, 4, 0.1); padding: 0.8rem; border-radius: 5px; margin-top: 0.5rem;">
-                <strong>Exemplo:</strong> <em>"Mapeamento de riscos identificou principais riscos técnicos e comerciais, mas faltam quantificação de impactos e planos de mitigação detalhados."</em>
-            </div>
-        </div>
-        """, unsafe_allow_html=True)
-
-        st.markdown("""
-        <div style="background: linear-gradient(135deg, #f8d7da 0%, #f5c6cb 100%); 
-                    border-left: 4px solid #dc3545; padding: 1rem; border-radius: 8px; margin-bottom: 1rem;">
-            <h4 style="color: #721c24; margin-top: 0;">🔴 Pontuação 1 - NÃO INICIADO</h4>
-            <p><strong>Evidências Necessárias:</strong></p>
-            <ul style="color: #721c24;">
-                <li>Atividade não foi iniciada (0-19%)</li>
-                <li>Apenas intenções ou ideias preliminares</li>
-                <li>Falta de recursos ou priorização</li>
-                <li>Não aplicável ao tipo específico de projeto</li>
-                <li>Dependência de outras atividades não concluídas</li>
-            </ul>
-            <div style="background: rgba(114, 28, 36, 0.1); padding: 0.8rem; border-radius: 5px; margin-top: 0.5rem;">
-                <strong>Exemplo:</strong> <em>"Projeto na fase de ideação, com apenas conceitos preliminares, aguardando aprovação de recursos para iniciar estudos."</em>
-            </div>
-        </div>
-        """, unsafe_allow_html=True)
-
-    with col2:
-        st.markdown("""
-        <div style="background: linear-gradient(135deg, #cce5ff 0%, #b3d9ff 100%); 
-                    border-left: 4px solid #007bff; padding: 1rem; border-radius: 8px; margin-bottom: 1rem;">
-            <h4 style="color: #004085; margin-top: 0;">🔵 Pontuação 4 - BOM</h4>
-            <p><strong>Evidências Necessárias:</strong></p>
-            <ul style="color: #004085;">
-                <li>Trabalho substancialmente completo (80-99%)</li>
-                <li>Pequenos ajustes ou complementações pendentes</li>
-                <li>Qualidade técnica adequada</li>
-                <li>Revisão técnica realizada</li>
-                <li>Cronograma para finalização definido</li>
-            </ul>
-            <div style="background: rgba(0, 64, 133, 0.1); padding: 0.8rem; border-radius: 5px; margin-top: 0.5rem;">
-                <strong>Exemplo:</strong> <em>"Análise de alternativas tecnológicas 90% completa, faltando apenas validação final dos custos de uma opção, com conclusão em 1 semana."</em>
-            </div>
-        </div>
-        """, unsafe_allow_html=True)
-
-        st.markdown("""
-        <div style="background: linear-gradient(135deg, #ffd6cc 0%, #ffb3b3 100%); 
-                    border-left: 4px solid #fd7e14; padding: 1rem; border-radius: 8px; margin-bottom: 1rem;">
-            <h4 style="color: #8b4513; margin-top: 0;">🟠 Pontuação 2 - INADEQUADO</h4>
-            <p><strong>Evidências Necessárias:</strong></p>
-            <ul style="color: #8b4513;">
-                <li>Trabalho iniciado mas com grandes lacunas (20-49%)</li>
-                <li>Informações preliminares disponíveis</li>
-                <li>Metodologia definida mas não aplicada completamente</li>
-                <li>Necessidade de recursos adicionais significativos</li>
-                <li>Cronograma para conclusão indefinido ou muito extenso</li>
-            </ul>
-            <div style="background: rgba(139, 69, 19, 0.1); padding: 0.8rem; border-radius: 5px; margin-top: 0.5rem;">
-                <strong>Exemplo:</strong> <em>"Levantamento de fornecedores iniciado, mas apenas 3 empresas contactadas de um universo de 15 identificadas como relevantes."</em>
-            </div>
-        </div>
-        """, unsafe_allow_html=True)
+    for coluna, criterios in zip(st.columns(2), textos.CRITERIOS):
+        with coluna:
+            for criterio in criterios:
+                st.markdown(criterio, unsafe_allow_html=True)
 
     # Dicas importantes
-    st.markdown("""
-    <div style="background: linear-gradient(135deg, #e8f5e8 0%, #d4f4d4 100%); 
-                padding: 1.5rem; border-radius: 8px; margin-top: 1.5rem; 
-                border-left: 4px solid #006837;">
-        <h4 style="color: #006837; margin-top: 0;">💡 Dicas Importantes para Avaliação:</h4>
-        <div style="display: grid; grid-template-columns: 1fr 1fr; gap: 1rem;">
-            <div>
-                <p><strong>🎯 Seja Objetivo:</strong><br>Base sua avaliação em evidências concretas e documentadas</p>
-                <p><strong>📝 Documente:</strong><br>Mantenha registros das evidências utilizadas na avaliação</p>
-            </div>
-            <div>
-                <p><strong>🔄 Revise:</strong><br>Reavalie periodicamente conforme o projeto evolui</p>
-                <p><strong>⚖️ Consistência:</strong><br>Use os mesmos critérios em todas as avaliações</p>
-            </div>
-        </div>
-    </div>
-    """, unsafe_allow_html=True)
+    st.markdown(textos.DICAS, unsafe_allow_html=True)
+perfil.etapa('criterios')
 
 # Instruções de uso
-st.markdown("""
-<div style="background: linear-gradient(135deg, #f8f9fa 0%, #e9ecef 100%); 
-            padding: 1rem; border-radius: 8px; margin: 1rem 0; 
-            border-left: 4px solid #6c757d;">
-    <p style="margin: 0; color: #495057;">
-        <strong>📖 Instruções:</strong> Responda cada questão selecionando a opção que melhor representa o status atual do seu projeto. 
-        Consulte os critérios detalhados acima para uma avaliação precisa e consistente.
-    </p>
-</div>
-""", unsafe_allow_html=True)
+st.markdown(textos.INSTRUCOES, unsafe_allow_html=True)
 
 st.markdown("---")
+perfil.etapa('instrucoes')
 
-# Função para calcular pontuação (mantida igual)
-def calcular_pontuacao(resposta):
-    if resposta == 'Excelente':
-        return 5
-    elif resposta == 'Bom':
-        return 4
-    elif resposta == 'Regular':
-        return 3
-    elif resposta == 'Inadequado':
-        return 2
-    elif resposta == 'Não iniciado':
-        return 1
-    else:
-        return 0
-
-
-aba_metodologia, aba1, aba2, aba3 = st.tabs([
-    "📚 **METODOLOGIA**",
-    "🔍 **FELKLA-1**",
-    "⚖️ **FELKLA-2**",
-    "✅ **FELKLA-3**"
-])
-
-with aba_metodologia:
-    st.markdown("""
-    <div style="background: linear-gradient(135deg, #f0f8f0 0%, #ffffff 100%); 
-                padding: 1.5rem; border-radius: 10px; margin-bottom: 2rem; 
-                border-left: 5px solid #006837;">
-        <h2 style="color: #006837; margin: 0;">📚 METODOLOGIA FELKLA</h2>
-        <p style="color: #2d5016; margin: 0.5rem 0 0 0; font-size: 1.1rem;">
-            <strong>Front-End Loading (FEL)</strong> adaptado para o setor de papel e celulose
-        </p>
-    </div>
-    """, unsafe_allow_html=True)
-
-    # Introdução
-    st.markdown("""
-    ### 🎯 O que é a Metodologia FELKLA?
-
-    A **Metodologia FELKLA** é uma adaptação da metodologia Front-End Loading (FEL) especificamente desenvolvida para projetos do setor de papel e celulose. 
-    Esta abordagem estruturada garante que os projetos sejam adequadamente avaliados, planejados e definidos antes da execução, 
-    minimizando riscos e maximizando as chances de sucesso.
-
-    **Benefícios principais:**
-    - 🎯 **Redução de riscos** através de planejamento estruturado
-    - 💰 **Melhores estimativas** de custo e cronograma  
-    - 🔍 **Decisões mais assertivas** baseadas em análises detalhadas
-    - 🌱 **Alinhamento** com objetivos de sustentabilidade
-    - ⚖️ **Padronização** do processo de avaliação de projetos
-    """)
+# Catálogo de fases e questões, lido uma única vez por processo do servidor
+@st.cache_resource
+def obter_catalogo():
+    return carregar_catalogo()
 
-    st.markdown("---")
 
-    # FELKLA-1
-    col1, col2 = st.columns([1, 2])
-
-    with col1:
-        st.markdown("""
-        <div style="background: linear-gradient(135deg, #e3f2fd 0%, #bbdefb 100%); 
-                    padding: 1.5rem; border-radius: 10px; text-align: center;
-                    border: 2px solid #1976d2;">
-            <h3 style="color: #1976d2; margin: 0;">🔍 FELKLA-1</h3>
-            <p style="color: #1565c0; margin: 0.5rem 0; font-weight: bold;">
-                Avaliação de Oportunidades
-            </p>
-            <p style="color: #1565c0; margin: 0; font-size: 0.9rem;">
-                Precisão de Estimativas: ±50%
-            </p>
-        </div>
-        """, unsafe_allow_html=True)
+catalogo = obter_catalogo()
 
-    with col2:
-        st.markdown("""
-        **🎯 Objetivo Principal:**  
-        Avaliar a viabilidade técnica e econômica do projeto, definindo se vale a pena prosseguir.
-
-        **📋 Principais Atividades:**
-        - Definição do problema/oportunidade de negócio
-        - Estudos de mercado e análise de demanda
-        - Avaliação de alternativas tecnológicas
-        - Estimativas preliminares de CAPEX/OPEX
-        - Análise de viabilidade econômica básica
-        - Identificação de riscos principais
-        - Definição do escopo conceitual
-
-        **📦 Entregáveis:**
-        - Documento de definição da oportunidade
-        - Estudo de viabilidade preliminar  
-        - Estimativa de custos classe 5
-        - Cronograma macro
-        - Análise de riscos inicial
-        """)
 
-    st.markdown("---")
+# Avaliações persistidas (SQLite por padrão, ver FELKLA_ARMAZENAMENTO); as
+# gravações são feitas em lote por uma thread de fundo compartilhada
+@st.cache_resource
+def obter_armazenamento():
+    return criar_armazenamento()
 
-    # FELKLA-2
-    col1, col2 = st.columns([1, 2])
-
-    with col1:
-        st.markdown("""
-        <div style="background: linear-gradient(135deg, #fff3e0 0%, #ffcc02 100%); 
-                    padding: 1.5rem; border-radius: 10px; text-align: center;
-                    border: 2px solid #f57c00;">
-            <h3 style="color: #ef6c00; margin: 0;">⚖️ FELKLA-2</h3>
-            <p style="color: #e65100; margin: 0.5rem 0; font-weight: bold;">
-                Seleção de Alternativas
-            </p>
-            <p style="color: #e65100; margin: 0; font-size: 0.9rem;">
-                Precisão de Estimativas: ±30%
-            </p>
-        </div>
-        """, unsafe_allow_html=True)
 
-    with col2:
-        st.markdown("""
-        **�� Objetivo Principal:**  
-        Selecionar a melhor alternativa técnica e desenvolver o conceito básico do projeto.
-
-        **📋 Principais Atividades:**
-        - Desenvolvimento de alternativas técnicas detalhadas
-        - Estudos de engenharia básica (fluxogramas, balanços)
-        - Seleção de tecnologia e fornecedores principais
-        - Definição do layout básico e localização
-        - Estimativas de custo mais precisas
-        - Análise de riscos detalhada
-        - Estudos ambientais e de permissões
-        - Estratégia de execução preliminar
-
-        **📦 Entregáveis:**
-        - Documento de seleção de alternativa
-        - Fluxogramas de processo (PFDs)
-        - Layout preliminar do projeto
-        - Estimativa de custos classe 4
-        - Cronograma detalhado
-        - Plano de gerenciamento de riscos
-        - Estudos de impacto ambiental
-        """)
+armazenamento = obter_armazenamento()
+# Respostas de todas as fases da sessão (felkla/sessao.py). Com ?sessao=<token>
+# elas são retomadas do armazenamento compartilhado, em qualquer réplica
+token_sessao = st.query_params.get('sessao')
+if token_sessao is None and COMPARTILHADAS:
+    token_sessao = st.query_params['sessao'] = novo_token()
+sessao = obter_sessao(st.session_state, catalogo['por_id'], armazenamento, token_sessao)
+if 'projeto' not in st.session_state:
+    # Primeira execução da sessão: o campo do projeto parte do modelo
+    st.session_state['projeto'] = sessao.projeto
+perfil.etapa('recursos')
 
-    st.markdown("---")
+ICONES_FAIXA = {'aprovado': '🎯', 'atencao': '⚠️', 'reprovado': '❌'}
 
-    # FELKLA-3
-    col1, col2 = st.columns([1, 2])
-
-    with col1:
-        st.markdown("""
-        <div style="background: linear-gradient(135deg, #e8f5e8 0%, #c8e6c8 100%); 
-                    padding: 1.5rem; border-radius: 10px; text-align: center;
-                    border: 2px solid #388e3c;">
-            <h3 style="color: #2e7d32; margin: 0;">✅ FELKLA-3</h3>
-            <p style="color: #1b5e20; margin: 0.5rem 0; font-weight: bold;">
-                Definição do Projeto
-            </p>
-            <p style="color: #1b5e20; margin: 0; font-size: 0.9rem;">
-                Precisão de Estimativas: ±15%
-            </p>
-        </div>
-        """, unsafe_allow_html=True)
-
-    with col2:
-        st.markdown("""
-        **🎯 Objetivo Principal:**  
-        Definir completamente o projeto antes da execução, minimizando mudanças durante a construção.
-
-        **📋 Principais Atividades:**
-        - Engenharia de detalhe avançada (P&IDs, especificações)
-        - Definição completa do escopo de trabalho
-        - Cotações firmes de equipamentos principais
-        - Plano de execução detalhado
-        - Estimativas de custo de alta precisão
-        - Cronograma executivo detalhado
-        - Planos de qualidade, segurança e meio ambiente
-        - Estratégia de contratação e aquisições
-        - Obtenção de licenças e permissões
-
-        **📦 Entregáveis:**
-        - Pacote completo de engenharia básica
-        - P&IDs (Piping & Instrumentation Diagrams)
-        - Especificações técnicas detalhadas
-        - Estimativa de custos classe 3
-        - Cronograma executivo
-        - Plano de execução do projeto
-        - Contratos principais negociados
-        - Todas as licenças aprovadas
-        """)
+CAIXAS_FAIXA = {'aprovado': st.success, 'atencao': st.warning, 'reprovado': st.error}
+CAIXAS_PASSOS = {'aprovado': st.info, 'atencao': st.warning, 'reprovado': st.error}
 
-    st.markdown("---")
+MODOS_RESPOSTA = {
+    'seletores': "Seletores",
+    'grade': "▦ Grade",
+    'formulario': "📝 Formulário",
+}
 
-    # Fluxo da metodologia
-    st.markdown("### 🔄 Fluxo da Metodologia FELKLA")
-
-    st.markdown("""
-    <div style="background: linear-gradient(135deg, #f8f9fa 0%, #e9ecef 100%); 
-                padding: 2rem; border-radius: 10px; margin: 1rem 0;">
-        <div style="display: flex; justify-content: space-between; align-items: center; flex-wrap: wrap;">
-            <div style="text-align: center; margin: 0.5rem;">
-                <div style="background: #1976d2; color: white; padding: 1rem; border-radius: 50%; width: 80px; height: 80px; display: flex; align-items: center; justify-content: center; margin: 0 auto 0.5rem;">
-                    <strong>F1</strong>
-                </div>
-                <p style="margin: 0; font-weight: bold;">Oportunidade</p>
-            </div>
-            <div style="font-size: 2rem; color: #006837;">→</div>
-            <div style="text-align: center; margin: 0.5rem;">
-                <div style="background: #f57c00; color: white; padding: 1rem; border-radius: 50%; width: 80px; height: 80px; display: flex; align-items: center; justify-content: center; margin: 0 auto 0.5rem;">
-                    <strong>F2</strong>
-                </div>
-                <p style="margin: 0; font-weight: bold;">Seleção</p>
-            </div>
-            <div style="font-size: 2rem; color: #006837;">→</div>
-            <div style="text-align: center; margin: 0.5rem;">
-                <div style="background: #388e3c; color: white; padding: 1rem; border-radius: 50%; width: 80px; height: 80px; display: flex; align-items: center; justify-content: center; margin: 0 auto 0.5rem;">
-                    <strong>F3</strong>
-                </div>
-                <p style="margin: 0; font-weight: bold;">Definição</p>
-            </div>
-            <div style="font-size: 2rem; color: #006837;">→</div>
-            <div style="text-align: center; margin: 0.5rem;">
-                <div style="background: #006837; color: white; padding: 1rem; border-radius: 50%; width: 80px; height: 80px; display: flex; align-items: center; justify-content: center; margin: 0 auto 0.5rem;">
-                    <strong>🚀</strong>
-                </div>
-                <p style="margin: 0; font-weight: bold;">Execução</p>
-            </div>
-        </div>
-    </div>
-    """, unsafe_allow_html=True)
-
-    # Critérios de aprovação
-    st.markdown("### ✅ Critérios de Aprovação por Fase")
+# Altura padrão das linhas do st.data_editor, em pixels
+ALTURA_LINHA_GRADE = 35
 
-    col1, col2, col3 = st.columns(3)
-
-    with col1:
-        st.markdown("""
-        **🔍 FELKLA-1**
-        - Score ≥ 80%: Aprovado para F2
-        - Score 60-79%: Melhorias necessárias
-        - Score < 60%: Não recomendado
-        """)
-
-    with col2:
-        st.markdown("""
-        **⚖️ FELKLA-2**
-        - Score ≥ 80%: Aprovado para F3
-        - Score 60-79%: Ajustes necessários
-        - Score < 60%: Retornar ao F1
-        """)
-
-    with col3:
-        st.markdown("""
-        **✅ FELKLA-3**
-        - Score ≥ 80%: Pronto para execução
-        - Score 60-79%: Finalizar pendências
-        - Score < 60%: Revisar projeto
-        """)
 
-    # Nota importante
-    st.info("""
-    💡 **Nota Importante:** Esta metodologia foi especificamente adaptada para o setor de papel e celulose, 
-    considerando as particularidades técnicas, ambientais e regulatórias desta indústria.
-    """)
-
-with aba1:
-    # Header da aba com informações
-    st.markdown("""
-    <div style="background: linear-gradient(135deg, #f0f8f0 0%, #ffffff 100%); 
-                padding: 1.5rem; border-radius: 10px; margin-bottom: 2rem; 
-                border-left: 5px solid #006837;">
-        <h2 style="color: #006837; margin: 0;">🔍 QUESTIONÁRIO FELKLA-1</h2>
-        <p style="color: #2d5016; margin: 0.5rem 0 0 0; font-size: 1.1rem;">
-            <strong>Objetivo:</strong> Avaliar a viabilidade inicial e oportunidades do projeto
-        </p>
+def renderizar_secao(dimensao):
+    st.markdown(f"""
+    <div class="question-section">
+        <h3>
+            {dimensao['secao']}
+            <span class="peso-secao">PESO {dimensao['peso']}%</span>
+        </h3>
     </div>
     """, unsafe_allow_html=True)
 
-    # Indicador de progresso
-    st.markdown("### 📊 Progresso do Questionário")
-    progress_placeholder = st.empty()
-
-    # Função para contar respostas preenchidas
-    def contar_respostas_aba1():
-        respostas = [q11, q12, q13, q14, q15, q21, q22, q23, q24, q25,
-                    q31, q32, q33, q34, q35, q41, q42, q43, q44, q45,
-                    q51, q52, q53, q54, q55]
-        preenchidas = len([r for r in respostas if r is not None])
-        return preenchidas, len(respostas)
-
-    col1, col2 = st.columns([1, 1])
-
-    with col1:
-        st.markdown("""
-        <div class="question-section">
-            <h3 style="color: #006837; margin-bottom: 1rem;">
-                🎯 DEFINIÇÃO DA OPORTUNIDADE
-                <span style="background: #006837; color: white; padding: 0.2rem 0.5rem; 
-                      border-radius: 15px; font-size: 0.8rem; margin-left: 0.5rem;">PESO 20%</span>
-            </h3>
-        </div>
-        """, unsafe_allow_html=True)
-
-        q11 = st.selectbox(
-            '**1.1** O problema/oportunidade de negócio está claramente definido e documentado?',
-            ('Excelente', 'Bom', 'Regular', 'Inadequado', 'Não iniciado'),
-            index=None,
-            help="Avalie se o problema ou oportunidade está bem documentado e compreendido"
-        )
-
-        q12 = st.selectbox(
-            '**1.2** Os objetivos do projeto estão alinhados com a estratégia corporativa e metas de sustentabilidade?',
-            ('Excelente', 'Bom', 'Regular', 'Inadequado', 'Não iniciado'),
-            index=None,
-            help="Verifique o alinhamento estratégico e sustentável do projeto"
-        )
-
-        q13 = st.selectbox(
-            '**1.3** O escopo preliminar do projeto foi estabelecido (o que está incluído/excluído)?',
-            ('Excelente', 'Bom', 'Regular', 'Inadequado', 'Não iniciado'),
-            index=None,
-            help="Avalie se o escopo está bem definido com inclusões e exclusões claras"
-        )
-
-        q14 = st.selectbox(
-            '**1.4** Os stakeholders principais foram identificados e suas necessidades mapeadas?',
-            ('Excelente', 'Bom', 'Regular', 'Inadequado', 'Não iniciado'),
-            index=None,
-            help="Verifique se todos os stakeholders relevantes foram identificados"
-        )
-
-        q15 = st.selectbox(
-            '**1.5** Os drivers de negócio (regulatório, competitivo, operacional) foram caracterizados?',
-            ('Excelente', 'Bom', 'Regular', 'Inadequado', 'Não iniciado'),
-            index=None,
-            help="Avalie se os motivadores do projeto estão bem caracterizados"
-        )
-
-    with col2:
-        st.markdown("""
-        <div class="question-section">
-            <h3 style="color: #006837; margin-bottom: 1rem;">
-                🔧 VIABILIDADE TÉCNICA
-                <span style="background: #006837; color: white; padding: 0.2rem 0.5rem; 
-                      border-radius: 15px; font-size: 0.8rem; margin-left: 0.5rem;">PESO 20%</span>
-            </h3>
-        </div>
-        """, unsafe_allow_html=True)
-
-        q21 = st.selectbox(
-            '**2.1** As alternativas tecnológicas disponíveis foram identificadas e avaliadas preliminarmente?',
-            ('Excelente', 'Bom', 'Regular', 'Inadequado', 'Não iniciado'),
-            index=None,
-            help="Verifique se diferentes opções tecnológicas foram consideradas"
-        )
-
-        q22 = st.selectbox(
-            '**2.2** A compatibilidade com sistemas/processos existentes foi analisada?',
-            ('Excelente', 'Bom', 'Regular', 'Inadequado', 'Não iniciado'),
-            index=None,
-            help="Avalie a integração com a infraestrutura atual"
-        )
-
-        q23 = st.selectbox(
-            '**2.3** Os recursos técnicos necessários (expertise, infraestrutura) foram avaliados?',
-            ('Excelente', 'Bom', 'Regular', 'Inadequado', 'Não iniciado'),
-            index=None,
-            help="Verifique se os recursos técnicos necessários foram mapeados"
-        )
 
-        q24 = st.selectbox(
-            '**2.4** Restrições técnicas e limitações foram identificadas?',
-            ('Excelente', 'Bom', 'Regular', 'Inadequado', 'Não iniciado'),
-            index=None,
-            help="Avalie se as limitações técnicas estão mapeadas"
-        )
+def chave_questao(fase, questao):
+    return f"{fase['id']}_{questao['id']}"
 
-        q25 = st.selectbox(
-            '**2.5** A maturidade tecnológica das soluções propostas foi verificada?',
-            ('Excelente', 'Bom', 'Regular', 'Inadequado', 'Não iniciado'),
-            index=None,
-            help="Verifique o nível de maturidade das tecnologias propostas"
-        )
-
-    # Divisor visual personalizado
-    st.markdown('<hr class="custom-divider">', unsafe_allow_html=True)
 
-    col3, col4 = st.columns([1, 1])
+def registrar_resposta(fase_id, indice, chave):
+    sessao.definir(fase_id, indice, st.session_state[chave])
+    sessao.checkpoint(armazenamento)
 
-    with col3:
-        st.markdown("""
-        <div class="question-section">
-            <h3 style="color: #006837; margin-bottom: 1rem;">
-                💰 VIABILIDADE ECONÔMICA
-                <span style="background: #006837; color: white; padding: 0.2rem 0.5rem; 
-                      border-radius: 15px; font-size: 0.8rem; margin-left: 0.5rem;">PESO 25%</span>
-            </h3>
-        </div>
-        """, unsafe_allow_html=True)
 
-        q31 = st.selectbox(
-            '**3.1** Estimativa preliminar de investimento (CAPEX) foi elaborada com metodologia adequada?',
-            ('Excelente', 'Bom', 'Regular', 'Inadequado', 'Não iniciado'),
-            index=None,
-            help="Avalie a qualidade das estimativas de investimento inicial"
-        )
+def renderizar_questao(fase, indice, questao, formulario=False):
+    chave = chave_questao(fase, questao)
+    resposta = sessao.resposta(fase['id'], indice)
+    if resposta is not None and chave not in st.session_state:
+        # Widget não renderizado no rerun anterior (outra aba ativa) ou com a
+        # chave apagada por quem troca as respostas do modelo de uma vez
+        # (`carregar_projeto`, `importar_planilha`): parte da resposta do modelo
+        st.session_state[chave] = resposta
+    st.selectbox(
+        f"**{questao['numero']}** {questao['texto']}",
+        catalogo['opcoes'],
+        index=None,
+        key=chave,
+        help=questao['ajuda'],
+        # Dentro de um st.form só o botão de envio aceita callback
+        on_change=None if formulario else registrar_resposta,
+        args=None if formulario else (fase['id'], indice, chave)
+    )
 
-        q32 = st.selectbox(
-            '**3.2** Impactos operacionais (OPEX) foram estimados?',
-            ('Excelente', 'Bom', 'Regular', 'Inadequado', 'Não iniciado'),
-            index=None,
-            help="Verifique se os custos operacionais foram considerados"
-        )
 
-        q33 = st.selectbox(
-            '**3.3** Benefícios esperados foram quantificados (receitas, economias, evitação de custos)?',
-            ('Excelente', 'Bom', 'Regular', 'Inadequado', 'Não iniciado'),
-            index=None,
-            help="Avalie se os benefícios financeiros estão quantificados"
-        )
+def contar_respostas(fase):
+    """Questões respondidas da fase, lidas do modelo da sessão (vale também dentro de fragmentos)."""
+    return sessao.preenchidas(fase['id']), len(sessao.codigos[fase['id']])
 
-        q34 = st.selectbox(
-            '**3.4** Análise econômica básica (VPL, TIR, payback) foi realizada?',
-            ('Excelente', 'Bom', 'Regular', 'Inadequado', 'Não iniciado'),
-            index=None,
-            help="Verifique se indicadores econômicos foram calculados"
-        )
 
-        q35 = st.selectbox(
-            '**3.5** Sensibilidades e cenários econômicos foram considerados?',
-            ('Excelente', 'Bom', 'Regular', 'Inadequado', 'Não iniciado'),
-            index=None,
-            help="Avalie se diferentes cenários econômicos foram analisados"
-        )
+def situacao_preenchimento(preenchidas, total):
+    if preenchidas == 0:
+        return 'vazio'
+    elif preenchidas < total:
+        return 'parcial'
+    else:
+        return 'completo'
 
-    with col4:
-        st.markdown("""
-        <div class="question-section">
-            <h3 style="color: #006837; margin-bottom: 1rem;">
-                🌱 ASPECTOS AMBIENTAIS E REGULATÓRIOS
-                <span style="background: #006837; color: white; padding: 0.2rem 0.5rem; 
-                      border-radius: 15px; font-size: 0.8rem; margin-left: 0.5rem;">PESO 20%</span>
-            </h3>
-        </div>
-        """, unsafe_allow_html=True)
 
-        q41 = st.selectbox(
-            '**4.1** Requisitos regulatórios e de licenciamento foram identificados?',
-            ('Excelente', 'Bom', 'Regular', 'Inadequado', 'Não iniciado'),
-            index=None,
-            help="Verifique se todos os requisitos legais foram mapeados"
-        )
+def renderizar_campos(fase, dimensao, colunas=1, formulario=False):
+    with perfil.secao(f"{fase['id']}/dimensao/{dimensao['nome']}"):
+        renderizar_secao(dimensao)
 
-        q42 = st.selectbox(
-            '**4.2** Impactos ambientais potenciais foram mapeados?',
-            ('Excelente', 'Bom', 'Regular', 'Inadequado', 'Não iniciado'),
-            index=None,
-            help="Avalie se os impactos ambientais foram identificados"
-        )
-
-        q43 = st.selectbox(
-            '**4.3** Necessidades de certificações/autorizações foram levantadas?',
-            ('Excelente', 'Bom', 'Regular', 'Inadequado', 'Não iniciado'),
-            index=None,
-            help="Verifique se certificações necessárias foram identificadas"
-        )
-
-        q44 = st.selectbox(
-            '**4.4** Conformidade com políticas internas de sustentabilidade foi verificada?',
-            ('Excelente', 'Bom', 'Regular', 'Inadequado', 'Não iniciado'),
-            index=None,
-            help="Avalie o alinhamento com políticas de sustentabilidade"
-        )
+        questoes = dimensao['questoes']
+        # Posição da primeira questão da dimensão entre as 25 da fase
+        primeira = fase['dimensoes'].index(dimensao) * len(questoes)
+        if colunas == 1:
+            for j, questao in enumerate(questoes):
+                renderizar_questao(fase, primeira + j, questao, formulario)
+        else:
+            por_coluna = -(-len(questoes) // colunas)
+            for c, coluna in enumerate(st.columns([1] * colunas)):
+                with coluna:
+                    for j in range(c * por_coluna, min((c + 1) * por_coluna, len(questoes))):
+                        renderizar_questao(fase, primeira + j, questoes[j], formulario)
 
-        q45 = st.selectbox(
-            '**4.5** Stakeholders externos relevantes foram identificados?',
-            ('Excelente', 'Bom', 'Regular', 'Inadequado', 'Não iniciado'),
-            index=None,
-            help="Verifique se stakeholders externos foram mapeados"
-        )
 
-    st.markdown('<hr class="custom-divider">', unsafe_allow_html=True)
+@st.fragment
+def renderizar_dimensao(fase, dimensao, marcadores, colunas=1):
+    """Bloco de uma dimensão; uma resposta alterada reexecuta apenas este fragmento."""
+    renderizar_campos(fase, dimensao, colunas)
 
-    st.markdown("""
-    <div class="question-section">
-        <h3 style="color: #006837; margin-bottom: 1rem;">
-            ⚠️ RISCOS E CRONOGRAMA
-            <span style="background: #006837; color: white; padding: 0.2rem 0.5rem; 
-                  border-radius: 15px; font-size: 0.8rem; margin-left: 0.5rem;">PESO 15%</span>
-        </h3>
-    </div>
-    """, unsafe_allow_html=True)
+    if marcadores.get('renderizada'):
+        # Rerun apenas do fragmento: a fase já foi renderizada por completo,
+        # então só o progresso e o aviso de questões pendentes são atualizados.
+        atualizar_preenchimento(fase, marcadores)
 
-    col5, col6, col7 = st.columns([1, 1, 1])
 
-    with col5:
-        q51 = st.selectbox(
-            '**5.1** Principais riscos do projeto foram identificados e categorizados?',
-            ('Excelente', 'Bom', 'Regular', 'Inadequado', 'Não iniciado'),
-            index=None,
-            help="Avalie se os riscos principais foram mapeados"
-        )
+def atualizar_preenchimento(fase, marcadores):
+    preenchidas, total = contar_respostas(fase)
 
-        q52 = st.selectbox(
-            '**5.2** Cronograma macro foi estabelecido com marcos principais?',
-            ('Excelente', 'Bom', 'Regular', 'Inadequado', 'Não iniciado'),
-            index=None,
-            help="Verifique se existe um cronograma preliminar"
-        )
+    if marcadores.get('resultado') or situacao_preenchimento(preenchidas, total) != marcadores['situacao']:
+        # A área de resultado muda de forma (sem respostas/parcial/completo) ou
+        # exibe um resultado calculado com as respostas anteriores
+        st.rerun()
 
-    with col6:
-        q53 = st.selectbox(
-            '**5.3** Dependências críticas foram mapeadas?',
-            ('Excelente', 'Bom', 'Regular', 'Inadequado', 'Não iniciado'),
-            index=None,
-            help="Avalie se dependências críticas foram identificadas"
-        )
+    renderizar_progresso(marcadores['progresso'], preenchidas, total)
+    renderizar_previa(marcadores['previa'], fase)
+    if 'aviso' in marcadores:
+        renderizar_aviso(marcadores['aviso'], preenchidas, total)
 
-        q54 = st.selectbox(
-            '**5.4** Recursos necessários (humanos, financeiros) foram estimados?',
-            ('Excelente', 'Bom', 'Regular', 'Inadequado', 'Não iniciado'),
-            index=None,
-            help="Verifique se recursos necessários foram estimados"
-        )
 
-    with col7:
-        q55 = st.selectbox(
-            '**5.5** Critérios de sucesso foram definidos?',
-            ('Excelente', 'Bom', 'Regular', 'Inadequado', 'Não iniciado'),
-            index=None,
-            help="Avalie se critérios de sucesso estão definidos"
-        )
+def renderizar_questionario(fase, marcadores, formulario=False):
+    """Renderiza as dimensões em pares de colunas; a última ocupa a largura toda."""
+    dimensoes = fase['dimensoes']
 
-    # Atualizar progresso
-    preenchidas, total = contar_respostas_aba1()
+    def renderizar(dimensao, colunas=1):
+        if formulario:
+            # Sem fragmentos: as respostas só chegam ao servidor no envio do formulário
+            renderizar_campos(fase, dimensao, colunas, formulario=True)
+        else:
+            renderizar_dimensao(fase, dimensao, marcadores, colunas)
+
+    for i in range(0, len(dimensoes), 2):
+        if i > 0:
+            # Divisor visual personalizado
+            st.markdown('<hr class="custom-divider">', unsafe_allow_html=True)
+
+        par = dimensoes[i:i + 2]
+        if len(par) == 2:
+            for coluna, dimensao in zip(st.columns([1, 1]), par):
+                with coluna:
+                    renderizar(dimensao)
+        else:
+            renderizar(par[0], colunas=3)
+
+
+def enviar_formulario(fase):
+    """Grava de uma vez as respostas enviadas pelo formulário da fase."""
+    sessao.preencher(fase['id'], codificar([st.session_state[chave_questao(fase, questao)]
+                                            for questao in questoes_fase(fase)]))
+    sessao.checkpoint(armazenamento)
+
+
+def renderizar_formulario(fase):
+    """Questionário em um st.form: as respostas ficam no navegador até o envio, que gera um só rerun."""
+    with st.form(f"formulario_{fase['id']}", border=False):
+        renderizar_questionario(fase, None, formulario=True)
+        st.form_submit_button(f"📨 Enviar Respostas {fase['nome']}", type="primary", on_click=enviar_formulario,
+                              args=(fase,))
+
+
+def respostas_grade(fase):
+    """Códigos das respostas na grade: a base com que ela foi montada mais as edições do editor."""
+    codigos = desempacotar(st.session_state[f"grade_base_{fase['id']}"]).copy()
+    edicoes = st.session_state.get(f"grade_{fase['id']}") or {}
+    for linha, alteracoes in edicoes.get('edited_rows', {}).items():
+        if 'Resposta' in alteracoes:
+            resposta = alteracoes['Resposta']
+            codigos[int(linha)] = ROTULOS.index(resposta) if resposta in ROTULOS else 0
+    return codigos
+
+
+def registrar_grade(fase):
+    sessao.preencher(fase['id'], respostas_grade(fase))
+    sessao.checkpoint(armazenamento)
+
+
+@st.fragment
+def renderizar_grade(fase, marcadores):
+    """Questionário da fase em uma única tabela editável; um lote de edições gera um só rerun."""
+    chave, chave_base = f"grade_{fase['id']}", f"grade_base_{fase['id']}"
+    # A identidade do editor depende dos dados: a base só muda quando as
+    # respostas mudam fora da grade (seletores, planilha, projeto carregado),
+    # para que as edições em andamento e o foco do teclado sejam preservados
+    if chave_base not in st.session_state or empacotar(respostas_grade(fase)) != sessao.empacotadas(fase['id']):
+        st.session_state[chave_base] = sessao.empacotadas(fase['id'])
+        st.session_state.pop(chave, None)
+
+    questoes = questoes_fase(fase)
+    st.data_editor(
+        {
+            'Dimensão': [f"{dimensao['secao']} · PESO {dimensao['peso']}%"
+                         for dimensao in fase['dimensoes'] for _ in dimensao['questoes']],
+            'Nº': [questao['numero'] for questao in questoes],
+            'Questão': [questao['texto'] for questao in questoes],
+            'Resposta': decodificar(desempacotar(st.session_state[chave_base])),
+            'Orientação': [questao['ajuda'] for questao in questoes],
+        },
+        key=chave,
+        on_change=registrar_grade,
+        args=(fase,),
+        column_config={
+            'Dimensão': st.column_config.TextColumn(width='medium', pinned=True),
+            'Nº': st.column_config.TextColumn(width='small'),
+            'Questão': st.column_config.TextColumn(width='large'),
+            'Resposta': st.column_config.SelectboxColumn(
+                width='medium', options=catalogo['opcoes'],
+                help="Escolha a avaliação, digite-a ou cole várias células de uma planilha"),
+            'Orientação': st.column_config.TextColumn(width='large'),
+        },
+        disabled=['Dimensão', 'Nº', 'Questão', 'Orientação'],
+        hide_index=True,
+        num_rows='fixed',
+        # Altura para as 25 questões sem rolagem interna
+        height=ALTURA_LINHA_GRADE * (len(questoes) + 1) + 3
+    )
+
+    if marcadores.get('renderizada'):
+        # Rerun apenas do fragmento, como em `renderizar_dimensao`
+        atualizar_preenchimento(fase, marcadores)
+
+
+def renderizar_progresso(placeholder, preenchidas, total):
     progress_percentage = preenchidas / total
 
-    with progress_placeholder:
+    with placeholder.container():
         st.progress(progress_percentage, text=f"Progresso: {preenchidas}/{total} questões respondidas ({progress_percentage:.1%})")
 
         if preenchidas < total:
             st.info(f"💡 **Dica:** Responda todas as {total} questões para obter uma avaliação completa!")
 
-    st.markdown('<hr class="custom-divider">', unsafe_allow_html=True)
-    # Seção de resultados melhorada
-    st.markdown("""
-        <div style="background: linear-gradient(135deg, #f0f8f0 0%, #ffffff 100%); 
-                    padding: 1.5rem; border-radius: 10px; margin: 2rem 0; 
-                    border-left: 5px solid #006837;">
-            <h2 style="color: #006837; margin: 0;">📊 RESULTADO FELKLA-1</h2>
-            <p style="color: #2d5016; margin: 0.5rem 0 0 0; font-size: 1.1rem;">
-                Análise detalhada da viabilidade e oportunidades do projeto
-            </p>
+
+def renderizar_previa(placeholder, fase):
+    """Score provisório da fase, atualizado a cada resposta a partir das somas por dimensão da sessão."""
+    previa = sessao.previa(fase['id'])
+    if not previa['respondidas']:
+        placeholder.empty()
+        return
+
+    score_final = previa['score_final']
+    faixa_final = faixa(score_final)
+    dimensoes = "".join(f"<span>{nome}: <strong>{score:.0f}%</strong></span>"
+                        for nome, score in previa['dimensoes'].items())
+    placeholder.markdown(f"""
+        <div class="previa-score {faixa_final}">
+            <p class="titulo">Prévia: <strong>{score_final:.1f}%</strong> — {fase['resultado']['cartoes'][faixa_final]['titulo']}</p>
+            <p class="dimensoes">{dimensoes}</p>
         </div>
         """, unsafe_allow_html=True)
 
-    # Verificar se todas as questões foram respondidas
-    todas_respostas = [q11, q12, q13, q14, q15, q21, q22, q23, q24, q25,
-                       q31, q32, q33, q34, q35, q41, q42, q43, q44, q45,
-                       q51, q52, q53, q54, q55]
 
-    respostas_preenchidas = [r for r in todas_respostas if r is not None]
+def renderizar_aviso(placeholder, preenchidas, total):
+    placeholder.warning(
+        f"⚠️ **Atenção:** {total - preenchidas} questões ainda não foram respondidas. Para uma avaliação completa, responda todas as questões.")
 
-    # Inicializar variáveis
-    calcular_resultado = False
 
-    if len(respostas_preenchidas) == 0:
-        st.info("🔍 **Responda as questões acima para gerar o resultado da avaliação FELKLA-1**")
+def html_cartao_score(fase, score_final):
+    faixa_final = faixa(score_final)
+    cartao = fase['resultado']['cartoes'][faixa_final]
+    return f"""
+        <div class="cartao-score {faixa_final}">
+            <h1>{score_final:.1f}%</h1>
+            <h3>{cartao['titulo']}</h3>
+            <p>{cartao['texto']}</p>
+        </div>
+        """
 
-    elif len(respostas_preenchidas) < len(todas_respostas):
-        col_aviso1, col_aviso2 = st.columns([2, 1])
-        with col_aviso1:
-            st.warning(
-                f"⚠️ **Atenção:** {len(todas_respostas) - len(respostas_preenchidas)} questões ainda não foram respondidas. Para uma avaliação completa, responda todas as questões.")
-        with col_aviso2:
-            calcular_resultado = st.button("📊 Calcular Resultado Parcial", type="secondary")
 
+def markdown_lista_pontos(titulo, icone, pontos):
+    if pontos:
+        itens = [f"{icone} {ponto}" for ponto in pontos]
     else:
-        # Todas as questões respondidas
-        calcular_resultado = st.button("🚀 Calcular Resultado Completo FELKLA-1", type="primary")
-
-    if calcular_resultado:
-        # Cálculos dos scores
-        # Definição da Oportunidade (20%)
-        def_oport = [q11, q12, q13, q14, q15]
-        pontos_def = sum([calcular_pontuacao(resp) for resp in def_oport if resp is not None])
-        max_pontos_def = len([resp for resp in def_oport if resp is not None]) * 5
-        score_def = (pontos_def / max_pontos_def * 100) if max_pontos_def > 0 else 0
-
-        # Viabilidade Técnica (20%)
-        viab_tec = [q21, q22, q23, q24, q25]
-        pontos_tec = sum([calcular_pontuacao(resp) for resp in viab_tec if resp is not None])
-        max_pontos_tec = len([resp for resp in viab_tec if resp is not None]) * 5
-        score_tec = (pontos_tec / max_pontos_tec * 100) if max_pontos_tec > 0 else 0
-
-        # Viabilidade Econômica (25%)
-        viab_eco = [q31, q32, q33, q34, q35]
-        pontos_eco = sum([calcular_pontuacao(resp) for resp in viab_eco if resp is not None])
-        max_pontos_eco = len([resp for resp in viab_eco if resp is not None]) * 5
-        score_eco = (pontos_eco / max_pontos_eco * 100) if max_pontos_eco > 0 else 0
-
-        # Aspectos Ambientais (20%)
-        asp_amb = [q41, q42, q43, q44, q45]
-        pontos_amb = sum([calcular_pontuacao(resp) for resp in asp_amb if resp is not None])
-        max_pontos_amb = len([resp for resp in asp_amb if resp is not None]) * 5
-        score_amb = (pontos_amb / max_pontos_amb * 100) if max_pontos_amb > 0 else 0
-
-        # Riscos e Cronograma (15%)
-        risco_cron = [q51, q52, q53, q54, q55]
-        pontos_risco = sum([calcular_pontuacao(resp) for resp in risco_cron if resp is not None])
-        max_pontos_risco = len([resp for resp in risco_cron if resp is not None]) * 5
-        score_risco = (pontos_risco / max_pontos_risco * 100) if max_pontos_risco > 0 else 0
-
-        # Score Final Ponderado
-        score_final = (score_def * 0.20 + score_tec * 0.20 + score_eco * 0.25 +
-                       score_amb * 0.20 + score_risco * 0.15)
-
-        # Dashboard de resultados
-        st.markdown("### 📈 Dashboard de Resultados")
-
-        # Métricas principais em cards
-        col_m1, col_m2, col_m3, col_m4, col_m5 = st.columns(5)
-
-        with col_m1:
-            delta_def = "🎯" if score_def >= 80 else "⚠️" if score_def >= 60 else "❌"
-            st.metric(
-                "Definição da Oportunidade",
-                f"{score_def:.1f}%",
-                delta=f"Peso: 20% {delta_def}"
-            )
-
-        with col_m2:
-            delta_tec = "🎯" if score_tec >= 80 else "⚠️" if score_tec >= 60 else "❌"
-            st.metric(
-                "Viabilidade Técnica",
-                f"{score_tec:.1f}%",
-                delta=f"Peso: 20% {delta_tec}"
-            )
-
-        with col_m3:
-            delta_eco = "🎯" if score_eco >= 80 else "⚠️" if score_eco >= 60 else "❌"
-            st.metric(
-                "Viabilidade Econômica",
-                f"{score_eco:.1f}%",
-                delta=f"Peso: 25% {delta_eco}"
-            )
-
-        with col_m4:
-            delta_amb = "🎯" if score_amb >= 80 else "⚠️" if score_amb >= 60 else "❌"
-            st.metric(
-                "Aspectos Ambientais",
-                f"{score_amb:.1f}%",
-                delta=f"Peso: 20% {delta_amb}"
-            )
-
-        with col_m5:
-            delta_risco = "🎯" if score_risco >= 80 else "⚠️" if score_risco >= 60 else "❌"
-            st.metric(
-                "Riscos e Cronograma",
-                f"{score_risco:.1f}%",
-                delta=f"Peso: 15% {delta_risco}"
-            )
-
-        st.markdown('<hr class="custom-divider">', unsafe_allow_html=True)
-
-        # Score final destacado
-        col_score, col_interpretation = st.columns([1, 2])
-
-        with col_score:
-            if score_final >= 80:
-                st.markdown(f"""
-                    <div style="background: linear-gradient(135deg, #d4edda 0%, #c3e6cb 100%); 
-                                padding: 2rem; border-radius: 15px; text-align: center; 
-                                border: 3px solid #006837; box-shadow: 0 4px 8px rgba(0,0,0,0.1);">
-                        <h1 style="color: #006837; margin: 0; font-size: 3rem;">{score_final:.1f}%</h1>
-                        <h3 style="color: #155724; margin: 0.5rem 0;">✅ APROVADO</h3>
-                        <p style="color: #155724; margin: 0;">Projeto pronto para FELKLA-2</p>
-                    </div>
-                    """, unsafe_allow_html=True)
-            elif score_final >= 60:
-                st.markdown(f"""
-                    <div style="background: linear-gradient(135deg, #fff3cd 0%, #ffeaa7 100%); 
-                                padding: 2rem; border-radius: 15px; text-align: center; 
-                                border: 3px solid #ffc107; box-shadow: 0 4px 8px rgba(0,0,0,0.1);">
-                        <h1 style="color: #856404; margin: 0; font-size: 3rem;">{score_final:.1f}%</h1>
-                        <h3 style="color: #856404; margin: 0.5rem 0;">⚠️ ATENÇÃO</h3>
-                        <p style="color: #856404; margin: 0;">Projeto necessita melhorias</p>
-                    </div>
-                    """, unsafe_allow_html=True)
-            else:
-                st.markdown(f"""
-                    <div style="background: linear-gradient(135deg, #f8d7da 0%, #f5c6cb 100%); 
-                                padding: 2rem; border-radius: 15px; text-align: center; 
-                                border: 3px solid #dc3545; box-shadow: 0 4px 8px rgba(0,0,0,0.1);">
-                        <h1 style="color: #721c24; margin: 0; font-size: 3rem;">{score_final:.1f}%</h1>
-                        <h3 style="color: #721c24; margin: 0.5rem 0;">❌ NÃO APROVADO</h3>
-                        <p style="color: #721c24; margin: 0;">Projeto não recomendado</p>
-                    </div>
-                    """, unsafe_allow_html=True)
-
-        with col_interpretation:
-            st.markdown("#### �� Interpretação dos Resultados")
-
-            if score_final >= 80:
-                st.success("""
-                    **Excelente! Projeto aprovado para próxima fase**
-
-                    ✅ **Recomendações:**
-                    - Prosseguir para FELKLA-2
-                    - Manter qualidade dos estudos
-                    - Documentar lições aprendidas
-                    """)
-            elif score_final >= 60:
-                st.warning("""
-                    **Projeto viável com melhorias necessárias**
-
-                    ⚠️ **Ações recomendadas:**
-                    - Revisar áreas com pontuação baixa
-                    - Aprofundar estudos deficientes
-                    - Buscar suporte técnico especializado
-                    """)
-            else:
-                st.error("""
-                    **Projeto não recomendado no momento**
-
-                    ❌ **Ações necessárias:**
-                    - Revisão completa do escopo
-                    - Reavaliação da viabilidade
-                    - Considerar alternativas ou cancelamento
-                    """)
-
-        # Análise detalhada por dimensão
-        st.markdown("#### 📊 Análise Detalhada por Dimensão")
-
-        # Identificar pontos fortes e fracos
-        scores = {
-            "Definição da Oportunidade": score_def,
-            "Viabilidade Técnica": score_tec,
-            "Viabilidade Econômica": score_eco,
-            "Aspectos Ambientais": score_amb,
-            "Riscos e Cronograma": score_risco
-        }
-
-        pontos_fortes = [k for k, v in scores.items() if v >= 80]
-        pontos_atenção = [k for k, v in scores.items() if 60 <= v < 80]
-        pontos_críticos = [k for k, v in scores.items() if v < 60]
-
-        col_analise1, col_analise2, col_analise3 = st.columns(3)
-
-        with col_analise1:
-            if pontos_fortes:
-                st.markdown("**🟢 Pontos Fortes**")
-                for ponto in pontos_fortes:
-                    st.markdown(f"✅ {ponto}")
-            else:
-                st.markdown("**🟢 Pontos Fortes**")
-                st.markdown("_Nenhum identificado_")
-
-        with col_analise2:
-            if pontos_atenção:
-                st.markdown("**🟡 Necessita Atenção**")
-                for ponto in pontos_atenção:
-                    st.markdown(f"⚠️ {ponto}")
-            else:
-                st.markdown("**🟡 Necessita Atenção**")
-                st.markdown("_Nenhum identificado_")
-
-        with col_analise3:
-            if pontos_críticos:
-                st.markdown("**🔴 Pontos Críticos**")
-                for ponto in pontos_críticos:
-                    st.markdown(f"❌ {ponto}")
-            else:
-                st.markdown("**🔴 Pontos Críticos**")
-                st.markdown("_Nenhum identificado_")
-
-        # Próximos passos
-        st.markdown("#### 🚀 Próximos Passos Recomendados")
-
-        if score_final >= 80:
-            st.info("""
-                1. **Documentar resultados** da avaliação FELKLA-1
-                2. **Preparar documentação** para FELKLA-2
-                3. **Alocar recursos** para próxima fase
-                4. **Agendar reunião** de aprovação para FELKLA-2
-                """)
-        elif score_final >= 60:
-            st.warning("""
-                1. **Priorizar melhorias** nas áreas críticas identificadas
-                2. **Buscar suporte técnico** especializado
-                3. **Revisar cronograma** considerando melhorias
-                4. **Reavaliar** após implementação das melhorias
-                """)
-        else:
-            st.error("""
-                1. **Revisar fundamentação** do projeto
-                2. **Considerar alternativas** de escopo ou abordagem
-                3. **Avaliar viabilidade** de continuidade
-                4. **Documentar lições aprendidas** para projetos futuros
-                """)
-
-with aba2:
-    # Header da aba com informações
-    st.markdown("""
-    <div style="background: linear-gradient(135deg, #f0f8f0 0%, #ffffff 100%); 
-                padding: 1.5rem; border-radius: 10px; margin-bottom: 2rem; 
-                border-left: 5px solid #006837;">
-        <h2 style="color: #006837; margin: 0;">⚖️ QUESTIONÁRIO FELKLA-2</h2>
-        <p style="color: #2d5016; margin: 0.5rem 0 0 0; font-size: 1.1rem;">
-            <strong>Objetivo:</strong> Seleção e desenvolvimento de alternativas técnicas
-        </p>
-    </div>
-    """, unsafe_allow_html=True)
-
-    # Indicador de progresso
-    st.markdown("### 📊 Progresso do Questionário")
-    progress_placeholder_2 = st.empty()
-
-
-    # Função para contar respostas preenchidas FELKLA-2
-    def contar_respostas_aba2():
-        respostas = [q11_f2, q12_f2, q13_f2, q14_f2, q15_f2, q21_f2, q22_f2, q23_f2, q24_f2, q25_f2,
-                     q31_f2, q32_f2, q33_f2, q34_f2, q35_f2, q41_f2, q42_f2, q43_f2, q44_f2, q45_f2,
-                     q51_f2, q52_f2, q53_f2, q54_f2, q55_f2]
-        preenchidas = len([r for r in respostas if r is not None])
-        return preenchidas, len(respostas)
+        itens = ["_Nenhum identificado_"]
+    return "\n\n".join([titulo] + itens)
+
+
+def html_checklist(checklist_items):
+    """Itens do checklist distribuídos alternadamente em duas colunas."""
+    colunas = [[], []]
+    for i, (item, status) in enumerate(checklist_items):
+        icon = "✅" if status else "❌"
+        classe = "item-ok" if status else "item-pendente"
+        colunas[i % 2].append(f"<span class='{classe}'>{icon} {item}</span>")
+    return ["\n\n".join(coluna) for coluna in colunas]
+
+
+def html_resumo(fase, resultado, checklist_items):
+    scores = resultado['dimensoes']
+    score_final = resultado['score_final']
+    resumo = fase['resultado']['resumo']
+
+    melhor = max(scores, key=scores.get)
+    pior = min(scores, key=scores.get)
+
+    if resumo['final']:
+        prontidao_status = ("PRONTO" if score_final >= LIMIAR_APROVADO
+                            else "PENDENTE" if score_final >= LIMIAR_ATENCAO else "NÃO PRONTO")
+        linhas = f"""
+            <h4>🎯 Status Final: {prontidao_status} PARA EXECUÇÃO</h4>
+            <p><strong>Score {fase['nome']}:</strong> {score_final:.1f}%</p>
+            <p><strong>Dimensão mais forte:</strong> {melhor} ({scores[melhor]:.1f}%)</p>"""
+    else:
+        linhas = f"""
+            <h4>📊 Score Final: {score_final:.1f}%</h4>
+            <p><strong>Melhor dimensão:</strong> {melhor} ({scores[melhor]:.1f}%)</p>"""
 
+    linhas += f"""
+            <p><strong>Dimensão crítica:</strong> {pior} ({scores[pior]:.1f}%)</p>
+            <p><strong>Questões respondidas:</strong> {resultado['respondidas']}/{resultado['total']}</p>"""
 
-    col1, col2 = st.columns([1, 1])
+    if checklist_items:
+        linhas += f"""
+            <p><strong>Itens do checklist aprovados:</strong> {sum(1 for _, status in checklist_items if status)}/{len(checklist_items)}</p>"""
 
-    with col1:
-        st.markdown("""
-        <div class="question-section">
-            <h3 style="color: #006837; margin-bottom: 1rem;">
-                🔧 DESENVOLVIMENTO TÉCNICO
-                <span style="background: #006837; color: white; padding: 0.2rem 0.5rem; 
-                      border-radius: 15px; font-size: 0.8rem; margin-left: 0.5rem;">PESO 30%</span>
-            </h3>
+    return f"""
+        <div class="resumo-resultado {faixa(score_final)}">{linhas}
         </div>
-        """, unsafe_allow_html=True)
-
-        q11_f2 = st.selectbox(
-            '**1.1** Alternativas técnicas foram desenvolvidas em nível adequado de detalhe?',
-            ('Excelente', 'Bom', 'Regular', 'Inadequado', 'Não iniciado'),
-            index=None,
-            key='felkla2_q11',
-            help="Avalie o nível de detalhamento das alternativas técnicas"
-        )
-
-        q12_f2 = st.selectbox(
-            '**1.2** Estudos de engenharia básica foram realizados conforme necessário?',
-            ('Excelente', 'Bom', 'Regular', 'Inadequado', 'Não iniciado'),
-            index=None,
-            key='felkla2_q12',
-            help="Verifique a qualidade dos estudos de engenharia básica"
-        )
-
-        q13_f2 = st.selectbox(
-            '**1.3** Interfaces com sistemas existentes foram definidas?',
-            ('Excelente', 'Bom', 'Regular', 'Inadequado', 'Não iniciado'),
-            index=None,
-            key='felkla2_q13',
-            help="Avalie se as interfaces estão bem definidas"
-        )
-
-        q14_f2 = st.selectbox(
-            '**1.4** Especificações técnicas preliminares foram elaboradas?',
-            ('Excelente', 'Bom', 'Regular', 'Inadequado', 'Não iniciado'),
-            index=None,
-            key='felkla2_q14',
-            help="Verifique a qualidade das especificações técnicas"
-        )
-
-        q15_f2 = st.selectbox(
-            '**1.5** Análise de capacidade e performance foi realizada?',
-            ('Excelente', 'Bom', 'Regular', 'Inadequado', 'Não iniciado'),
-            index=None,
-            key='felkla2_q15',
-            help="Avalie se a capacidade e performance foram analisadas"
-        )
+        """
+
+
+RESULTADOS_EM_CACHE = 512
+
+
+# Resultado e HTML de cada avaliação, memoizados por (fase, respostas
+# empacotadas em 10 bytes) com descarte LRU; reexibir um resultado custa uma
+# consulta ao cache
+@st.cache_resource(max_entries=RESULTADOS_EM_CACHE)
+def montar_resultado(fase_id, respostas_empacotadas):
+    fase = catalogo['por_id'][fase_id]
+    analise = analisar(fase, decodificar(desempacotar(respostas_empacotadas)))
+    resultado = analise['resultado']
+    scores = resultado['dimensoes']
+
+    metricas = [
+        (d['nome'], f"{scores[d['nome']]:.1f}%", f"Peso: {d['peso']}% {ICONES_FAIXA[faixa(scores[d['nome']])]}")
+        for d in fase['dimensoes']
+    ]
+
+    return {
+        'resultado': resultado,
+        'faixa': analise['faixa'],
+        'metricas': metricas,
+        'cartao': html_cartao_score(fase, resultado['score_final']),
+        'pontos': [
+            markdown_lista_pontos("**🟢 Pontos Fortes**", "✅", analise['fortes']),
+            markdown_lista_pontos("**🟡 Necessita Atenção**", "⚠️", analise['atencao']),
+            markdown_lista_pontos("**🔴 Pontos Críticos**", "❌", analise['criticos']),
+        ],
+        'checklist': html_checklist(analise['checklist']) if analise['checklist'] else None,
+        'resumo': html_resumo(fase, resultado, analise['checklist']) if 'resumo' in fase['resultado'] else None,
+    }
 
-    with col2:
-        st.markdown("""
-        <div class="question-section">
-            <h3 style="color: #006837; margin-bottom: 1rem;">
-                ⚖️ SELEÇÃO DE SOLUÇÕES
-                <span style="background: #006837; color: white; padding: 0.2rem 0.5rem; 
-                      border-radius: 15px; font-size: 0.8rem; margin-left: 0.5rem;">PESO 25%</span>
-            </h3>
-        </div>
-        """, unsafe_allow_html=True)
 
-        q21_f2 = st.selectbox(
-            '**2.1** Critérios de seleção foram estabelecidos e aplicados consistentemente?',
-            ('Excelente', 'Bom', 'Regular', 'Inadequado', 'Não iniciado'),
-            index=None,
-            key='felkla2_q21',
-            help="Verifique se critérios claros foram estabelecidos"
-        )
+def renderizar_resultado(fase, montado, respostas, projeto, recem_calculado=False):
+    textos_resultado = fase['resultado']
+    faixa_final = montado['faixa']
 
-        q22_f2 = st.selectbox(
-            '**2.2** Fornecedores/tecnologias foram pré-qualificados?',
-            ('Excelente', 'Bom', 'Regular', 'Inadequado', 'Não iniciado'),
-            index=None,
-            key='felkla2_q22',
-            help="Avalie o processo de pré-qualificação"
-        )
+    # Dashboard de resultados
+    st.markdown(f"### 📈 Dashboard de Resultados {fase['nome']}")
 
-        q23_f2 = st.selectbox(
-            '**2.3** Análise comparativa das alternativas foi documentada?',
-            ('Excelente', 'Bom', 'Regular', 'Inadequado', 'Não iniciado'),
-            index=None,
-            key='felkla2_q23',
-            help="Verifique se existe documentação da análise comparativa"
-        )
+    # Métricas principais em cards
+    for coluna, (rotulo, valor, delta) in zip(st.columns(len(montado['metricas'])), montado['metricas']):
+        coluna.metric(rotulo, valor, delta=delta)
 
-        q24_f2 = st.selectbox(
-            '**2.4** Solução preferencial foi selecionada com justificativa técnico-econômica?',
-            ('Excelente', 'Bom', 'Regular', 'Inadequado', 'Não iniciado'),
-            index=None,
-            key='felkla2_q24',
-            help="Avalie se a seleção tem justificativa adequada"
-        )
+    st.markdown('<hr class="custom-divider">', unsafe_allow_html=True)
 
-        q25_f2 = st.selectbox(
-            '**2.5** Estratégia de implementação foi definida?',
-            ('Excelente', 'Bom', 'Regular', 'Inadequado', 'Não iniciado'),
-            index=None,
-            key='felkla2_q25',
-            help="Verifique se a estratégia de implementação está clara"
-        )
+    # Score final destacado
+    col_score, col_interpretation = st.columns([1, 2])
 
-    # Divisor visual personalizado
-    st.markdown('<hr class="custom-divider">', unsafe_allow_html=True)
+    col_score.markdown(montado['cartao'], unsafe_allow_html=True)
 
-    col3, col4 = st.columns([1, 1])
+    with col_interpretation:
+        st.markdown("#### 🎯 Interpretação dos Resultados")
+        CAIXAS_FAIXA[faixa_final](textos_resultado['interpretacao'][faixa_final])
 
-    with col3:
-        st.markdown("""
-        <div class="question-section">
-            <h3 style="color: #006837; margin-bottom: 1rem;">
-                🏗️ PLANEJAMENTO E LAYOUT
-                <span style="background: #006837; color: white; padding: 0.2rem 0.5rem; 
-                      border-radius: 15px; font-size: 0.8rem; margin-left: 0.5rem;">PESO 20%</span>
-            </h3>
-        </div>
-        """, unsafe_allow_html=True)
+    # Análise detalhada por dimensão
+    st.markdown("#### 📊 Análise Detalhada por Dimensão")
 
-        q31_f2 = st.selectbox(
-            '**3.1** Layout/arranjo físico foi desenvolvido adequadamente?',
-            ('Excelente', 'Bom', 'Regular', 'Inadequado', 'Não iniciado'),
-            index=None,
-            key='felkla2_q31',
-            help="Avalie a qualidade do layout desenvolvido"
-        )
+    for coluna, pontos in zip(st.columns(3), montado['pontos']):
+        coluna.markdown(pontos)
 
-        q32_f2 = st.selectbox(
-            '**3.2** Necessidades de infraestrutura foram identificadas e dimensionadas?',
-            ('Excelente', 'Bom', 'Regular', 'Inadequado', 'Não iniciado'),
-            index=None,
-            key='felkla2_q32',
-            help="Verifique se a infraestrutura foi adequadamente dimensionada"
-        )
+    renderizar_semelhantes(fase, respostas, projeto)
 
-        q33_f2 = st.selectbox(
-            '**3.3** Integração com operações existentes foi planejada?',
-            ('Excelente', 'Bom', 'Regular', 'Inadequado', 'Não iniciado'),
-            index=None,
-            key='felkla2_q33',
-            help="Avalie o planejamento da integração operacional"
-        )
+    if 'evolucao' in textos_resultado:
+        # Comparação com a fase anterior
+        st.markdown("#### 📈 Evolução do Projeto")
+        st.info(textos_resultado['evolucao'])
 
-        q34_f2 = st.selectbox(
-            '**3.4** Logística de materiais e produtos foi considerada?',
-            ('Excelente', 'Bom', 'Regular', 'Inadequado', 'Não iniciado'),
-            index=None,
-            key='felkla2_q34',
-            help="Verifique se aspectos logísticos foram considerados"
-        )
+    if montado['checklist']:
+        st.markdown("#### ✅ Checklist de Prontidão para Execução")
 
-        q35_f2 = st.selectbox(
-            '**3.5** Facilidades de apoio foram dimensionadas?',
-            ('Excelente', 'Bom', 'Regular', 'Inadequado', 'Não iniciado'),
-            index=None,
-            key='felkla2_q35',
-            help="Avalie o dimensionamento das facilidades de apoio"
-        )
+        for coluna, itens in zip(st.columns(2), montado['checklist']):
+            coluna.markdown(itens, unsafe_allow_html=True)
 
-    with col4:
-        st.markdown("""
-        <div class="question-section">
-            <h3 style="color: #006837; margin-bottom: 1rem;">
-                🌱 ASPECTOS AMBIENTAIS E SOCIAIS
-                <span style="background: #006837; color: white; padding: 0.2rem 0.5rem; 
-                      border-radius: 15px; font-size: 0.8rem; margin-left: 0.5rem;">PESO 15%</span>
-            </h3>
-        </div>
-        """, unsafe_allow_html=True)
+    # Próximos passos
+    st.markdown("#### 🚀 Próximos Passos Recomendados")
+    CAIXAS_PASSOS[faixa_final](textos_resultado['proximos_passos'][faixa_final])
 
-        q41_f2 = st.selectbox(
-            '**4.1** Estudos ambientais necessários foram iniciados?',
-            ('Excelente', 'Bom', 'Regular', 'Inadequado', 'Não iniciado'),
-            index=None,
-            key='felkla2_q41',
-            help="Verifique o status dos estudos ambientais"
-        )
+    if montado['resumo']:
+        st.markdown(textos_resultado['resumo']['titulo'])
+        st.markdown(montado['resumo'], unsafe_allow_html=True)
 
-        q42_f2 = st.selectbox(
-            '**4.2** Estratégia de licenciamento foi definida?',
-            ('Excelente', 'Bom', 'Regular', 'Inadequado', 'Não iniciado'),
-            index=None,
-            key='felkla2_q42',
-            help="Avalie se a estratégia de licenciamento está clara"
-        )
+    # Conclusão da metodologia FELKLA
+    if faixa_final == 'aprovado' and 'conclusao' in textos_resultado:
+        if recem_calculado:
+            st.balloons()
+        st.success(textos_resultado['conclusao'])
+
+
+VIZINHOS_EXIBIDOS = 5
+
+
+# Índice de semelhança de cada fase, compartilhado pelas sessões do processo;
+# cada leitura acrescenta só as avaliações gravadas desde a anterior
+@st.cache_resource
+def obter_indice_semelhanca(fase_id):
+    # Os módulos usados só por algumas seções (semelhança, planilhas, tendência,
+    # sensibilidade) são importados dentro delas, fora do caminho de partida do app
+    from felkla.semelhanca import IndiceSemelhanca
+
+    return IndiceSemelhanca(fase_id)
+
+
+@st.fragment
+def renderizar_semelhantes(fase, respostas_empacotadas, projeto):
+    """Projetos com as avaliações salvas mais próximas destas respostas e a situação atual deles."""
+    indice = obter_indice_semelhanca(fase['id'])
+    indice.atualizar(armazenamento)
+
+    st.markdown("##### 🔎 Projetos com Respostas Semelhantes")
+    if not len(indice):
+        st.caption(f"Nenhuma avaliação {fase['nome']} salva para comparação.")
+        return
+
+    col_dimensao, col_quantidade = st.columns([3, 1])
+    dimensoes = fase['dimensoes']
+    dimensao = col_dimensao.selectbox(
+        "Comparar respostas", [None, *range(len(dimensoes))],
+        format_func=lambda i: "Todas as dimensões" if i is None else dimensoes[i]['nome'],
+        key=f"semelhanca_dimensao_{fase['id']}")
+    quantidade = col_quantidade.number_input("Projetos", 1, 50, VIZINHOS_EXIBIDOS,
+                                             key=f"semelhanca_quantidade_{fase['id']}")
+
+    inicio = time.perf_counter()
+    vizinhos = indice.buscar(desempacotar(respostas_empacotadas), quantidade, excluir=projeto or None,
+                             dimensao=dimensao)
+    duracao = time.perf_counter() - inicio
+    if not vizinhos:
+        st.caption(f"Nenhum outro projeto com avaliação {fase['nome']} salva.")
+        return
+
+    linhas = []
+    for vizinho in vizinhos:
+        linha = {
+            'Projeto': vizinho['projeto'],
+            'Semelhança': vizinho['semelhanca'] * 100,
+            'Diferença': vizinho['distancia'],
+            f"Score {fase['nome']}": vizinho['score_final'],
+            'Avaliado em': datetime.fromtimestamp(vizinho['criado_em']),
+        }
+        # Como o projeto está hoje: última avaliação salva em cada fase
+        for outra in catalogo['fases']:
+            ultima = armazenamento.ultima(vizinho['projeto'], outra['id'])
+            linha[f"Atual {outra['nome']}"] = (f"{ICONES_FAIXA[faixa(ultima['score_final'])]} "
+                                               f"{ultima['score_final']:.1f}%" if ultima else "—")
+        linhas.append(linha)
+
+    percentual = st.column_config.NumberColumn(format="%.1f%%")
+    st.dataframe(
+        linhas,
+        hide_index=True,
+        column_config={
+            'Semelhança': st.column_config.ProgressColumn(format="%.0f%%", min_value=0, max_value=100),
+            'Diferença': st.column_config.NumberColumn(
+                help="Soma, questão a questão, dos níveis de diferença entre as respostas"),
+            f"Score {fase['nome']}": percentual,
+            'Avaliado em': st.column_config.DatetimeColumn(format="DD/MM/YYYY HH:mm"),
+        }
+    )
+    total = f"{len(indice):,}".replace(',', '.')
+    st.caption(f"Avaliação mais próxima de cada projeto entre {total} avaliações {fase['nome']} salvas, "
+               f"encontradas em {duracao * 1000:.1f} ms.")
+
+
+def renderizar_exportacao(fase, respostas_empacotadas, projeto):
+    """Relatório completo em HTML e PDF, gerado no pool de threads de felkla.relatorio."""
+    st.markdown("#### 📤 Exportar Relatório")
+
+    chave = f"relatorio_{fase['id']}"
+    pedido = (respostas_empacotadas, projeto)
+    exportacao = st.session_state.get(chave)
+
+    if exportacao is None or exportacao['pedido'] != pedido:
+        if not st.button("📤 Gerar Relatório (HTML e PDF)", key=f"exportar_{fase['id']}"):
+            return
+        respostas = decodificar(desempacotar(respostas_empacotadas))
+        exportacao = st.session_state[chave] = {
+            'pedido': pedido,
+            'arquivos': {formato: exportar(formato, fase, respostas, projeto) for formato in FORMATOS},
+        }
 
-        q43_f2 = st.selectbox(
-            '**4.3** Impactos sociais foram avaliados?',
-            ('Excelente', 'Bom', 'Regular', 'Inadequado', 'Não iniciado'),
-            index=None,
-            key='felkla2_q43',
-            help="Verifique se impactos sociais foram considerados"
-        )
+    if all(futuro.done() for futuro in exportacao['arquivos'].values()):
+        renderizar_downloads(fase, exportacao['arquivos'], projeto)
+    else:
+        acompanhar_exportacao(exportacao['arquivos'])
+
+
+@st.fragment(run_every=0.5)
+def acompanhar_exportacao(arquivos):
+    # Consulta periódica que não ocupa a thread do script enquanto o relatório
+    # é gerado; ao terminar, um rerun completo exibe os botões de download
+    if all(futuro.done() for futuro in arquivos.values()):
+        st.rerun()
+    st.caption("⏳ Gerando relatório em segundo plano...")
+
+
+def renderizar_downloads(fase, arquivos, projeto):
+    nome = f"relatorio_{fase['id']}_" + (''.join(c if c.isalnum() or c in '-_' else '_' for c in projeto) or 'avaliacao')
+
+    for coluna, (formato, futuro) in zip(st.columns(len(arquivos)), arquivos.items()):
+        with coluna:
+            try:
+                dados = futuro.result()
+            except ImportError:
+                st.warning(f"⚠️ A exportação em {formato.upper()} requer o pacote fpdf2 (pip install fpdf2).")
+                continue
+            except Exception as erro:
+                st.error(f"❌ Falha ao gerar o relatório {formato.upper()}: {erro}")
+                # Sem o pedido na sessão, o próximo rerun volta a oferecer o botão de geração
+                st.session_state.pop(f"relatorio_{fase['id']}", None)
+                continue
+            st.download_button(
+                f"⬇️ Baixar {formato.upper()}",
+                dados,
+                file_name=f"{nome}.{formato}",
+                mime=FORMATOS[formato],
+                key=f"baixar_{formato}_{fase['id']}",
+                on_click='ignore'
+            )
 
-        q44_f2 = st.selectbox(
-            '**4.4** Plano de engajamento de stakeholders foi elaborado?',
-            ('Excelente', 'Bom', 'Regular', 'Inadequado', 'Não iniciado'),
-            index=None,
-            key='felkla2_q44',
-            help="Avalie o plano de engajamento dos stakeholders"
-        )
 
-        q45_f2 = st.selectbox(
-            '**4.5** Medidas mitigadoras foram identificadas?',
-            ('Excelente', 'Bom', 'Regular', 'Inadequado', 'Não iniciado'),
-            index=None,
-            key='felkla2_q45',
-            help="Verifique se medidas mitigadoras estão definidas"
-        )
+def importar_planilha(fase):
+    """Lê a planilha enviada antes do rerun: preenche a fase ou pontua todas as avaliações dela."""
+    from felkla.planilha import ler_planilha, pontuar_planilha
+
+    arquivo = st.session_state[f"planilha_{fase['id']}"]
+    chave = f"importacao_{fase['id']}"
+    st.session_state.pop(chave, None)
+    if arquivo is None:
+        return
+
+    try:
+        importacao = ler_planilha(arquivo, arquivo.name, fase['id'], questoes_fase(fase))
+    except ImportError:
+        st.session_state[chave] = {'falha': "A leitura de XLSX requer o pacote openpyxl (pip install openpyxl)."}
+        return
+    except ValueError as erro:
+        st.session_state[chave] = {'falha': str(erro)}
+        return
+
+    if importacao['formato'] == 'checklist' or len(importacao['ids']) == 1:
+        # Uma avaliação: só preenche o questionário se todos os rótulos forem válidos
+        if not importacao['total_erros'] and importacao['ids']:
+            sessao.preencher(fase['id'], importacao['codigos'][0])
+            sessao.checkpoint(armazenamento)
+            for questao in questoes_fase(fase):
+                st.session_state.pop(chave_questao(fase, questao), None)
+            importacao['preenchidas'] = sessao.preenchidas(fase['id'])
+    elif importacao['ids']:
+        importacao['tabela'] = pontuar_planilha(fase['id'], importacao['ids'], importacao['codigos'])
+    st.session_state[chave] = importacao
+
+
+def renderizar_importacao(fase):
+    with st.expander("📥 Importar respostas de planilha (CSV ou XLSX)", expanded=False):
+        st.caption("Com uma questão por linha (colunas **Questão**, com 1.1 ou q11, e **Resposta**), a planilha "
+                   "preenche o questionário desta fase. Com uma avaliação por linha (colunas **Projeto** e "
+                   f"q11..q55), todas as avaliações são pontuadas e listadas. Opções válidas: "
+                   f"{', '.join(catalogo['opcoes'])}; células vazias contam como não respondidas.")
+        st.file_uploader(
+            "Planilha de respostas",
+            type=['csv', 'xlsx', 'xlsm'],
+            key=f"planilha_{fase['id']}",
+            on_change=importar_planilha,
+            args=(fase,),
+            label_visibility='collapsed'
+        )
+
+        importacao = st.session_state.get(f"importacao_{fase['id']}")
+        if importacao is None:
+            return
+        if 'falha' in importacao:
+            st.error(f"❌ {importacao['falha']}")
+            return
+
+        if importacao['total_erros']:
+            omitidos = importacao['total_erros'] - len(importacao['erros'])
+            consequencia = ("o questionário não foi alterado" if importacao['formato'] == 'checklist'
+                            else "as avaliações com respostas inválidas ficaram de fora")
+            st.warning(f"⚠️ **{importacao['total_erros']} problema(s) na planilha**; {consequencia}:\n"
+                       + "\n".join(f"- {erro}" for erro in importacao['erros'])
+                       + (f"\n- ... e mais {omitidos}" if omitidos else ""))
+
+        if 'preenchidas' in importacao:
+            st.success(f"✅ Questionário {fase['nome']} preenchido com a planilha: "
+                       f"{importacao['preenchidas']}/{len(questoes_fase(fase))} questões respondidas.")
+        elif 'tabela' in importacao:
+            st.markdown(f"**{len(importacao['ids'])} avaliações pontuadas** "
+                        "(clique no cabeçalho de uma coluna para ordenar)")
+            percentual = st.column_config.NumberColumn(format="%.1f%%")
+            st.dataframe(
+                importacao['tabela'],
+                hide_index=True,
+                column_config={coluna: percentual for coluna in importacao['tabela']
+                               if coluna not in ('Projeto', 'Status', 'Respondidas')}
+            )
+        elif not importacao['total_erros']:
+            st.info("A planilha não tem avaliações preenchidas.")
 
-    st.markdown('<hr class="custom-divider">', unsafe_allow_html=True)
 
-    st.markdown("""
-    <div class="question-section">
-        <h3 style="color: #006837; margin-bottom: 1rem;">
-            📊 ESTIMATIVAS E GESTÃO DE RISCOS
-            <span style="background: #006837; color: white; padding: 0.2rem 0.5rem; 
-                  border-radius: 15px; font-size: 0.8rem; margin-left: 0.5rem;">PESO 10%</span>
-        </h3>
+def renderizar_fase(fase):
+    # Header da aba com informações
+    st.markdown(f"""
+    <div class="cabecalho-pagina">
+        <h2>{fase['titulo']}</h2>
+        <p>
+            <strong>Objetivo:</strong> {fase['objetivo']}
+        </p>
     </div>
     """, unsafe_allow_html=True)
 
-    col5, col6, col7 = st.columns([1, 1, 1])
-
-    with col5:
-        q51_f2 = st.selectbox(
-            '**5.1** Estimativas de custo foram refinadas com melhor precisão?',
-            ('Excelente', 'Bom', 'Regular', 'Inadequado', 'Não iniciado'),
-            index=None,
-            key='felkla2_q51',
-            help="Avalie a precisão das estimativas refinadas"
-        )
-
-        q52_f2 = st.selectbox(
-            '**5.2** Cronograma detalhado foi desenvolvido?',
-            ('Excelente', 'Bom', 'Regular', 'Inadequado', 'Não iniciado'),
-            index=None,
-            key='felkla2_q52',
-            help="Verifique se o cronograma está detalhado"
-        )
+    renderizar_importacao(fase)
+    # Modo de resposta; o padrão pode vir da URL (?modo=grade ou ?modo=formulario)
+    modo_url = st.query_params.get('modo')
+    modo = st.radio(
+        "Modo de resposta",
+        list(MODOS_RESPOSTA),
+        index=list(MODOS_RESPOSTA).index(modo_url) if modo_url in MODOS_RESPOSTA else 0,
+        format_func=MODOS_RESPOSTA.get,
+        key=f"modo_{fase['id']}",
+        horizontal=True,
+        help="**Seletores:** cada resposta atualiza o progresso na hora. **Grade:** uma tabela editável; "
+             "várias células editadas, coladas de uma planilha ou digitadas geram um só rerun. "
+             "**Formulário:** as respostas ficam no navegador e são enviadas de uma vez."
+    )
 
-    with col6:
-        q53_f2 = st.selectbox(
-            '**5.3** Análise de riscos foi aprofundada com planos de mitigação?',
-            ('Excelente', 'Bom', 'Regular', 'Inadequado', 'Não iniciado'),
-            index=None,
-            key='felkla2_q53',
-            help="Avalie a profundidade da análise de riscos"
-        )
-
-        q54_f2 = st.selectbox(
-            '**5.4** Análise de sensibilidade econômica foi atualizada?',
-            ('Excelente', 'Bom', 'Regular', 'Inadequado', 'Não iniciado'),
-            index=None,
-            key='felkla2_q54',
-            help="Verifique se a análise de sensibilidade foi atualizada"
-        )
+    # Indicador de progresso
+    st.markdown("### 📊 Progresso do Questionário")
+    # Placeholders atualizados pelos fragmentos das dimensões sem rerun da página
+    marcadores = {'progresso': st.empty(), 'previa': st.empty()}
 
-    with col7:
-        q55_f2 = st.selectbox(
-            '**5.5** Métricas de controle do projeto foram definidas?',
-            ('Excelente', 'Bom', 'Regular', 'Inadequado', 'Não iniciado'),
-            index=None,
-            key='felkla2_q55',
-            help="Avalie se métricas de controle estão definidas"
-        )
+    if modo == 'grade':
+        renderizar_grade(fase, marcadores)
+    elif modo == 'formulario':
+        renderizar_formulario(fase)
+    else:
+        renderizar_questionario(fase, marcadores)
 
     # Atualizar progresso
-    preenchidas_2, total_2 = contar_respostas_aba2()
-    progress_percentage_2 = preenchidas_2 / total_2
-
-    with progress_placeholder_2:
-        st.progress(progress_percentage_2,
-                    text=f"Progresso: {preenchidas_2}/{total_2} questões respondidas ({progress_percentage_2:.1%})")
-
-        if preenchidas_2 < total_2:
-            st.info(f"💡 **Dica:** Responda todas as {total_2} questões para obter uma avaliação completa!")
+    preenchidas, total = contar_respostas(fase)
+    marcadores['situacao'] = situacao_preenchimento(preenchidas, total)
+    renderizar_progresso(marcadores['progresso'], preenchidas, total)
+    renderizar_previa(marcadores['previa'], fase)
 
     st.markdown('<hr class="custom-divider">', unsafe_allow_html=True)
-    # Seção de resultados melhorada FELKLA-2
-    st.markdown("""
-        <div style="background: linear-gradient(135deg, #f0f8f0 0%, #ffffff 100%); 
-                    padding: 1.5rem; border-radius: 10px; margin: 2rem 0; 
-                    border-left: 5px solid #006837;">
-            <h2 style="color: #006837; margin: 0;">📊 RESULTADO FELKLA-2</h2>
-            <p style="color: #2d5016; margin: 0.5rem 0 0 0; font-size: 1.1rem;">
-                Análise da seleção e desenvolvimento de alternativas técnicas
+    # Seção de resultados melhorada
+    st.markdown(f"""
+        <div class="cabecalho-pagina resultado">
+            <h2>📊 RESULTADO {fase['nome']}</h2>
+            <p>
+                {fase['resultado']['subtitulo']}
             </p>
         </div>
         """, unsafe_allow_html=True)
 
-    # Verificar se todas as questões foram respondidas
-    todas_respostas_f2 = [q11_f2, q12_f2, q13_f2, q14_f2, q15_f2, q21_f2, q22_f2, q23_f2, q24_f2, q25_f2,
-                          q31_f2, q32_f2, q33_f2, q34_f2, q35_f2, q41_f2, q42_f2, q43_f2, q44_f2, q45_f2,
-                          q51_f2, q52_f2, q53_f2, q54_f2, q55_f2]
-
-    respostas_preenchidas_f2 = [r for r in todas_respostas_f2 if r is not None]
+    projeto = sessao.projeto
+    ultima = armazenamento.ultima(projeto, fase['id']) if projeto else None
+    if ultima:
+        salva_em = datetime.fromtimestamp(ultima['criado_em']).strftime('%d/%m/%Y %H:%M')
+        carregada = "" if sessao.editada(fase['id']) else " — respostas carregadas no questionário"
+        st.caption(f"💾 Última avaliação salva de **{projeto}**: {ultima['score_final']:.1f}% "
+                   f"({ultima['respondidas']}/{total} questões) em {salva_em}{carregada}")
 
     # Inicializar variáveis
-    calcular_resultado_f2 = False
+    calcular_resultado = False
 
-    if len(respostas_preenchidas_f2) == 0:
-        st.info("🔍 **Responda as questões acima para gerar o resultado da avaliação FELKLA-2**")
+    if marcadores['situacao'] == 'vazio':
+        st.info(f"🔍 **Responda as questões acima para gerar o resultado da avaliação {fase['nome']}**")
 
-    elif len(respostas_preenchidas_f2) < len(todas_respostas_f2):
+    elif marcadores['situacao'] == 'parcial':
         col_aviso1, col_aviso2 = st.columns([2, 1])
         with col_aviso1:
-            st.warning(
-                f"⚠️ **Atenção:** {len(todas_respostas_f2) - len(respostas_preenchidas_f2)} questões ainda não foram respondidas. Para uma avaliação completa, responda todas as questões.")
+            marcadores['aviso'] = st.empty()
+            renderizar_aviso(marcadores['aviso'], preenchidas, total)
         with col_aviso2:
-            calcular_resultado_f2 = st.button("📊 Calcular Resultado Parcial FELKLA-2", type="secondary")
+            calcular_resultado = st.button(f"📊 Calcular Resultado Parcial {fase['nome']}", type="secondary",
+                                           key=f"calcular_parcial_{fase['id']}")
 
     else:
         # Todas as questões respondidas
-        calcular_resultado_f2 = st.button("🚀 Calcular Resultado Completo FELKLA-2", type="primary")
-
-    if calcular_resultado_f2:
-        # Cálculos dos scores FELKLA-2
-        # Desenvolvimento Técnico (30%)
-        dev_tec = [q11_f2, q12_f2, q13_f2, q14_f2, q15_f2]
-        pontos_dev = sum([calcular_pontuacao(resp) for resp in dev_tec if resp is not None])
-        max_pontos_dev = len([resp for resp in dev_tec if resp is not None]) * 5
-        score_dev = (pontos_dev / max_pontos_dev * 100) if max_pontos_dev > 0 else 0
-
-        # Seleção de Soluções (25%)
-        sel_sol = [q21_f2, q22_f2, q23_f2, q24_f2, q25_f2]
-        pontos_sel = sum([calcular_pontuacao(resp) for resp in sel_sol if resp is not None])
-        max_pontos_sel = len([resp for resp in sel_sol if resp is not None]) * 5
-        score_sel = (pontos_sel / max_pontos_sel * 100) if max_pontos_sel > 0 else 0
-
-        # Planejamento e Layout (20%)
-        plan_lay = [q31_f2, q32_f2, q33_f2, q34_f2, q35_f2]
-        pontos_plan = sum([calcular_pontuacao(resp) for resp in plan_lay if resp is not None])
-        max_pontos_plan = len([resp for resp in plan_lay if resp is not None]) * 5
-        score_plan = (pontos_plan / max_pontos_plan * 100) if max_pontos_plan > 0 else 0
-
-        # Aspectos Ambientais e Sociais (15%)
-        asp_amb_soc = [q41_f2, q42_f2, q43_f2, q44_f2, q45_f2]
-        pontos_amb_soc = sum([calcular_pontuacao(resp) for resp in asp_amb_soc if resp is not None])
-        max_pontos_amb_soc = len([resp for resp in asp_amb_soc if resp is not None]) * 5
-        score_amb_soc = (pontos_amb_soc / max_pontos_amb_soc * 100) if max_pontos_amb_soc > 0 else 0
-
-        # Estimativas e Gestão de Riscos (10%)
-        est_risco = [q51_f2, q52_f2, q53_f2, q54_f2, q55_f2]
-        pontos_est = sum([calcular_pontuacao(resp) for resp in est_risco if resp is not None])
-        max_pontos_est = len([resp for resp in est_risco if resp is not None]) * 5
-        score_est = (pontos_est / max_pontos_est * 100) if max_pontos_est > 0 else 0
-
-        # Score Final Ponderado
-        score_final_f2 = (score_dev * 0.30 + score_sel * 0.25 + score_plan * 0.20 +
-                          score_amb_soc * 0.15 + score_est * 0.10)
-
-        # Dashboard de resultados
-        st.markdown("### 📈 Dashboard de Resultados FELKLA-2")
-
-        # Métricas principais em cards
-        col_m1, col_m2, col_m3, col_m4, col_m5 = st.columns(5)
-
-        with col_m1:
-            delta_dev = "🎯" if score_dev >= 80 else "⚠️" if score_dev >= 60 else "❌"
-            st.metric(
-                "Desenvolvimento Técnico",
-                f"{score_dev:.1f}%",
-                delta=f"Peso: 30% {delta_dev}"
-            )
-
-        with col_m2:
-            delta_sel = "🎯" if score_sel >= 80 else "⚠️" if score_sel >= 60 else "❌"
-            st.metric(
-                "Seleção de Soluções",
-                f"{score_sel:.1f}%",
-                delta=f"Peso: 25% {delta_sel}"
-            )
-
-        with col_m3:
-            delta_plan = "🎯" if score_plan >= 80 else "⚠️" if score_plan >= 60 else "❌"
-            st.metric(
-                "Planejamento e Layout",
-                f"{score_plan:.1f}%",
-                delta=f"Peso: 20% {delta_plan}"
-            )
-
-        with col_m4:
-            delta_amb_soc = "🎯" if score_amb_soc >= 80 else "⚠️" if score_amb_soc >= 60 else "❌"
-            st.metric(
-                "Aspectos Ambientais/Sociais",
-                f"{score_amb_soc:.1f}%",
-                delta=f"Peso: 15% {delta_amb_soc}"
-            )
-
-        with col_m5:
-            delta_est = "🎯" if score_est >= 80 else "⚠️" if score_est >= 60 else "❌"
-            st.metric(
-                "Estimativas e Riscos",
-                f"{score_est:.1f}%",
-                delta=f"Peso: 10% {delta_est}"
-            )
-
-        st.markdown('<hr class="custom-divider">', unsafe_allow_html=True)
-
-        # Score final destacado
-        col_score, col_interpretation = st.columns([1, 2])
-
-        with col_score:
-            if score_final_f2 >= 80:
-                st.markdown(f"""
-                    <div style="background: linear-gradient(135deg, #d4edda 0%, #c3e6cb 100%); 
-                                padding: 2rem; border-radius: 15px; text-align: center; 
-                                border: 3px solid #006837; box-shadow: 0 4px 8px rgba(0,0,0,0.1);">
-                        <h1 style="color: #006837; margin: 0; font-size: 3rem;">{score_final_f2:.1f}%</h1>
-                        <h3 style="color: #155724; margin: 0.5rem 0;">✅ APROVADO</h3>
-                        <p style="color: #155724; margin: 0;">Projeto pronto para FELKLA-3</p>
-                    </div>
-                    """, unsafe_allow_html=True)
-            elif score_final_f2 >= 60:
-                st.markdown(f"""
-                    <div style="background: linear-gradient(135deg, #fff3cd 0%, #ffeaa7 100%); 
-                                padding: 2rem; border-radius: 15px; text-align: center; 
-                                border: 3px solid #ffc107; box-shadow: 0 4px 8px rgba(0,0,0,0.1);">
-                        <h1 style="color: #856404; margin: 0; font-size: 3rem;">{score_final_f2:.1f}%</h1>
-                        <h3 style="color: #856404; margin: 0.5rem 0;">⚠️ ATENÇÃO</h3>
-                        <p style="color: #856404; margin: 0;">Projeto necessita melhorias</p>
-                    </div>
-                    """, unsafe_allow_html=True)
-            else:
-                st.markdown(f"""
-                    <div style="background: linear-gradient(135deg, #f8d7da 0%, #f5c6cb 100%); 
-                                padding: 2rem; border-radius: 15px; text-align: center; 
-                                border: 3px solid #dc3545; box-shadow: 0 4px 8px rgba(0,0,0,0.1);">
-                        <h1 style="color: #721c24; margin: 0; font-size: 3rem;">{score_final_f2:.1f}%</h1>
-                        <h3 style="color: #721c24; margin: 0.5rem 0;">❌ NÃO APROVADO</h3>
-                        <p style="color: #721c24; margin: 0;">Projeto não recomendado</p>
-                    </div>
-                    """, unsafe_allow_html=True)
-
-        with col_interpretation:
-            st.markdown("#### 🎯 Interpretação dos Resultados")
-
-            if score_final_f2 >= 80:
-                st.success("""
-                    **Excelente! Projeto aprovado para FELKLA-3**
-
-                    ✅ **Recomendações:**
-                    - Prosseguir para fase de definição do projeto
-                    - Manter qualidade dos estudos técnicos
-                    - Finalizar seleção de fornecedores
-                    """)
-            elif score_final_f2 >= 60:
-                st.warning("""
-                    **Projeto viável com melhorias necessárias**
-
-                    ⚠️ **Ações recomendadas:**
-                    - Aprofundar desenvolvimento técnico
-                    - Revisar critérios de seleção
-                    - Melhorar planejamento de layout
-                    """)
-            else:
-                st.error("""
-                    **Projeto não recomendado para próxima fase**
-
-                    ❌ **Ações necessárias:**
-                    - Revisar alternativas técnicas
-                    - Reavaliar viabilidade das soluções
-                    - Considerar retorno ao FELKLA-1
-                    """)
-
-        # Análise detalhada por dimensão
-        st.markdown("#### 📊 Análise Detalhada por Dimensão")
-
-        # Identificar pontos fortes e fracos
-        scores_f2 = {
-            "Desenvolvimento Técnico": score_dev,
-            "Seleção de Soluções": score_sel,
-            "Planejamento e Layout": score_plan,
-            "Aspectos Ambientais/Sociais": score_amb_soc,
-            "Estimativas e Riscos": score_est
-        }
+        calcular_resultado = st.button(f"🚀 Calcular Resultado Completo {fase['nome']}", type="primary",
+                                       key=f"calcular_{fase['id']}")
 
-        pontos_fortes_f2 = [k for k, v in scores_f2.items() if v >= 80]
-        pontos_atenção_f2 = [k for k, v in scores_f2.items() if 60 <= v < 80]
-        pontos_críticos_f2 = [k for k, v in scores_f2.items() if v < 60]
+    marcadores['renderizada'] = True
 
-        col_analise1, col_analise2, col_analise3 = st.columns(3)
-
-        with col_analise1:
-            if pontos_fortes_f2:
-                st.markdown("**🟢 Pontos Fortes**")
-                for ponto in pontos_fortes_f2:
-                    st.markdown(f"✅ {ponto}")
-            else:
-                st.markdown("**🟢 Pontos Fortes**")
-                st.markdown("_Nenhum identificado_")
-
-        with col_analise2:
-            if pontos_atenção_f2:
-                st.markdown("**🟡 Necessita Atenção**")
-                for ponto in pontos_atenção_f2:
-                    st.markdown(f"⚠️ {ponto}")
-            else:
-                st.markdown("**🟡 Necessita Atenção**")
-                st.markdown("_Nenhum identificado_")
-
-        with col_analise3:
-            if pontos_críticos_f2:
-                st.markdown("**🔴 Pontos Críticos**")
-                for ponto in pontos_críticos_f2:
-                    st.markdown(f"❌ {ponto}")
+    # O resultado calculado continua visível nos reruns seguintes enquanto as
+    # respostas forem as mesmas com que foi calculado
+    respostas = sessao.empacotadas(fase['id'])
+    chave_resultado = f"resultado_{fase['id']}"
+    if calcular_resultado:
+        st.session_state[chave_resultado] = respostas
+
+    if marcadores['situacao'] != 'vazio' and st.session_state.get(chave_resultado) == respostas:
+        marcadores['resultado'] = True
+        with perfil.secao(f"{fase['id']}/resultado"):
+            montado = montar_resultado(fase['id'], respostas)
+            renderizar_resultado(fase, montado, respostas, projeto, recem_calculado=calcular_resultado)
+        renderizar_exportacao(fase, respostas, projeto)
+
+        if calcular_resultado and projeto:
+            # Apenas enfileira: a gravação em disco é feita em segundo plano
+            try:
+                sessao.salvar(armazenamento, fase['id'], montado['resultado'])
+            except FilaCheia:
+                st.warning("⏳ Muitas avaliações aguardando gravação. A avaliação não foi salva; "
+                           "calcule o resultado novamente em alguns instantes.")
             else:
-                st.markdown("**🔴 Pontos Críticos**")
-                st.markdown("_Nenhum identificado_")
-
-        # Comparação com FELKLA-1 (se disponível)
-        st.markdown("#### 📈 Evolução do Projeto")
-
-        # Aqui você pode adicionar uma comparação se tiver os dados do FELKLA-1
-        st.info("""
-            💡 **Dica:** Compare os resultados com a avaliação FELKLA-1 para verificar a evolução do projeto.
-
-            **Principais focos desta fase:**
-            - Desenvolvimento técnico detalhado
-            - Seleção definitiva de soluções
-            - Planejamento de implementação
-            """)
-
-        # Próximos passos
-        st.markdown("#### 🚀 Próximos Passos Recomendados")
-
-        if score_final_f2 >= 80:
-            st.info("""
-                1. **Finalizar especificações técnicas** detalhadas
-                2. **Preparar documentação** para FELKLA-3
-                3. **Confirmar contratos** com fornecedores selecionados
-                4. **Iniciar estudos** de engenharia de detalhe
-                """)
-        elif score_final_f2 >= 60:
-            st.warning("""
-                1. **Aprofundar desenvolvimento** nas áreas críticas
-                2. **Revisar critérios** de seleção de soluções
-                3. **Melhorar integração** com operações existentes
-                4. **Reavaliar** após implementação das melhorias
-                """)
-        else:
-            st.error("""
-                1. **Revisar alternativas** técnicas propostas
-                2. **Reavaliar viabilidade** das soluções selecionadas
-                3. **Considerar retorno** ao FELKLA-1 para revisão
-                4. **Buscar suporte técnico** especializado
-                """)
-
-        # Resumo executivo
-        st.markdown("#### 📋 Resumo Executivo")
-
-        resumo_color = "#d4edda" if score_final_f2 >= 80 else "#fff3cd" if score_final_f2 >= 60 else "#f8d7da"
-        resumo_border = "#006837" if score_final_f2 >= 80 else "#ffc107" if score_final_f2 >= 60 else "#dc3545"
-
-        st.markdown(f"""
-            <div style="background: {resumo_color}; padding: 1.5rem; border-radius: 10px; 
-                        border-left: 4px solid {resumo_border}; margin: 1rem 0;">
-                <h4 style="margin-top: 0;">📊 Score Final: {score_final_f2:.1f}%</h4>
-                <p><strong>Melhor dimensão:</strong> {max(scores_f2, key=scores_f2.get)} ({max(scores_f2.values()):.1f}%)</p>
-                <p><strong>Dimensão crítica:</strong> {min(scores_f2, key=scores_f2.get)} ({min(scores_f2.values()):.1f}%)</p>
-                <p><strong>Questões respondidas:</strong> {len(respostas_preenchidas_f2)}/{len(todas_respostas_f2)}</p>
-            </div>
-            """, unsafe_allow_html=True)
-
-with aba3:
-    # Header da aba com informações
-    st.markdown("""
-    <div style="background: linear-gradient(135deg, #f0f8f0 0%, #ffffff 100%); 
-                padding: 1.5rem; border-radius: 10px; margin-bottom: 2rem; 
-                border-left: 5px solid #006837;">
-        <h2 style="color: #006837; margin: 0;">✅ QUESTIONÁRIO FELKLA-3</h2>
-        <p style="color: #2d5016; margin: 0.5rem 0 0 0; font-size: 1.1rem;">
-            <strong>Objetivo:</strong> Definição final e preparação para execução do projeto
-        </p>
-    </div>
-    """, unsafe_allow_html=True)
-
-    # Indicador de progresso
-    st.markdown("### 📊 Progresso do Questionário")
-    progress_placeholder_3 = st.empty()
-
-
-    # Função para contar respostas preenchidas FELKLA-3
-    def contar_respostas_aba3():
-        respostas = [q11_f3, q12_f3, q13_f3, q14_f3, q15_f3, q21_f3, q22_f3, q23_f3, q24_f3, q25_f3,
-                     q31_f3, q32_f3, q33_f3, q34_f3, q35_f3, q41_f3, q42_f3, q43_f3, q44_f3, q45_f3,
-                     q51_f3, q52_f3, q53_f3, q54_f3, q55_f3]
-        preenchidas = len([r for r in respostas if r is not None])
-        return preenchidas, len(respostas)
-
-
-    col1, col2 = st.columns([1, 1])
-
-    with col1:
-        st.markdown("""
-        <div class="question-section">
-            <h3 style="color: #006837; margin-bottom: 1rem;">
-                🔧 ENGENHARIA E ESPECIFICAÇÕES
-                <span style="background: #006837; color: white; padding: 0.2rem 0.5rem; 
-                      border-radius: 15px; font-size: 0.8rem; margin-left: 0.5rem;">PESO 35%</span>
-            </h3>
-        </div>
-        """, unsafe_allow_html=True)
-
-        q11_f3 = st.selectbox(
-            '**1.1** Engenharia de detalhe foi completada conforme escopo?',
-            ('Excelente', 'Bom', 'Regular', 'Inadequado', 'Não iniciado'),
-            index=None,
-            key='felkla3_q11',
-            help="Avalie se a engenharia de detalhe está completa e adequada"
-        )
+                sessao.checkpoint(armazenamento)
+                st.toast(f"💾 Avaliação {fase['nome']} salva para o projeto {projeto}")
 
-        q12_f3 = st.selectbox(
-            '**1.2** Especificações técnicas finais foram aprovadas?',
-            ('Excelente', 'Bom', 'Regular', 'Inadequado', 'Não iniciado'),
-            index=None,
-            key='felkla3_q12',
-            help="Verifique se as especificações técnicas estão aprovadas"
-        )
-
-        q13_f3 = st.selectbox(
-            '**1.3** Documentação técnica está completa e validada?',
-            ('Excelente', 'Bom', 'Regular', 'Inadequado', 'Não iniciado'),
-            index=None,
-            key='felkla3_q13',
-            help="Avalie a completude e validação da documentação técnica"
-        )
-
-        q14_f3 = st.selectbox(
-            '**1.4** Interfaces técnicas foram totalmente definidas?',
-            ('Excelente', 'Bom', 'Regular', 'Inadequado', 'Não iniciado'),
-            index=None,
-            key='felkla3_q14',
-            help="Verifique se todas as interfaces técnicas estão definidas"
-        )
-
-        q15_f3 = st.selectbox(
-            '**1.5** Testes e validações necessários foram planejados?',
-            ('Excelente', 'Bom', 'Regular', 'Inadequado', 'Não iniciado'),
-            index=None,
-            key='felkla3_q15',
-            help="Avalie o planejamento de testes e validações"
-        )
-
-    with col2:
-        st.markdown("""
-        <div class="question-section">
-            <h3 style="color: #006837; margin-bottom: 1rem;">
-                🤝 CONTRATAÇÃO E SUPRIMENTOS
-                <span style="background: #006837; color: white; padding: 0.2rem 0.5rem; 
-                      border-radius: 15px; font-size: 0.8rem; margin-left: 0.5rem;">PESO 25%</span>
-            </h3>
-        </div>
-        """, unsafe_allow_html=True)
-
-        q21_f3 = st.selectbox(
-            '**2.1** Estratégia de contratação foi definida e aprovada?',
-            ('Excelente', 'Bom', 'Regular', 'Inadequado', 'Não iniciado'),
-            index=None,
-            key='felkla3_q21',
-            help="Verifique se a estratégia de contratação está definida"
-        )
-
-        q22_f3 = st.selectbox(
-            '**2.2** Principais contratos foram negociados ou estão em fase final?',
-            ('Excelente', 'Bom', 'Regular', 'Inadequado', 'Não iniciado'),
-            index=None,
-            key='felkla3_q22',
-            help="Avalie o status das negociações contratuais"
-        )
-
-        q23_f3 = st.selectbox(
-            '**2.3** Fornecedores críticos foram selecionados e qualificados?',
-            ('Excelente', 'Bom', 'Regular', 'Inadequado', 'Não iniciado'),
-            index=None,
-            key='felkla3_q23',
-            help="Verifique a seleção e qualificação de fornecedores críticos"
-        )
-
-        q24_f3 = st.selectbox(
-            '**2.4** Plano de suprimentos foi elaborado?',
-            ('Excelente', 'Bom', 'Regular', 'Inadequado', 'Não iniciado'),
-            index=None,
-            key='felkla3_q24',
-            help="Avalie se o plano de suprimentos está elaborado"
-        )
-
-        q25_f3 = st.selectbox(
-            '**2.5** Garantias e seguros foram definidos?',
-            ('Excelente', 'Bom', 'Regular', 'Inadequado', 'Não iniciado'),
-            index=None,
-            key='felkla3_q25',
-            help="Verifique se garantias e seguros estão definidos"
-        )
-
-    # Divisor visual personalizado
-    st.markdown('<hr class="custom-divider">', unsafe_allow_html=True)
-
-    col3, col4 = st.columns([1, 1])
-
-    with col3:
-        st.markdown("""
-        <div class="question-section">
-            <h3 style="color: #006837; margin-bottom: 1rem;">
-                📋 LICENCIAMENTO E CONFORMIDADE
-                <span style="background: #006837; color: white; padding: 0.2rem 0.5rem; 
-                      border-radius: 15px; font-size: 0.8rem; margin-left: 0.5rem;">PESO 20%</span>
-            </h3>
-        </div>
-        """, unsafe_allow_html=True)
-
-        q31_f3 = st.selectbox(
-            '**3.1** Todas as licenças necessárias foram obtidas ou estão em processo final?',
-            ('Excelente', 'Bom', 'Regular', 'Inadequado', 'Não iniciado'),
-            index=None,
-            key='felkla3_q31',
-            help="Avalie o status das licenças necessárias"
-        )
-
-        q32_f3 = st.selectbox(
-            '**3.2** Conformidade regulatória foi verificada e documentada?',
-            ('Excelente', 'Bom', 'Regular', 'Inadequado', 'Não iniciado'),
-            index=None,
-            key='felkla3_q32',
-            help="Verifique se a conformidade regulatória está documentada"
-        )
 
-        q33_f3 = st.selectbox(
-            '**3.3** Certificações requeridas foram obtidas ou planejadas?',
-            ('Excelente', 'Bom', 'Regular', 'Inadequado', 'Não iniciado'),
-            index=None,
-            key='felkla3_q33',
-            help="Avalie o status das certificações necessárias"
-        )
+def renderizar_metodologia():
+    st.markdown(textos.METODOLOGIA_CABECALHO, unsafe_allow_html=True)
 
-        q34_f3 = st.selectbox(
-            '**3.4** Aprovações internas necessárias foram obtidas?',
-            ('Excelente', 'Bom', 'Regular', 'Inadequado', 'Não iniciado'),
-            index=None,
-            key='felkla3_q34',
-            help="Verifique se aprovações internas foram obtidas"
-        )
-
-        q35_f3 = st.selectbox(
-            '**3.5** Condicionantes legais foram atendidas?',
-            ('Excelente', 'Bom', 'Regular', 'Inadequado', 'Não iniciado'),
-            index=None,
-            key='felkla3_q35',
-            help="Avalie se condicionantes legais foram atendidas"
-        )
+    # Introdução
+    st.markdown(textos.METODOLOGIA_INTRODUCAO)
 
-    with col4:
-        st.markdown("""
-        <div class="question-section">
-            <h3 style="color: #006837; margin-bottom: 1rem;">
-                🚀 PLANOS DE EXECUÇÃO
-                <span style="background: #006837; color: white; padding: 0.2rem 0.5rem; 
-                      border-radius: 15px; font-size: 0.8rem; margin-left: 0.5rem;">PESO 15%</span>
-            </h3>
-        </div>
-        """, unsafe_allow_html=True)
+    # FELKLA-1, FELKLA-2 e FELKLA-3
+    for cartao, detalhes in textos.METODOLOGIA_FASES:
+        st.markdown("---")
 
-        q41_f3 = st.selectbox(
-            '**4.1** Plano de execução detalhado foi elaborado e aprovado?',
-            ('Excelente', 'Bom', 'Regular', 'Inadequado', 'Não iniciado'),
-            index=None,
-            key='felkla3_q41',
-            help="Verifique se o plano de execução está detalhado e aprovado"
-        )
+        col1, col2 = st.columns([1, 2])
+        with col1:
+            st.markdown(cartao, unsafe_allow_html=True)
+        with col2:
+            st.markdown(detalhes)
 
-        q42_f3 = st.selectbox(
-            '**4.2** Cronograma executivo está finalizado com recursos alocados?',
-            ('Excelente', 'Bom', 'Regular', 'Inadequado', 'Não iniciado'),
-            index=None,
-            key='felkla3_q42',
-            help="Avalie se o cronograma executivo está finalizado"
-        )
+    st.markdown("---")
 
-        q43_f3 = st.selectbox(
-            '**4.3** Planos de qualidade, segurança e meio ambiente foram desenvolvidos?',
-            ('Excelente', 'Bom', 'Regular', 'Inadequado', 'Não iniciado'),
-            index=None,
-            key='felkla3_q43',
-            help="Verifique se planos de QSMS foram desenvolvidos"
-        )
+    # Fluxo da metodologia
+    st.markdown("### 🔄 Fluxo da Metodologia FELKLA")
+    st.markdown(textos.FLUXO, unsafe_allow_html=True)
 
-        q44_f3 = st.selectbox(
-            '**4.4** Estratégia de comissionamento/start-up foi definida?',
-            ('Excelente', 'Bom', 'Regular', 'Inadequado', 'Não iniciado'),
-            index=None,
-            key='felkla3_q44',
-            help="Avalie se a estratégia de comissionamento está definida"
-        )
+    # Critérios de aprovação
+    st.markdown("### ✅ Critérios de Aprovação por Fase")
+    for coluna, criterios in zip(st.columns(3), textos.CRITERIOS_APROVACAO):
+        with coluna:
+            st.markdown(criterios)
 
-        q45_f3 = st.selectbox(
-            '**4.5** Plano de gestão de mudanças foi elaborado?',
-            ('Excelente', 'Bom', 'Regular', 'Inadequado', 'Não iniciado'),
-            index=None,
-            key='felkla3_q45',
-            help="Verifique se o plano de gestão de mudanças existe"
-        )
+    # Nota importante
+    st.info(textos.NOTA_METODOLOGIA)
 
-    st.markdown('<hr class="custom-divider">', unsafe_allow_html=True)
 
+def renderizar_portfolio():
     st.markdown("""
-    <div class="question-section">
-        <h3 style="color: #006837; margin-bottom: 1rem;">
-            ⚙️ CONTROLES E RISCOS
-            <span style="background: #006837; color: white; padding: 0.2rem 0.5rem; 
-                  border-radius: 15px; font-size: 0.8rem; margin-left: 0.5rem;">PESO 5%</span>
-        </h3>
+    <div class="cabecalho-pagina">
+        <h2>📈 PORTFÓLIO DE PROJETOS</h2>
+        <p>
+            Última avaliação salva de cada projeto em cada fase FELKLA
+        </p>
     </div>
     """, unsafe_allow_html=True)
 
-    col5, col6, col7 = st.columns([1, 1, 1])
-
-    with col5:
-        q51_f3 = st.selectbox(
-            '**5.1** Sistema de controle do projeto foi estabelecido?',
-            ('Excelente', 'Bom', 'Regular', 'Inadequado', 'Não iniciado'),
-            index=None,
-            key='felkla3_q51',
-            help="Avalie se o sistema de controle está estabelecido"
-        )
-
-        q52_f3 = st.selectbox(
-            '**5.2** Planos de contingência para riscos críticos foram finalizados?',
-            ('Excelente', 'Bom', 'Regular', 'Inadequado', 'Não iniciado'),
-            index=None,
-            key='felkla3_q52',
-            help="Verifique se planos de contingência estão finalizados"
-        )
-
-    with col6:
-        q53_f3 = st.selectbox(
-            '**5.3** Estrutura de governança do projeto foi definida?',
-            ('Excelente', 'Bom', 'Regular', 'Inadequado', 'Não iniciado'),
-            index=None,
-            key='felkla3_q53',
-            help="Avalie se a estrutura de governança está definida"
-        )
-
-        q54_f3 = st.selectbox(
-            '**5.4** Critérios de aceitação foram estabelecidos?',
-            ('Excelente', 'Bom', 'Regular', 'Inadequado', 'Não iniciado'),
-            index=None,
-            key='felkla3_q54',
-            help="Verifique se critérios de aceitação estão estabelecidos"
-        )
-
-    with col7:
-        q55_f3 = st.selectbox(
-            '**5.5** Plano de encerramento do projeto foi elaborado?',
-            ('Excelente', 'Bom', 'Regular', 'Inadequado', 'Não iniciado'),
-            index=None,
-            key='felkla3_q55',
-            help="Avalie se o plano de encerramento foi elaborado"
-        )
-
-    # Atualizar progresso
-    preenchidas_3, total_3 = contar_respostas_aba3()
-    progress_percentage_3 = preenchidas_3 / total_3
-
-    with progress_placeholder_3:
-        st.progress(progress_percentage_3,
-                    text=f"Progresso: {preenchidas_3}/{total_3} questões respondidas ({progress_percentage_3:.1%})")
-
-        if preenchidas_3 < total_3:
-            st.info(f"💡 **Dica:** Responda todas as {total_3} questões para obter uma avaliação completa!")
-
-    st.markdown('<hr class="custom-divider">', unsafe_allow_html=True)
-    # Seção de resultados melhorada FELKLA-3
-    st.markdown("""
-        <div style="background: linear-gradient(135deg, #f0f8f0 0%, #ffffff 100%); 
-                    padding: 1.5rem; border-radius: 10px; margin: 2rem 0; 
-                    border-left: 5px solid #006837;">
-            <h2 style="color: #006837; margin: 0;">📊 RESULTADO FELKLA-3</h2>
-            <p style="color: #2d5016; margin: 0.5rem 0 0 0; font-size: 1.1rem;">
-                Análise final de prontidão para execução do projeto
-            </p>
-        </div>
-        """, unsafe_allow_html=True)
-
-    # Verificar se todas as questões foram respondidas
-    todas_respostas_f3 = [q11_f3, q12_f3, q13_f3, q14_f3, q15_f3, q21_f3, q22_f3, q23_f3, q24_f3, q25_f3,
-                          q31_f3, q32_f3, q33_f3, q34_f3, q35_f3, q41_f3, q42_f3, q43_f3, q44_f3, q45_f3,
-                          q51_f3, q52_f3, q53_f3, q54_f3, q55_f3]
-
-    respostas_preenchidas_f3 = [r for r in todas_respostas_f3 if r is not None]
-
-    # Inicializar variáveis
-    calcular_resultado_f3 = False
-
-    if len(respostas_preenchidas_f3) == 0:
-        st.info("🔍 **Responda as questões acima para gerar o resultado da avaliação FELKLA-3**")
-
-    elif len(respostas_preenchidas_f3) < len(todas_respostas_f3):
-        col_aviso1, col_aviso2 = st.columns([2, 1])
-        with col_aviso1:
-            st.warning(
-                f"⚠️ **Atenção:** {len(todas_respostas_f3) - len(respostas_preenchidas_f3)} questões ainda não foram respondidas. Para uma avaliação completa, responda todas as questões.")
-        with col_aviso2:
-            calcular_resultado_f3 = st.button("📊 Calcular Resultado Parcial FELKLA-3", type="secondary")
-
-    else:
-        # Todas as questões respondidas
-        calcular_resultado_f3 = st.button("🚀 Calcular Resultado Completo FELKLA-3", type="primary")
-
-    if calcular_resultado_f3:
-        # Cálculos dos scores FELKLA-3
-        # Engenharia e Especificações (35%)
-        eng_esp = [q11_f3, q12_f3, q13_f3, q14_f3, q15_f3]
-        pontos_eng = sum([calcular_pontuacao(resp) for resp in eng_esp if resp is not None])
-        max_pontos_eng = len([resp for resp in eng_esp if resp is not None]) * 5
-        score_eng = (pontos_eng / max_pontos_eng * 100) if max_pontos_eng > 0 else 0
-
-        # Contratação e Suprimentos (25%)
-        cont_sup = [q21_f3, q22_f3, q23_f3, q24_f3, q25_f3]
-        pontos_cont = sum([calcular_pontuacao(resp) for resp in cont_sup if resp is not None])
-        max_pontos_cont = len([resp for resp in cont_sup if resp is not None]) * 5
-        score_cont = (pontos_cont / max_pontos_cont * 100) if max_pontos_cont > 0 else 0
-
-        # Licenciamento e Conformidade (20%)
-        lic_conf = [q31_f3, q32_f3, q33_f3, q34_f3, q35_f3]
-        pontos_lic = sum([calcular_pontuacao(resp) for resp in lic_conf if resp is not None])
-        max_pontos_lic = len([resp for resp in lic_conf if resp is not None]) * 5
-        score_lic = (pontos_lic / max_pontos_lic * 100) if max_pontos_lic > 0 else 0
-
-        # Planos de Execução (15%)
-        plan_exec = [q41_f3, q42_f3, q43_f3, q44_f3, q45_f3]
-        pontos_plan_exec = sum([calcular_pontuacao(resp) for resp in plan_exec if resp is not None])
-        max_pontos_plan_exec = len([resp for resp in plan_exec if resp is not None]) * 5
-        score_plan_exec = (pontos_plan_exec / max_pontos_plan_exec * 100) if max_pontos_plan_exec > 0 else 0
-
-        # Controles e Riscos (5%)
-        cont_risco = [q51_f3, q52_f3, q53_f3, q54_f3, q55_f3]
-        pontos_cont_risco = sum([calcular_pontuacao(resp) for resp in cont_risco if resp is not None])
-        max_pontos_cont_risco = len([resp for resp in cont_risco if resp is not None]) * 5
-        score_cont_risco = (pontos_cont_risco / max_pontos_cont_risco * 100) if max_pontos_cont_risco > 0 else 0
-
-        # Score Final Ponderado
-        score_final_f3 = (score_eng * 0.35 + score_cont * 0.25 + score_lic * 0.20 +
-                          score_plan_exec * 0.15 + score_cont_risco * 0.05)
-
-        # Dashboard de resultados
-        st.markdown("### 📈 Dashboard de Resultados FELKLA-3")
-
-        # Métricas principais em cards
-        col_m1, col_m2, col_m3, col_m4, col_m5 = st.columns(5)
-
-        with col_m1:
-            delta_eng = "🎯" if score_eng >= 80 else "⚠️" if score_eng >= 60 else "❌"
-            st.metric(
-                "Engenharia e Especificações",
-                f"{score_eng:.1f}%",
-                delta=f"Peso: 35% {delta_eng}"
+    # Agregados materializados a cada gravação: custo independente do número de projetos
+    agregados = armazenamento.agregados()
+    resumos = [(fase, resumo_portfolio(fase['id'], agregados.get(fase['id'], {}))) for fase in catalogo['fases']]
+    resumos = [(fase, resumo) for fase, resumo in resumos if resumo]
+
+    if not resumos:
+        st.info("🔍 **Nenhuma avaliação salva ainda.** Informe a identificação do projeto e calcule o resultado de uma fase para alimentar o portfólio.")
+        return
+
+    for i, (fase, resumo) in enumerate(resumos):
+        if i > 0:
+            st.markdown('<hr class="custom-divider">', unsafe_allow_html=True)
+
+        st.markdown(f"### {fase['aba']}")
+
+        col1, col2, col3, col4, col5 = st.columns(5)
+        col1.metric("Projetos", resumo['projetos'])
+        col2.metric("Score Médio", f"{resumo['score_medio']:.1f}%")
+        col3.metric("🎯 Aprovados (≥80%)", f"{resumo['faixas']['aprovado']:.0%}")
+        col4.metric("⚠️ Atenção (60-79%)", f"{resumo['faixas']['atencao']:.0%}")
+        col5.metric("❌ Não Aprovados (<60%)", f"{resumo['faixas']['reprovado']:.0%}")
+
+        col_distribuicao, col_dimensoes = st.columns([3, 2])
+
+        with col_distribuicao:
+            st.markdown("#### 📊 Distribuição do Score Final")
+            largura = 100 // FAIXAS_HISTOGRAMA
+            st.bar_chart(
+                {
+                    'Score final': [f"{j * largura:02d}-{(j + 1) * largura}%" for j in range(FAIXAS_HISTOGRAMA)],
+                    'Projetos': resumo['histograma'],
+                },
+                x='Score final',
+                y='Projetos',
+                color='#006837',
             )
 
-        with col_m2:
-            delta_cont = "🎯" if score_cont >= 80 else "⚠️" if score_cont >= 60 else "❌"
-            st.metric(
-                "Contratação e Suprimentos",
-                f"{score_cont:.1f}%",
-                delta=f"Peso: 25% {delta_cont}"
-            )
+        with col_dimensoes:
+            st.markdown("#### 🔴 Dimensões Mais Fracas")
+            for nome, media, criticas in resumo['dimensoes']:
+                st.markdown(f"{ICONES_FAIXA[faixa(media)]} **{nome}:** {media:.1f}% em média · "
+                            f"crítica (<60%) em {criticas:.0%} dos projetos")
 
-        with col_m3:
-            delta_lic = "🎯" if score_lic >= 80 else "⚠️" if score_lic >= 60 else "❌"
-            st.metric(
-                "Licenciamento e Conformidade",
-                f"{score_lic:.1f}%",
-                delta=f"Peso: 20% {delta_lic}"
-            )
-
-        with col_m4:
-            delta_plan_exec = "🎯" if score_plan_exec >= 80 else "⚠️" if score_plan_exec >= 60 else "❌"
-            st.metric(
-                "Planos de Execução",
-                f"{score_plan_exec:.1f}%",
-                delta=f"Peso: 15% {delta_plan_exec}"
-            )
+    st.markdown('<hr class="custom-divider">', unsafe_allow_html=True)
+    renderizar_tendencia()
 
-        with col_m5:
-            delta_cont_risco = "🎯" if score_cont_risco >= 80 else "⚠️" if score_cont_risco >= 60 else "❌"
-            st.metric(
-                "Controles e Riscos",
-                f"{score_cont_risco:.1f}%",
-                delta=f"Peso: 5% {delta_cont_risco}"
+    st.markdown('<hr class="custom-divider">', unsafe_allow_html=True)
+    renderizar_sensibilidade([fase for fase, _ in resumos])
+
+
+@st.fragment
+def renderizar_tendencia():
+    """Evolução dos scores de um projeto; trocar o projeto ou a fase reexecuta apenas este bloco."""
+    from felkla.tendencia import PONTOS_PADRAO, tendencia
+
+    st.markdown("### 📈 Tendência por Projeto")
+    st.caption(f"Scores de todas as avaliações salvas do projeto. Séries longas são reduzidas no servidor "
+               f"a {PONTOS_PADRAO} pontos (LTTB), preservando picos e quedas.")
+
+    col_projeto, col_fase = st.columns([2, 1])
+    projetos = armazenamento.projetos()
+    padrao = projetos.index(sessao.projeto) if sessao.projeto in projetos else 0
+    projeto = col_projeto.selectbox("Projeto", projetos, index=padrao, key='tendencia_projeto')
+    fase_id = col_fase.selectbox("Dimensões da fase", [fase['id'] for fase in catalogo['fases']],
+                                 format_func=lambda fase_id: catalogo['por_id'][fase_id]['nome'],
+                                 key='tendencia_fase')
+
+    series = {fase['id']: tendencia(armazenamento, projeto, fase['id']) for fase in catalogo['fases']}
+    totais = " · ".join(f"{catalogo['por_id'][fase_id_serie]['nome']}: {serie['total']} avaliações"
+                        for fase_id_serie, serie in series.items() if serie['total'])
+    st.caption(totais)
+
+    col_final, col_dimensoes = st.columns(2)
+    with col_final:
+        st.markdown("#### Score Final por Fase")
+        pontos = [(datetime.fromtimestamp(instante), catalogo['por_id'][fase_id_serie]['nome'], score)
+                  for fase_id_serie, serie in series.items()
+                  for instante, score in zip(serie['instantes'].tolist(), serie['score_final'].tolist())]
+        st.line_chart(
+            {
+                'Data': [data for data, _, _ in pontos],
+                'Fase': [nome for _, nome, _ in pontos],
+                'Score final (%)': [score for _, _, score in pontos],
+            },
+            x='Data',
+            y='Score final (%)',
+            color='Fase',
+        )
+
+    with col_dimensoes:
+        fase = catalogo['por_id'][fase_id]
+        st.markdown(f"#### Dimensões {fase['nome']}")
+        serie = series[fase_id]
+        if serie['total']:
+            st.line_chart(
+                {
+                    'Data': [datetime.fromtimestamp(instante) for instante in serie['instantes'].tolist()],
+                    **{dimensao['nome']: serie['dimensoes'][:, i].tolist()
+                       for i, dimensao in enumerate(fase['dimensoes'])},
+                },
+                x='Data',
             )
+        else:
+            st.info(f"Nenhuma avaliação {fase['nome']} salva para {projeto}.")
+
+
+METODOS_SENSIBILIDADE = {
+    'grade': "Grade regular de pesos",
+    'dirichlet': "Amostragem aleatória (Dirichlet)",
+}
+
+
+def renderizar_sensibilidade(fases):
+    from felkla.sensibilidade import (AMOSTRAS_PADRAO, PASSO_PADRAO, amostrar_simplex, analisar_portfolio,
+                                      grade_simplex, pesos_atuais)
+
+    st.markdown("### 🔬 Sensibilidade aos Pesos das Dimensões")
+    st.caption("Recalcula o score final da última avaliação de cada projeto com muitos vetores de pesos "
+               "alternativos e lista os projetos cuja decisão (80% / 60%) muda com algum deles.")
+
+    with st.form('sensibilidade'):
+        col1, col2, col3, col4 = st.columns(4)
+        fase_id = col1.selectbox("Fase", [fase['id'] for fase in fases],
+                                 format_func=lambda fase_id: catalogo['por_id'][fase_id]['nome'])
+        metodo = col2.radio("Vetores de pesos", list(METODOS_SENSIBILIDADE), format_func=METODOS_SENSIBILIDADE.get)
+        passo = col3.select_slider("Passo da grade", [0.25, 0.2, 0.1, 0.05, 0.04, 0.025], value=PASSO_PADRAO,
+                                   help="Pesos múltiplos do passo; 0,05 gera 10.626 vetores e 0,025 gera 135.751")
+        amostras = col3.number_input("Amostras (Dirichlet)", 1_000, 500_000, AMOSTRAS_PADRAO, step=1_000)
+        concentracao = col4.number_input(
+            "Concentração em torno dos pesos atuais", 0, 10_000, 0, step=50,
+            help="0 sorteia uniformemente entre todos os pesos possíveis; valores maiores ficam perto dos atuais")
+        executar = st.form_submit_button("🔬 Executar análise")
+
+    if not executar:
+        return
+
+    projetos, scores, score_final = armazenamento.scores_atuais(fase_id)
+    if metodo == 'grade':
+        pesos = grade_simplex(passo)
+    else:
+        pesos = amostrar_simplex(amostras, pesos_atuais(fase_id), concentracao or None)
+
+    inicio = time.perf_counter()
+    linhas, varredura = analisar_portfolio(projetos, scores, score_final, pesos)
+    duracao = time.perf_counter() - inicio
+
+    aprovados = varredura['aprovados']
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("Combinações avaliadas", f"{len(projetos) * len(pesos):,}".replace(',', '.'),
+                help=f"{len(projetos)} projetos × {len(pesos)} vetores de pesos em {duracao:.2f} s")
+    col2.metric("Projetos que mudam de faixa", f"{len(linhas)} de {len(projetos)}")
+    col3.metric("🎯 Aprovados com os pesos atuais", int((score_final >= LIMIAR_APROVADO).sum()))
+    col4.metric("🎯 Aprovados (mín–máx)", f"{aprovados.min()}–{aprovados.max()}")
+
+    if linhas:
+        st.dataframe(linhas, hide_index=True)
+    else:
+        st.success("✅ Nenhuma decisão muda com os vetores de pesos avaliados.")
+
+
+def renderizar_diagnostico():
+    """Painel de diagnóstico, exibido apenas com o perfil ativo."""
+    with st.expander("🩺 Diagnóstico de desempenho (perfil por seção)", expanded=False):
+        st.caption("Tempos agregados de todas as sessões deste processo (últimas "
+                   f"{perfil.JANELA} execuções de cada seção).")
+        linhas = perfil.resumo()
+        if linhas:
+            st.dataframe(linhas, hide_index=True)
+        st.download_button(
+            "⬇️ Métricas no formato Prometheus",
+            perfil.texto_prometheus(),
+            file_name='felkla_perfil.prom',
+            mime='text/plain',
+            on_click='ignore'
+        )
+        st.caption("Fila de gravação das avaliações (contadores desde o início do processo).")
+        st.dataframe([{'fila': fila, **metricas} for fila, metricas in armazenamento.metricas().items()],
+                     hide_index=True)
+
+
+ABA_METODOLOGIA = 'metodologia'
+ABA_PORTFOLIO = 'portfolio'
+ROTULOS_ABAS = {
+    ABA_METODOLOGIA: "📚 **METODOLOGIA**",
+    **{fase['id']: fase['aba'] for fase in catalogo['fases']},
+    ABA_PORTFOLIO: "📈 **PORTFÓLIO**",
+}
+
+
+def carregar_projeto():
+    """Preenche o questionário com as últimas avaliações salvas do projeto informado."""
+    projeto = st.session_state['projeto'].strip()
+    carregadas = sessao.carregar(armazenamento, projeto)
+    sessao.checkpoint(armazenamento)
+    for fase in catalogo['fases']:
+        for questao in questoes_fase(fase):
+            st.session_state.pop(chave_questao(fase, questao), None)
+    if carregadas:
+        nomes = ", ".join(catalogo['por_id'][fase_id]['nome'] for fase_id in carregadas)
+        st.toast(f"↩️ Respostas de {nomes} carregadas da última avaliação de {projeto}")
+
+
+st.text_input(
+    "🏷️ Identificação do Projeto",
+    key='projeto',
+    placeholder="Ex.: PRJ-2024-017",
+    help="Os resultados calculados são salvos para este projeto e as últimas avaliações salvas dele "
+         "preenchem o questionário. Deixe em branco para não salvar.",
+    on_change=carregar_projeto
+)
 
-        st.markdown('<hr class="custom-divider">', unsafe_allow_html=True)
-
-        # Score final destacado
-        col_score, col_interpretation = st.columns([1, 2])
-
-        with col_score:
-            if score_final_f3 >= 80:
-                st.markdown(f"""
-                    <div style="background: linear-gradient(135deg, #d4edda 0%, #c3e6cb 100%); 
-                                padding: 2rem; border-radius: 15px; text-align: center; 
-                                border: 3px solid #006837; box-shadow: 0 4px 8px rgba(0,0,0,0.1);">
-                        <h1 style="color: #006837; margin: 0; font-size: 3rem;">{score_final_f3:.1f}%</h1>
-                        <h3 style="color: #155724; margin: 0.5rem 0;">✅ PRONTO PARA EXECUÇÃO</h3>
-                        <p style="color: #155724; margin: 0;">Projeto aprovado para implementação</p>
-                    </div>
-                    """, unsafe_allow_html=True)
-            elif score_final_f3 >= 60:
-                st.markdown(f"""
-                    <div style="background: linear-gradient(135deg, #fff3cd 0%, #ffeaa7 100%); 
-                                padding: 2rem; border-radius: 15px; text-align: center; 
-                                border: 3px solid #ffc107; box-shadow: 0 4px 8px rgba(0,0,0,0.1);">
-                        <h1 style="color: #856404; margin: 0; font-size: 3rem;">{score_final_f3:.1f}%</h1>
-                        <h3 style="color: #856404; margin: 0.5rem 0;">⚠️ ATENÇÃO</h3>
-                        <p style="color: #856404; margin: 0;">Projeto necessita melhorias</p>
-                    </div>
-                    """, unsafe_allow_html=True)
-            else:
-                st.markdown(f"""
-                    <div style="background: linear-gradient(135deg, #f8d7da 0%, #f5c6cb 100%); 
-                                padding: 2rem; border-radius: 15px; text-align: center; 
-                                border: 3px solid #dc3545; box-shadow: 0 4px 8px rgba(0,0,0,0.1);">
-                        <h1 style="color: #721c24; margin: 0; font-size: 3rem;">{score_final_f3:.1f}%</h1>
-                        <h3 style="color: #721c24; margin: 0.5rem 0;">❌ NÃO APROVADO</h3>
-                        <p style="color: #721c24; margin: 0;">Projeto não pronto para execução</p>
-                    </div>
-                    """, unsafe_allow_html=True)
-
-        with col_interpretation:
-            st.markdown("#### 🎯 Interpretação dos Resultados")
-
-            if score_final_f3 >= 80:
-                st.success("""
-                    **Excelente! Projeto pronto para execução**
-
-                    ✅ **Recomendações:**
-                    - Iniciar fase de implementação
-                    - Ativar estrutura de governança
-                    - Executar planos de comunicação
-                    """)
-            elif score_final_f3 >= 60:
-                st.warning("""
-                    **Projeto viável com ajustes necessários**
-
-                    ⚠️ **Ações recomendadas:**
-                    - Finalizar documentação pendente
-                    - Completar contratações críticas
-                    - Resolver pendências de licenciamento
-                    """)
-            else:
-                st.error("""
-                    **Projeto não pronto para execução**
-
-                    ❌ **Ações necessárias:**
-                    - Revisar engenharia de detalhe
-                    - Finalizar contratos principais
-                    - Resolver questões regulatórias
-                    """)
-
-        # Análise detalhada por dimensão
-        st.markdown("#### 📊 Análise Detalhada por Dimensão")
-
-        # Identificar pontos fortes e fracos
-        scores_f3 = {
-            "Engenharia e Especificações": score_eng,
-            "Contratação e Suprimentos": score_cont,
-            "Licenciamento e Conformidade": score_lic,
-            "Planos de Execução": score_plan_exec,
-            "Controles e Riscos": score_cont_risco
-        }
-
-        pontos_fortes_f3 = [k for k, v in scores_f3.items() if v >= 80]
-        pontos_atenção_f3 = [k for k, v in scores_f3.items() if 60 <= v < 80]
-        pontos_críticos_f3 = [k for k, v in scores_f3.items() if v < 60]
-
-        col_analise1, col_analise2, col_analise3 = st.columns(3)
-
-        with col_analise1:
-            if pontos_fortes_f3:
-                st.markdown("**🟢 Pontos Fortes**")
-                for ponto in pontos_fortes_f3:
-                    st.markdown(f"✅ {ponto}")
-            else:
-                st.markdown("**🟢 Pontos Fortes**")
-                st.markdown("_Nenhum identificado_")
-
-        with col_analise2:
-            if pontos_atenção_f3:
-                st.markdown("**🟡 Necessita Atenção**")
-                for ponto in pontos_atenção_f3:
-                    st.markdown(f"⚠️ {ponto}")
-            else:
-                st.markdown("**🟡 Necessita Atenção**")
-                st.markdown("_Nenhum identificado_")
-
-        with col_analise3:
-            if pontos_críticos_f3:
-                st.markdown("**🔴 Pontos Críticos**")
-                for ponto in pontos_críticos_f3:
-                    st.markdown(f"❌ {ponto}")
-            else:
-                st.markdown("**🔴 Pontos Críticos**")
-                st.markdown("_Nenhum identificado_")
-
-        # Checklist de prontidão para execução
-        st.markdown("#### ✅ Checklist de Prontidão para Execução")
-
-        checklist_items = [
-            ("Engenharia de detalhe completa", score_eng >= 80),
-            ("Contratos principais assinados", score_cont >= 80),
-            ("Licenças obtidas", score_lic >= 80),
-            ("Planos de execução aprovados", score_plan_exec >= 80),
-            ("Sistema de controle estabelecido", score_cont_risco >= 80)
-        ]
-
-        col_check1, col_check2 = st.columns(2)
-
-        for i, (item, status) in enumerate(checklist_items):
-            col = col_check1 if i % 2 == 0 else col_check2
-            with col:
-                icon = "✅" if status else "❌"
-                color = "#155724" if status else "#721c24"
-                st.markdown(f"<span style='color: {color};'>{icon} {item}</span>", unsafe_allow_html=True)
-
-        # Próximos passos
-        st.markdown("#### 🚀 Próximos Passos Recomendados")
-
-        if score_final_f3 >= 80:
-            st.info("""
-                1. **Kick-off oficial** do projeto de execução
-                2. **Ativar estrutura** de governança e controle
-                3. **Mobilizar equipes** e recursos alocados
-                4. **Executar planos** de comunicação e engajamento
-                5. **Iniciar monitoramento** de marcos e entregas
-                """)
-        elif score_final_f3 >= 60:
-            st.warning("""
-                1. **Finalizar pendências** identificadas nas áreas críticas
-                2. **Completar documentação** técnica e contratual
-                3. **Resolver questões** de licenciamento pendentes
-                4. **Reavaliar prontidão** após correções
-                5. **Planejar cronograma** considerando ajustes
-                """)
+# Navegação entre as abas. Por padrão apenas a aba ativa é executada a cada
+# rerun; com ?abas=todas o st.tabs original é usado e todas as abas são renderizadas.
+if st.query_params.get('abas') == 'todas':
+    aba_metodologia, *abas_fases, aba_portfolio = st.tabs(list(ROTULOS_ABAS.values()))
+
+    with aba_metodologia, perfil.secao('pagina/metodologia'):
+        renderizar_metodologia()
+
+    for aba, fase in zip(abas_fases, catalogo['fases']):
+        with aba, perfil.secao(f"pagina/{fase['id']}"):
+            renderizar_fase(fase)
+
+    with aba_portfolio, perfil.secao('pagina/portfolio'):
+        renderizar_portfolio()
+else:
+    aba_ativa = st.radio(
+        "Navegação",
+        list(ROTULOS_ABAS),
+        format_func=ROTULOS_ABAS.get,
+        key='aba_ativa',
+        horizontal=True,
+        label_visibility='collapsed'
+    )
+
+    perfil.etapa('navegacao')
+
+    with perfil.secao(f'pagina/{aba_ativa}'):
+        if aba_ativa == ABA_METODOLOGIA:
+            renderizar_metodologia()
+        elif aba_ativa == ABA_PORTFOLIO:
+            renderizar_portfolio()
         else:
-            st.error("""
-                1. **Revisar completamente** engenharia e especificações
-                2. **Renegociar contratos** ou buscar novos fornecedores
-                3. **Resolver questões** regulatórias e de conformidade
-                4. **Considerar retorno** ao FELKLA-2 para revisão
-                5. **Reavaliar viabilidade** do cronograma proposto
-                """)
-
-        # Resumo executivo final
-        st.markdown("#### 📋 Resumo Executivo Final")
-
-        resumo_color = "#d4edda" if score_final_f3 >= 80 else "#fff3cd" if score_final_f3 >= 60 else "#f8d7da"
-        resumo_border = "#006837" if score_final_f3 >= 80 else "#ffc107" if score_final_f3 >= 60 else "#dc3545"
-
-        prontidao_status = "PRONTO" if score_final_f3 >= 80 else "PENDENTE" if score_final_f3 >= 60 else "NÃO PRONTO"
-
-        st.markdown(f"""
-            <div style="background: {resumo_color}; padding: 1.5rem; border-radius: 10px; 
-                        border-left: 4px solid {resumo_border}; margin: 1rem 0;">
-                <h4 style="margin-top: 0;">🎯 Status Final: {prontidao_status} PARA EXECUÇÃO</h4>
-                <p><strong>Score FELKLA-3:</strong> {score_final_f3:.1f}%</p>
-                <p><strong>Dimensão mais forte:</strong> {max(scores_f3, key=scores_f3.get)} ({max(scores_f3.values()):.1f}%)</p>
-                <p><strong>Dimensão crítica:</strong> {min(scores_f3, key=scores_f3.get)} ({min(scores_f3.values()):.1f}%)</p>
-                <p><strong>Questões respondidas:</strong> {len(respostas_preenchidas_f3)}/{len(todas_respostas_f3)}</p>
-                <p><strong>Itens do checklist aprovados:</strong> {sum(1 for _, status in checklist_items if status)}/{len(checklist_items)}</p>
-            </div>
-            """, unsafe_allow_html=True)
-
-        # Conclusão da metodologia FELKLA
-        if score_final_f3 >= 80:
-            st.balloons()
-            st.success("""
-                🎉 **Parabéns! O projeto completou com sucesso a metodologia FELKLA e está pronto para execução.**
+            renderizar_fase(catalogo['por_id'][aba_ativa])
+
+perfil.finalizar()
 
-                A metodologia FELKLA foi concluída com aprovação em todas as fases:
-                - ✅ FELKLA-1: Avaliação de oportunidades
-                - ✅ FELKLA-2: Seleção de alternativas  
-                - ✅ FELKLA-3: Definição do projeto
+if perfil.ativo():
+    renderizar_diagnostico()
 
-                **O projeto pode prosseguir para a fase de implementação!**
-                """)
+# Ícone só depois da página: um ícone emoji faz o Streamlit importar e compilar
+# a sua lista de emojis (~0,1 s na primeira execução de cada processo), o que
+# atrasaria a primeira renderização. As chamadas de set_page_config se somam.
+st.set_page_config(page_icon='🌲')